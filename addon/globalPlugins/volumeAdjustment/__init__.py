@@ -5,10 +5,11 @@
 
 from __future__ import annotations
 import os.path
-from threading import Thread
-from typing import Callable, List, TypeVar, Union
+from concurrent.futures import Future
+from typing import Callable, List, Optional, TypeVar, Union
 import addonHandler
 import config
+import core
 import globalPluginHandler
 import tones
 import ui
@@ -21,7 +22,25 @@ from NVDAObjects import NVDAObject
 from scriptHandler import script
 from synthDriverHandler import getSynth, setSynth
 from utils.mmdevice import AudioOutputDevice, getOutputDevices
-from .audiocore import ExtendedAudioUtilities, VAAudioDevice, VAAudioSession, cfg, devices
+from .audiocore import (
+	AddonSettings,
+	AudioDevicesTable,
+	VAAudioDevice,
+	VAAudioSession,
+	cfg,
+	devices,
+	mutedSources,
+	options,
+	peakSampler,
+	sessionsCache,
+	sessionsPool,
+	sessionsRegistry,
+	volumeSteps,
+)
+from .comcalls import accounting
+from .profiler import profiler
+from .recorder import OUTPUT, ExceptionDumpHandler, recorder
+from .timings import timings
 
 try:
 	addonHandler.initTranslation()
@@ -67,8 +86,32 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			"mutePercentage": "integer(default=75,min=1,max=99)",
 			"unmuteOnExit": "boolean(default=true)",
 			"gestures": "boolean(default=true)",
+			"sessionsCacheTTL": "float(default=1.0,min=0.0,max=60.0)",
+			"scanWorkers": "integer(default=0,min=0,max=16)",
+			"activationTimeout": "float(default=2.0,min=0.1,max=30.0)",
+			"coalescingDelay": "float(default=0.2,min=0.0,max=2.0)",
+			"shutdownDeadline": "float(default=2.0,min=0.1,max=30.0)",
+			"activeOnly": "boolean(default=false)",
+			"peakMeters": "boolean(default=false)",
+			"peakSampler": "boolean(default=false)",
+			"peakInterval": "float(default=0.05,min=0.01,max=1.0)",
+			"timings": "boolean(default=false)",
+			"comCalls": "boolean(default=false)",
+			"profileCount": "integer(default=10,min=1,max=500)",
+			"profileTimeout": "float(default=120.0,min=5.0,max=3600.0)",
 		}
 		config.conf.spec[addonName] = confspec
+		# Read the add-on settings once and refresh them only when the configuration changes
+		options.start()
+		self.applySettings(options.current)
+		# The settings are applied again after saving, resetting the configuration or switching the profile
+		options.changed.register(self.applySettings)
+		# Dump the recorded audio operations when an exception raised in the add-on is logged
+		self._flightRecord: str = os.path.join(appArgs.configPath, addonName + ".flight.jsonl")
+		self._dumpHandler = ExceptionDumpHandler(recorder, self._flightRecord)
+		log.addHandler(self._dumpHandler)
+		# Stops the profiler if the gestures are not performed in time
+		self._profileTimer = None
 		settingsDialogs.NVDASettingsDialog.categoryClasses.append(VASettingsPanel)
 		# Remember the default output audio device
 		self._defaultOutputDevice: str = config.conf["audio"]["outputDevice"]
@@ -78,22 +121,75 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		self._previous: str = ""
 		# Name of the current process
 		self._process: str = ""
+		# The table of audio devices used by the previous gesture
+		self._devices: AudioDevicesTable = devices.snapshot()
 		# Bind default gestures if necessary
-		config.conf[addonName]["gestures"] and self.bindGestures(self.__defaultGestures)
+		options.current.gestures and self.bindGestures(self.__defaultGestures)
 		# Creating individual switching methods for each output audio device detected in the system
 		self.bindSwitchingMethods()
-		devices.scan(cfg.devices)
+		scan = devices.scan(cfg.devices)
+		if options.current.unmuteOnExit and cfg.muted:
+			# Retry the audio sources which were not unmuted before the previous exit
+			scan.add_done_callback(lambda scan: mutedSources.start())
+		# Keep the list of audio devices up to date when they are connected or disconnected
+		if not devices.subscribe():
+			log.warning("Unable to subscribe to audio endpoint notifications")
+		# Track audio sessions by notifications, polling is used until the notifications are actually delivered.
+		# The audio service delivers them only to the registrations made in the multithreaded apartment
+		devices.scheduler.submit(sessionsRegistry.start).add_done_callback(self.onSessionsRegistryStarted)
+		if options.current.peakSampler:
+			peakSampler.start(options.current.peakInterval)
 
 	def terminate(self, *args, **kwargs) -> None:
 		"""This will be called when NVDA is finished with this global plugin."""
-		if config.conf[addonName]["unmuteOnExit"]:
-			Thread(target=self.unmuteAllAudioSources).start()
+		volumeSteps.flush()
+		profiler.armed and profiler.finish("terminate")
+		peakSampler.stop()
+		# Unregister from audio session notifications in the same apartment where the registration was made
+		devices.scheduler.submit(sessionsRegistry.stop)
+		options.changed.unregister(self.applySettings)
+		options.stop()
+		devices.unsubscribe()
+		devices.scheduler.stop()
+		# Volume change notifications are no longer delivered, so the shadow volume states must not be used
+		devices.release()
+		sessionsPool.clear()
+		if options.current.unmuteOnExit:
+			self.unmuteAllAudioSources()
+		else:
+			cfg.flush()
+		log.removeHandler(self._dumpHandler)
 		try:
 			settingsDialogs.NVDASettingsDialog.categoryClasses.remove(VASettingsPanel)
 		except IndexError:
 			log.warning("Can't remove %s Settings panel from NVDA settings dialogs", addonSummary)
 		super(GlobalPlugin, self).terminate(*args, **kwargs)
 
+	def applySettings(self, settings: AddonSettings, previous: Optional[AddonSettings] = None) -> None:
+		"""Pass the settings which are not read on each gesture to the components of the add-on.
+		@param settings: the current add-on settings
+		@type settings: AddonSettings
+		@param previous: the replaced add-on settings, None when the settings are applied for the first time
+		@type previous: Optional[AddonSettings]
+		"""
+		# Lifetime of the shared snapshot of audio sessions
+		sessionsCache.ttl = settings.sessionsCacheTTL
+		# Latency histograms of the gestures are collected only on request,
+		# the measurement started by the gesture is kept until the setting itself is changed
+		if previous is None or settings.timings != previous.timings:
+			timings.enabled = settings.timings
+		# COM calls are counted only on request, counting started by the gesture is kept in the same way
+		if previous is None or settings.comCalls != previous.comCalls:
+			accounting.enabled = settings.comCalls
+
+	def onSessionsRegistryStarted(self, started: Future) -> None:
+		"""Called on the worker thread of scans when the subscription to audio session notifications is finished.
+		@param started: the result of the registry start
+		@type started: Future
+		"""
+		if started.cancelled() or not started.result():
+			log.warning("Unable to subscribe to audio session notifications, polling will be used instead")
+
 	def event_gainFocus(self, obj: NVDAObject, NextHandler: Callable) -> None:
 		"""Track the application in focus if the corresponding option is enabled.
 		@param obj: the object to track if focused
@@ -101,7 +197,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		@param nextHandler: next event handler
 		@type nextHandler: Callable
 		"""
-		if config.conf[addonName]["focus"]:
+		if options.current.focus:
 			self._index = -1
 			self._previous = UNDEFINED_APP
 		NextHandler()
@@ -116,7 +212,8 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			appName = obj.appModule.appName
 		except AttributeError:
 			appName = UNDEFINED_APP
-		session = VAAudioSession(appName)
+		with timings.span("selection"):
+			session = sessionsPool.get(appName, pid=getattr(obj, "processID", None))
 		if not session.name:
 			# Translators: The current application does not pay audio
 			ui.message(_("{app} is not playing any sound.").format(app=appName))
@@ -129,26 +226,46 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		@param volumeLevel: value of volume level
 		@type volumeLevel: float, from 0.0 to 1.0
 		"""
-		# Translators: The message is announced during volume control
-		ui.message("%s %d" % (_("Volume"), int(volumeLevel * 100.0)))
+		with timings.span("announcement"):
+			# Translators: The message is announced during volume control
+			ui.message("%s %d" % (_("Volume"), int(volumeLevel * 100.0)))
 
 	def announceMuted(self) -> None:
 		"""Announce that the sound was muted."""
-		# Translators: The message is announced during volume control
-		ui.message(_("The sound is muted"))
+		with timings.span("announcement"):
+			# Translators: The message is announced during volume control
+			ui.message(_("The sound is muted"))
 
 	def announceChannel(self, number: int) -> None:
 		"""Announce the number of the selected audio channel.
 		@param number: the number of audio channel
 		@type number: int
 		"""
-		# Translators: Message about the number of the selected audio channel
-		ui.message(_("Channel %d") % number)
+		with timings.span("announcement"):
+			# Translators: Message about the number of the selected audio channel
+			ui.message(_("Channel %d") % number)
 
 	def announceNotSupported(self) -> None:
 		"""Announce that the feature currently is not supported."""
-		# Translators: The message when feature currently is not supported
-		ui.message(_("Not supported"))
+		with timings.span("announcement"):
+			# Translators: The message when feature currently is not supported
+			ui.message(_("Not supported"))
+
+	def getDevicesTable(self) -> AudioDevicesTable:
+		"""Get the current table of audio devices to use during the whole gesture.
+		If a newer table has been published since the previous gesture, the selected audio source is kept.
+		@return: the current table of audio devices
+		@rtype: AudioDevicesTable
+		"""
+		table = devices.snapshot()
+		previous = self._devices
+		if table.generation != previous.generation and self._index >= 0:
+			if self._index < len(previous):
+				self._index = max(0, table.indexOf(previous[self._index].id))
+			else:
+				self._index += len(table) - len(previous)
+		self._devices = table
+		return table
 
 	def getAllSessions(self) -> List[str]:
 		"""List of all running processes that available in the list of audio sessions
@@ -156,63 +273,74 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		@return: list of currently running processes
 		@rtype: List[str]
 		"""
-		procs = [
-			s.Process.name()
-			for s in ExtendedAudioUtilities.GetAllSessions()
-			if s.Process and s.Process.name() and s.Process.name() not in cfg.processes  # noqa E502
-		]
-		return list(set(procs)) if config.conf[addonName]["duplicates"] else procs
-
-	def unmuteAllAudioSources(self) -> None:
-		"""Unmute all muted audio devices and audio sessions."""
-		for device in devices:
-			device.isMuted and device.unmute()
-		for sessionName in self.getAllSessions():
-			session = VAAudioSession(sessionName)
-			session.isMuted and session.unmute()
-
-	def selectAudioSource(self, sessions: List[str]) -> None:
+		snapshot = sessionsCache.snapshot()
+		if options.current.activeOnly:
+			names = snapshot.activeNames(options.current.peakMeters, options.current.sessionsCacheTTL)
+		else:
+			names = snapshot.names
+		procs = [name for name in names if not cfg.isHiddenProcess(name)]
+		return list(set(procs)) if options.current.duplicates else procs
+
+	def unmuteAllAudioSources(self) -> List[str]:
+		"""Unmute all audio devices and audio sessions muted by the add-on within the shutdown deadline.
+		@return: audio sources which are still muted and will be unmuted on the next start
+		@rtype: List[str]
+		"""
+		return mutedSources.restore(options.current.shutdownDeadline)
+
+	def selectAudioSource(self, sessions: List[str], table: AudioDevicesTable) -> None:
 		"""Select audio source to adjust its volume level.
 		This can be a physical audio device or a running process.
 		@param sessions: filtered list of all running processes, changes dynamically
 		@type sessions: List[str]
+		@param table: the table of audio devices used by the current gesture
+		@type table: AudioDevicesTable
 		"""
-		if 0 <= self._index < len(devices):
-			source: Union[VAAudioDevice, VAAudioSession] = devices[self._index]
+		volumeSteps.flush()
+		if 0 <= self._index < len(table):
+			source: Union[VAAudioDevice, VAAudioSession] = table[self._index]
 			title: str = source.name
 			if source.default:
 				# Translators: Used as the prefix to default audio device name
 				title = "{default}: {title}".format(default=_("Default audio device"), title=source.name)
 		else:
 			try:
-				self._process = sessions[self._index - len(devices)]
+				self._process = sessions[self._index - len(table)]
 			except IndexError:
 				try:
 					self._process = sessions[-1]
 				except IndexError:
 					self._process = UNDEFINED_APP
 			self._previous = self._process
-			source = VAAudioSession(self._process)
+			with timings.span("selection"):
+				source = sessionsPool.get(self._process)
 			title = source.title
-		ui.message(title)
-		if config.conf[addonName]["status"]:
+		with timings.span("announcement"):
+			ui.message(title)
+		if options.current.status:
 			self.announceMuted() if source.isMuted else self.announceVolumeLevel(source.volumeLevel)
 
-	def getAudioSource(self) -> Union[VAAudioDevice, VAAudioSession]:
+	def getAudioSource(self, settle: bool = True) -> Union[VAAudioDevice, VAAudioSession]:
 		"""Get the object of selected audio source (device or process),
 		this can be instance inherited from the audiocore.AudioSource class.
 		Also announces the name of the audio session at the first treatment.
+		@param settle: write the pending volume steps before the audio source is used
+		@type settle: bool
 		@return: instance of selected audio source
 		@rtype: Union[VAAudioDevice, VAAudioSession]
 		"""
-		if 0 <= self._index < len(devices):
-			source: Union[VAAudioDevice, VAAudioSession] = devices[self._index]
-			self._previous = UNDEFINED_APP
-		else:
-			source = VAAudioSession(self._process)
-			if source.name != self._previous:
+		settle and volumeSteps.flush()
+		with timings.span("selection"):
+			table = self.getDevicesTable()
+			if 0 <= self._index < len(table):
+				source: Union[VAAudioDevice, VAAudioSession] = table[self._index]
+				self._previous = UNDEFINED_APP
+				return source
+			source = sessionsPool.get(self._process)
+		if source.name != self._previous:
+			with timings.span("announcement"):
 				ui.message(source.title)
-				self._previous = source.name
+			self._previous = source.name
 		return source
 
 	# Translators: The name of the method that displayed in the NVDA input gestures dialog
@@ -224,7 +352,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		"""
 		if self._index < 0 and not self.selectProcessInFocus():
 			return
-		self.announceVolumeLevel(self.getAudioSource().volumeUp())
+		volumeSteps.adjust(self.getAudioSource(settle=False), 1, self.announceVolumeStep)
 
 	# Translators: The name of the method that displayed in the NVDA input gestures dialog
 	@script(description=_("Decrease the volume"))
@@ -235,10 +363,17 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		"""
 		if self._index < 0 and not self.selectProcessInFocus():
 			return
-		source = self.getAudioSource()
-		volumeLevel = source.volumeDown()
-		if volumeLevel > 0.0:
-			self.announceVolumeLevel(volumeLevel)
+		volumeSteps.adjust(self.getAudioSource(settle=False), -1, self.announceVolumeStep)
+
+	def announceVolumeStep(self, source: Union[VAAudioDevice, VAAudioSession], level: float) -> None:
+		"""Announce the volume level reached by the volume steps, mute the audio source at the bottom.
+		@param source: audio source whose volume has been adjusted
+		@type source: Union[VAAudioDevice, VAAudioSession]
+		@param level: the volume level of the audio source
+		@type level: float
+		"""
+		if level > 0.0:
+			self.announceVolumeLevel(level)
 			return
 		source.mute()
 		self.announceMuted()
@@ -289,16 +424,17 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		@param gesture: the input gesture in question
 		@type gesture: InputGesture
 		"""
+		table = self.getDevicesTable()
 		sessions: List[str] = self.getAllSessions()
 		if self._index < 0:
 			try:
-				self._index = len(devices) + sessions.index(
+				self._index = len(table) + sessions.index(
 					next(filter(lambda s: self._process in s, sessions), "")
 				)
 			except (ValueError, TypeError):
-				self._index = len(devices) - 1
-		self._index = self._index + 1 if self._index < (len(devices) + len(sessions) - 1) else 0
-		self.selectAudioSource(sessions)
+				self._index = len(table) - 1
+		self._index = self._index + 1 if self._index < (len(table) + len(sessions) - 1) else 0
+		self.selectAudioSource(sessions, table)
 
 	# Translators: The name of the method that displayed in the NVDA input gestures dialog
 	@script(description=_("Switch to the previous audio source"))
@@ -307,16 +443,17 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		@param gesture: the input gesture in question
 		@type gesture: InputGesture
 		"""
+		table = self.getDevicesTable()
 		sessions: List[str] = self.getAllSessions()
 		if self._index < 0:
 			try:
-				self._index = len(devices) + sessions.index(
+				self._index = len(table) + sessions.index(
 					next(filter(lambda s: self._process in s, sessions), "")
 				)
 			except (ValueError, TypeError):
 				pass
-		self._index = self._index - 1 if self._index > 0 else len(devices) + len(sessions) - 1
-		self.selectAudioSource(sessions)
+		self._index = self._index - 1 if self._index > 0 else len(table) + len(sessions) - 1
+		self.selectAudioSource(sessions, table)
 
 	def setOutputDevice(self, device: AudioOutputDevice) -> None:
 		"""Switche the NVDA output to the specified audio device.
@@ -324,6 +461,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		@type device: AudioOutputDevice
 		"""
 		config.conf["audio"]["outputDevice"] = device.id
+		recorder.record(OUTPUT, device.id)
 		status: bool = setSynth(getSynth().name)
 		if status:
 			tones.terminate()
@@ -411,7 +549,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		for i in range(len(outputDevices)):
 			name = f"script_switchToDevice{i}"
 			setattr(self.__class__, name, self.switchingMethodsFactory(i, outputDevices[i]))
-			if config.conf[addonName]["gestures"] and i < 12:
+			if options.current.gestures and i < 12:
 				self.bindGesture("kb:NVDA+windows+f%d" % (i + 1), name.split("_", 1)[1])
 
 	# Translators: The name of the method that displayed in the NVDA input gestures dialog
@@ -429,7 +567,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			return
 		source.channel += 1
 		self.announceChannel(source.channel)
-		if config.conf[addonName]["status"]:
+		if options.current.status:
 			self.announceMuted() if source.isMuted else self.announceVolumeLevel(
 				source.getChannelVolumeLevel()
 			)
@@ -449,7 +587,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			return
 		source.channel -= 1
 		self.announceChannel(source.channel)
-		if config.conf[addonName]["status"]:
+		if options.current.status:
 			self.announceMuted() if source.isMuted else self.announceVolumeLevel(
 				source.getChannelVolumeLevel()
 			)
@@ -529,6 +667,151 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			return
 		self.announceVolumeLevel(level)
 
+	# Translators: The name of the method that displayed in the NVDA input gestures dialog
+	@script(description=_("Announce the loudest audio source"))
+	def script_loudestSource(self, gesture: InputGesture) -> None:
+		"""Announce the audio source which is playing the loudest sound at the moment.
+		@param gesture: the input gesture in question
+		@type gesture: InputGesture
+		"""
+		peakSampler.refresh()
+		loudest = peakSampler.loudest()
+		if loudest is None:
+			# Translators: The message is announced when no audio source is playing a sound
+			ui.message(_("Nothing is playing"))
+			return
+		name, level = loudest
+		ui.message("%s %d" % (name, int(level * 100.0)))
+
+	# Translators: The name of the method that displayed in the NVDA input gestures dialog
+	@script(description=_("Announce the latency of the volume gestures"))
+	def script_latencySummary(self, gesture: InputGesture) -> None:
+		"""Announce the 95th percentile and the longest time of each measured phase of the gestures,
+		start the measurements if they are disabled.
+		@param gesture: the input gesture in question
+		@type gesture: InputGesture
+		"""
+		if not timings.enabled:
+			timings.enabled = True
+			# Translators: The message is announced when the measurement of gestures latency is started
+			ui.message(_("Latency measurement started"))
+			return
+		# Translators: The message is announced when no gestures have been measured yet
+		ui.message(timings.summary() or _("No measurements yet"))
+
+	# Translators: The name of the method that displayed in the NVDA input gestures dialog
+	@script(description=_("Write the latency histograms of the volume gestures to the NVDA log"))
+	def script_latencyLog(self, gesture: InputGesture) -> None:
+		"""Write the full latency histograms of all measured phases of the gestures to the NVDA log.
+		@param gesture: the input gesture in question
+		@type gesture: InputGesture
+		"""
+		log.info("Latency of the %s gestures:\n%s", addonSummary, timings.report())
+		# Translators: The message is announced when the latency histograms are written to the NVDA log
+		ui.message(_("Latency histograms written to the log"))
+
+	# Translators: The name of the method that displayed in the NVDA input gestures dialog
+	@script(description=_("Start or stop counting the calls of Windows audio interfaces"))
+	def script_comCalls(self, gesture: InputGesture) -> None:
+		"""Start counting the COM calls made by each script or stop counting and write the counters to the NVDA log.
+		@param gesture: the input gesture in question
+		@type gesture: InputGesture
+		"""
+		if not accounting.enabled:
+			accounting.reset()
+			accounting.enabled = True
+			# Translators: The message is announced when counting of COM calls is started
+			ui.message(_("Counting audio interface calls"))
+			return
+		accounting.enabled = False
+		log.info("COM calls of the %s add-on:\n%s", addonSummary, accounting.report())
+		# Translators: The message is announced when counting of COM calls is stopped
+		ui.message(_("{count} audio interface calls written to the log").format(count=accounting.calls()))
+
+	# Translators: The name of the method that displayed in the NVDA input gestures dialog
+	@script(description=_("Save the recent audio operations to a file for troubleshooting"))
+	def script_flightRecord(self, gesture: InputGesture) -> None:
+		"""Save the recent mute, unmute, volume changes, scans and device switches to the NVDA settings folder.
+		@param gesture: the input gesture in question
+		@type gesture: InputGesture
+		"""
+		written = recorder.dump(self._flightRecord)
+		if written < 0:
+			# Translators: The message is announced when the recent audio operations cannot be saved
+			ui.message(_("Unable to save the recent audio operations"))
+			return
+		log.info("%d audio operations written to %s", written, self._flightRecord)
+		# Translators: The message is announced when the recent audio operations are saved to a file
+		ui.message(_("{count} recent audio operations saved").format(count=written))
+
+	def getScript(self, gesture: InputGesture) -> Optional[Callable[[InputGesture], None]]:
+		"""Find the script bound to the gesture and pass its name to the flight recorder.
+		NVDA looks up the script right before executing it, so the name is set once per gesture.
+		@param gesture: the input gesture in question
+		@type gesture: InputGesture
+		@return: the script bound to the gesture or None if there is no such script
+		@rtype: Optional[Callable[[InputGesture], None]]
+		"""
+		script = super(GlobalPlugin, self).getScript(gesture)
+		recorder.setScript(script.__name__ if script is not None else "")
+		return script
+
+	def getProfiledScript(self, gesture: InputGesture) -> Optional[Callable[[InputGesture], None]]:
+		"""Replaces the getScript method while the profiler is armed, so the found scripts are profiled.
+		@param gesture: the input gesture in question
+		@type gesture: InputGesture
+		@return: the profiled script bound to the gesture or None if there is no such script
+		@rtype: Optional[Callable[[InputGesture], None]]
+		"""
+		script = GlobalPlugin.getScript(self, gesture)
+		if script is None or not profiler.armed or script.__name__ == "script_profileGestures":
+			return script
+		return profiler.wrap(script)
+
+	def onProfileFinished(self, reason: str, summary: Optional[str]) -> None:
+		"""Restore the original getScript method and report where the statistics are saved.
+		@param reason: why the profiling is finished
+		@type reason: str
+		@param summary: the path to the text summary or None if nothing has been saved
+		@type summary: Optional[str]
+		"""
+		self.__dict__.pop("getScript", None)
+		timer, self._profileTimer = self._profileTimer, None
+		timer and timer.Stop()
+		if summary is None:
+			log.info("Profiling of the %s gestures finished by %s, nothing saved", addonSummary, reason)
+			# Translators: The message is announced when the profiling is finished without results
+			ui.message(_("Profiling stopped"))
+			return
+		log.info("Profile of the %s gestures saved to %s", addonSummary, summary)
+		# Translators: The message is announced when the profile of the gestures is saved
+		ui.message(_("Profile saved"))
+
+	# Translators: The name of the method that displayed in the NVDA input gestures dialog
+	@script(description=_("Profile the next volume gestures or stop profiling"))
+	def script_profileGestures(self, gesture: InputGesture) -> None:
+		"""Profile the next invocations of the add-on scripts and save the statistics to the NVDA settings folder.
+		@param gesture: the input gesture in question
+		@type gesture: InputGesture
+		"""
+		if profiler.armed:
+			profiler.finish("cancel")
+			return
+		count: int = options.current.profileCount
+		timeout: float = options.current.profileTimeout
+		try:
+			profiler.arm(count, timeout, appArgs.configPath, addonName, self.onProfileFinished)
+		except ValueError:
+			log.warning("Unable to start profiling, another profiler is active", exc_info=True)
+			# Translators: The message is announced when the profiler cannot be started
+			ui.message(_("Unable to start profiling"))
+			return
+		# The method is replaced only for this instance and only while the profiler is armed
+		self.getScript = self.getProfiledScript
+		self._profileTimer = core.callLater(int(timeout * 1000), profiler.finish, "timeout")
+		# Translators: The message is announced when the profiling of the next gestures is started
+		ui.message(_("Profiling the next {count} gestures").format(count=count))
+
 	__defaultGestures = {
 		# Volume level
 		"kb:NVDA+windows+upArrow": "volumeUp",
@@ -8,24 +8,61 @@
 from __future__ import annotations
 import json
 from abc import ABCMeta, abstractmethod
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
 from ctypes import POINTER, cast
-from os import path
-from threading import Thread
-from typing import Dict, Iterator, List, Optional, Union
+from hashlib import sha256
+from itertools import count
+from math import nan
+from os import path, replace
+from queue import Empty, Queue
+from threading import Condition, Event, Lock, RLock, Thread, Timer, get_ident
+from time import monotonic
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
 import config
-from comtypes import CLSCTX_ALL, CLSCTX_INPROC_SERVER, CoCreateInstance, pointer
+import core
+import psutil
+from comtypes import (
+	CLSCTX_ALL,
+	CLSCTX_INPROC_SERVER,
+	COINIT_MULTITHREADED,
+	GUID,
+	CoCreateInstance,
+	CoInitializeEx,
+	CoUninitialize,
+	pointer,
+)
+from extensionPoints import Action
 from globalVars import appArgs
+from logHandler import log
+from pycaw.callbacks import (
+	AudioEndpointVolumeCallback,
+	AudioSessionEvents,
+	AudioSessionNotification,
+	MMNotificationClient,
+)
+from pycaw.api.endpointvolume import IAudioMeterInformation
+from pycaw.api.mmdeviceapi import IMMDevice
+from pycaw.api.mmdeviceapi.depend.structures import PROPERTYKEY
+from pycaw.constants import STGM, AudioSessionState
 from pycaw.utils import (
-	AudioDevice,
+	DEVICE_STATE,
 	AudioSession,
 	AudioUtilities,
 	CLSID_MMDeviceEnumerator,
 	EDataFlow,
 	ERole,
 	IAudioEndpointVolume,
+	IAudioSessionControl2,
 	IMMDeviceEnumerator,
 	ISimpleAudioVolume,
 )
+from queueHandler import eventQueue, queueFunction
+from .backends import AudioBackend, AudioEndpoint
+from .comcalls import accounting
+from .recorder import CHANNEL, DEFAULT, LEVEL, MUTE, SCAN, UNMUTE, recorder
+from .timings import timings
 
 addonName = path.basename(path.dirname(__file__))
 
@@ -35,10 +72,25 @@ class Configuration(object):
 	and list of muted audio sources.
 	"""
 
-	def __init__(self) -> None:
-		"""File name for saving data and loading previously saved data."""
+	def __init__(self, delay: float = 1.0) -> None:
+		"""File name for saving data and loading previously saved data.
+		@param delay: time in seconds to accumulate changes before writing them to the file
+		@type delay: float
+		"""
 		self._file = path.join(appArgs.configPath, path.basename(path.dirname(__file__)) + ".json")
 		self._data: Dict = {}
+		# Order-preserving hashed indexes, serialized as lists to keep the layout of the file
+		self._muted: Dict[str, None] = {}
+		# Volume levels left by the partial muting, None for the audio sources muted completely
+		self._mutedLevels: Dict[str, Optional[float]] = {}
+		self._processes: Dict[str, None] = {}
+		self._delay: float = delay
+		self._lock = RLock()
+		self._timer: Optional[Timer] = None
+		self._digest: str = ""
+		self._saveRequests: int = 0
+		self._writes: int = 0
+		self._failed: bool = False
 		self.load()
 
 	def load(self) -> Configuration:
@@ -53,18 +105,84 @@ class Configuration(object):
 			pass
 		if "version" not in self._data:
 			self._data = {"version": 0}
+		self._muted = dict.fromkeys(self._data.pop("muted", []))
+		self._mutedLevels = self._data.pop("mutedLevels", {})
+		self._processes = dict.fromkeys(self._data.pop("processes", []))
+		self._digest = sha256(self.serialize().encode("utf-8")).hexdigest()
 		return self
 
+	def serialize(self) -> str:
+		"""Represent the data in the format of the external file.
+		@return: JSON representation of the data
+		@rtype: str
+		"""
+		data = dict(self._data)
+		if self._processes:
+			data["processes"] = list(self._processes)
+		if self._muted:
+			data["muted"] = list(self._muted)
+		if self._mutedLevels:
+			data["mutedLevels"] = dict(self._mutedLevels)
+		return json.dumps(data, skipkeys=True, ensure_ascii=False, indent=4)
+
+	@property
+	def saveRequests(self) -> int:
+		"""The number of requests to save the data.
+		@return: number of save requests
+		@rtype: int
+		"""
+		return self._saveRequests
+
+	@property
+	def writes(self) -> int:
+		"""The number of times the data were actually written to the file.
+		@return: number of physical writes
+		@rtype: int
+		"""
+		return self._writes
+
 	def save(self) -> bool:
-		"""Save the data to an external file.
+		"""Mark the data as changed, they will be written to the external file after a short delay.
+		All changes made within the delay are written at once.
+		@return: False if the previous write of the data has failed, so the changes may not reach the file
+		@rtype: bool
+		"""
+		with self._lock:
+			self._saveRequests += 1
+			if self._timer is None:
+				self._timer = Timer(self._delay, self.flush)
+				self._timer.daemon = True
+				self._timer.start()
+			return not self._failed
+
+	def flush(self) -> bool:
+		"""Write the changed data to the external file immediately.
+		The file is replaced atomically and is not rewritten if its content has not changed.
 		@return: whether the data has been successfully saved
 		@rtype: bool
 		"""
-		try:
-			with open(self._file, "w", encoding="utf-8") as f:
-				f.write(json.dumps(self._data, skipkeys=True, ensure_ascii=False, indent=4))
-		except Exception:
-			return False
+		with self._lock:
+			if self._timer is not None:
+				self._timer.cancel()
+				self._timer = None
+			# All changes of the data are made with the lock acquired, so they can not interfere with serialization
+			content = self.serialize()
+			digest = sha256(content.encode("utf-8")).hexdigest()
+			if digest == self._digest:
+				return True
+			temp = self._file + ".tmp"
+			try:
+				with timings.span("configSave"):
+					with open(temp, "w", encoding="utf-8") as f:
+						f.write(content)
+					replace(temp, self._file)
+			except Exception:
+				self._failed = True
+				log.warning("Unable to save the add-on data to %s", self._file, exc_info=True)
+				return False
+			self._failed = False
+			self._digest = digest
+			self._writes += 1
 		return True
 
 	@property
@@ -83,7 +201,8 @@ class Configuration(object):
 		@return: updated self object
 		@rtype: Configuration
 		"""
-		self._data["devices"] = devices
+		with self._lock:
+			self._data["devices"] = devices
 		return self
 
 	@property
@@ -92,7 +211,8 @@ class Configuration(object):
 		@return: list of full names of processes
 		@rtype: List[str]
 		"""
-		return self._data.get("processes", [])
+		with self._lock:
+			return list(self._processes)
 
 	@processes.setter
 	def processes(self, processes: List[str]) -> Configuration:
@@ -102,9 +222,28 @@ class Configuration(object):
 		@return: updated self object
 		@rtype: Configuration
 		"""
-		self._data["processes"] = list(processes)
+		with self._lock:
+			self._processes = dict.fromkeys(processes)
 		return self
 
+	def isHiddenProcess(self, name: str) -> bool:
+		"""Check whether the process needs to be hidden.
+		@param name: full name of the process
+		@type name: str
+		@return: whether the process is in the list of hidden processes
+		@rtype: bool
+		"""
+		return name in self._processes
+
+	def isHiddenDevice(self, id: str) -> bool:
+		"""Check whether the audio device needs to be hidden.
+		@param id: audio device ID
+		@type id: str
+		@return: whether the audio device is in the collection of hidden devices
+		@rtype: bool
+		"""
+		return id in self.devices
+
 	def isChangedDevices(self, devices: Dict[str, str]) -> bool:
 		"""Determine if the new list of audio devices differs from the existing one.
 		@param devices: dict with devices in which the key is the ID and the value is the device name
@@ -121,7 +260,7 @@ class Configuration(object):
 		@return: indication of whether the data are different
 		@rtype: bool
 		"""
-		return bool(set(self.processes) ^ set(processes))
+		return bool(self._processes.keys() ^ set(processes))
 
 	@property
 	def muted(self) -> List[str]:
@@ -129,18 +268,42 @@ class Configuration(object):
 		@return: list of names of audio sessions and IDs of audio devices
 		@rtype: List[str]
 		"""
-		return self._data.get("muted", [])
+		with self._lock:
+			return list(self._muted)
 
-	def addMuted(self, name: Optional[str]) -> Configuration:
+	def isMuted(self, name: str) -> bool:
+		"""Check whether the audio source has been muted by the methods of this add-on.
+		@param name: name of the audio session or ID of the audio device
+		@type name: str
+		@return: whether the audio source is in the collection of muted
+		@rtype: bool
+		"""
+		return name in self._muted
+
+	@property
+	def mutedLevels(self) -> Dict[str, Optional[float]]:
+		"""The states left by this add-on when it muted the audio sources.
+		The audio sources saved by the previous versions of the add-on are absent.
+		@return: volume levels left by the partial muting or None for the audio sources muted completely
+		@rtype: Dict[str, Optional[float]]
+		"""
+		with self._lock:
+			return dict(self._mutedLevels)
+
+	def addMuted(self, name: Optional[str], level: Optional[float] = None) -> Configuration:
 		"""Add name of the audio source to the collection of muted.
 		@param name: name of the audio session or ID of the audio device
 		@type name: Optional[str]
+		@param level: the volume level left by the partial muting, None if the audio source is muted completely
+		@type level: Optional[float]
 		@return: the current object instance for further reference to its attributes
 		@rtype: Configuration
 		"""
-		if name and name not in self.muted:
-			self.muted.append(name)
-			self._data["muted"] = self.muted
+		if name:
+			with self._lock:
+				self._muted[name] = None
+				if level is not None or name not in self._mutedLevels:
+					self._mutedLevels[name] = level
 		return self
 
 	def delMuted(self, name: str) -> Configuration:
@@ -150,12 +313,9 @@ class Configuration(object):
 		@return: the current object instance for further reference to its attributes
 		@rtype: Configuration
 		"""
-		try:
-			self.muted.remove(name)
-		except ValueError:
-			pass
-		else:
-			self._data["muted"] = self.muted
+		with self._lock:
+			self._muted.pop(name, None)
+			self._mutedLevels.pop(name, None)
 		return self
 
 
@@ -163,9 +323,152 @@ class Configuration(object):
 cfg = Configuration()
 
 
+class AddonSettings(NamedTuple):
+	"""Immutable copy of the add-on settings used on hot paths."""
+
+	status: bool = True
+	step: int = 1
+	focus: bool = True
+	duplicates: bool = True
+	advanced: bool = False
+	muteCompletely: bool = False
+	mutePercentage: int = 75
+	unmuteOnExit: bool = True
+	gestures: bool = True
+	sessionsCacheTTL: float = 1.0
+	scanWorkers: int = 0
+	activationTimeout: float = 2.0
+	coalescingDelay: float = 0.2
+	shutdownDeadline: float = 2.0
+	activeOnly: bool = False
+	peakMeters: bool = False
+	peakSampler: bool = False
+	peakInterval: float = 0.05
+	timings: bool = False
+	comCalls: bool = False
+	profileCount: int = 10
+	profileTimeout: float = 120.0
+
+
+class SettingsSnapshot(object):
+	"""Holds the add-on settings read from the NVDA configuration.
+	The snapshot is rebuilt only when the configuration is saved, reset or the profile is switched,
+	so volume gestures do not walk through the profile-aware configobj sections on every step.
+	"""
+
+	def __init__(self) -> None:
+		"""Initialize the snapshot with the default values of the add-on settings."""
+		self._current: AddonSettings = AddonSettings()
+		self._lookups: int = 0
+		self._rebuilds: int = 0
+		self._running: bool = False
+		# Notified with the new and the previous settings each time the snapshot is rebuilt
+		self.changed = Action()
+
+	@property
+	def current(self) -> AddonSettings:
+		"""The latest snapshot of the add-on settings.
+		@return: immutable add-on settings
+		@rtype: AddonSettings
+		"""
+		return self._current
+
+	@property
+	def lookups(self) -> int:
+		"""The number of configobj lookups performed to build the snapshots.
+		@return: total number of lookups
+		@rtype: int
+		"""
+		return self._lookups
+
+	@property
+	def rebuilds(self) -> int:
+		"""The number of times the snapshot has been rebuilt.
+		@return: total number of rebuilds
+		@rtype: int
+		"""
+		return self._rebuilds
+
+	def rebuild(self, *args, **kwargs) -> AddonSettings:
+		"""Read the add-on section of the NVDA configuration and publish a new snapshot.
+		Accepts any arguments so it can be registered directly as an extension point handler.
+		@return: the new snapshot of the add-on settings
+		@rtype: AddonSettings
+		"""
+		try:
+			section = config.conf[addonName]
+			self._lookups += 1
+			values = {}
+			for field in AddonSettings._fields:
+				values[field] = section[field]
+				self._lookups += 1
+		except KeyError:
+			log.debug("The configuration of the %s add-on is not registered yet", addonName)
+			return self._current
+		previous, self._current = self._current, AddonSettings(**values)
+		self._rebuilds += 1
+		log.debug("Settings snapshot rebuilt, %d configobj lookups in total", self._lookups)
+		self.changed.notify(settings=self._current, previous=previous)
+		return self._current
+
+	def start(self) -> SettingsSnapshot:
+		"""Build the snapshot and keep it up to date with the NVDA configuration.
+		@return: the current object instance for further reference to its attributes
+		@rtype: SettingsSnapshot
+		"""
+		if not self._running:
+			config.post_configSave.register(self.rebuild)
+			config.post_configReset.register(self.rebuild)
+			config.post_configProfileSwitch.register(self.rebuild)
+			self._running = True
+		self.rebuild()
+		return self
+
+	def stop(self) -> None:
+		"""Stop tracking changes of the NVDA configuration."""
+		if self._running:
+			config.post_configSave.unregister(self.rebuild)
+			config.post_configReset.unregister(self.rebuild)
+			config.post_configProfileSwitch.unregister(self.rebuild)
+			self._running = False
+
+
+# Shared snapshot of the add-on settings
+options = SettingsSnapshot()
+
+
+class MeteredAudioSession(AudioSession):
+	"""pycaw.AudioSession which also gives access to the peak meter of the audio session."""
+
+	@property
+	def meter(self) -> IAudioMeterInformation:
+		"""The peak meter of the audio session.
+		@return: pointer to the peak meter interface
+		@rtype: pycaw.IAudioMeterInformation
+		"""
+		return self._ctl.QueryInterface(IAudioMeterInformation)
+
+
 class ExtendedAudioUtilities(AudioUtilities):
 	"""Improved Audio Utilities object which gives more opportunities."""
 
+	@staticmethod
+	def GetAllSessions() -> List[MeteredAudioSession]:
+		"""Enumerate all audio sessions of the default output device.
+		@return: all audio sessions detected in the system
+		@rtype: List[MeteredAudioSession]
+		"""
+		sessions: List[MeteredAudioSession] = []
+		manager = ExtendedAudioUtilities.GetAudioSessionManager()
+		if manager is None:
+			return sessions
+		enumerator = manager.GetSessionEnumerator()
+		for i in range(enumerator.GetCount()):
+			control = enumerator.GetSession(i)
+			if control is not None:
+				sessions.append(MeteredAudioSession(control.QueryInterface(IAudioSessionControl2)))
+		return sessions
+
 	@staticmethod
 	def GetSpeaker(id: Optional[str] = None):
 		"""Get speakers by its ID (render + multimedia) device.
@@ -189,196 +492,1597 @@ class ExtendedAudioUtilities(AudioUtilities):
 		return speakers
 
 
-class AudioSource(metaclass=ABCMeta):
-	"""Represents the basic properties of audio source."""
+class PycawBackend(AudioBackend):
+	"""Windows Core Audio API accessed through pycaw and comtypes."""
 
-	def __init__(
-		self,
-		id: str,
-		name: str,
-		volume: Union[ISimpleAudioVolume, pointer[IAudioEndpointVolume], None] = None,
-	) -> None:
-		"""The main properties of an audio source.
-		@param id: audio source ID (audio device ID or audio session name)
-		@type id: str
-		@param name: name of audio source
-		@type name: str
-		@param volume: pointer on the interface to adjust the volume of the audio source
-		@type volume: Union[pycaw.ISimpleAudioVolume, pointer[pycaw.IAudioEndpointVolume], None]
+	def getAllSessions(self) -> List[AudioSession]:
+		"""Enumerate all audio sessions of the default output device.
+		@return: all audio sessions detected in the system
+		@rtype: List[MeteredAudioSession]
 		"""
-		self._id = id
-		self._name = name
-		self._volume = volume
-		self._channel: int = 0
-		self._default: bool = False
+		return ExtendedAudioUtilities.GetAllSessions()
 
-	@property
-	def id(self) -> str:
-		"""ID of the current audio source.
-		@return: device ID or audio session name
-		@rtype: str
+	def pids(self) -> Set[int]:
+		"""Identifiers of all running processes.
+		@return: set of PIDs
+		@rtype: Set[int]
 		"""
-		return self._id
+		return set(psutil.pids())
 
-	@property
-	def name(self) -> str:
-		"""Name of the current audio source.
-		@return: audio source name
-		@rtype: str
+	def scanner(self) -> AudioEndpointsScanner:
+		"""Create the object that enumerates audio endpoints and activates their interfaces.
+		@return: new scanner of audio endpoints
+		@rtype: AudioEndpointsScanner
 		"""
-		return self._name
+		return AudioEndpointsScanner()
 
-	@property
-	def volume(self) -> Union[ISimpleAudioVolume, IAudioEndpointVolume, None]:
-		"""An object that gives access to control the volume of the sound source.
-		@return: volume control object
-		@rtype: Union[pycaw.ISimpleAudioVolume, pycaw.IAudioEndpointVolume, None]
+	def sessionSource(self) -> SessionNotificationSource:
+		"""Create the source of notifications about audio sessions.
+		@return: notifications of IAudioSessionManager2
+		@rtype: SessionNotificationSource
 		"""
-		return self._volume
+		return WASAPISessionNotificationSource()
 
-	@property
-	def channel(self) -> int:
-		"""Get selected channel of the audio source.
-		@return: the number of the audio channel
-		@rtype: int
+	def deviceSource(self) -> DeviceNotificationSource:
+		"""Create the source of notifications about audio devices.
+		@return: notifications of IMMNotificationClient
+		@rtype: DeviceNotificationSource
 		"""
-		return self._channel
+		return WASAPIDeviceNotificationSource()
 
-	@channel.setter
-	def channel(self, number: int) -> None:
-		"""Select the channel of the audio source.
-		@param number: the number of the audio channel
-		@type number: int
+
+# The audio backend used by all components of the module
+backend: AudioBackend = PycawBackend()
+
+
+# Property keys of the audio endpoint names
+PKEY_Device_FriendlyName = PROPERTYKEY(GUID("{a45c254e-df1c-4efd-8020-67d146a850e0}"), 14)
+PKEY_Device_DeviceDesc = PROPERTYKEY(GUID("{a45c254e-df1c-4efd-8020-67d146a850e0}"), 2)
+
+# Event contexts of the volume changes made by this add-on share the first three groups of digits,
+# the last two groups carry the sequence number of the change
+EVENT_CONTEXT_PREFIX = str(GUID.create_new())[:20].upper()
+# Sequence numbers of the volume changes made by this add-on
+eventSequence = count(1)
+
+
+def ownEventContext(sequence: int) -> GUID:
+	"""Create the event context which is passed with the volume change made by this add-on.
+	@param sequence: the sequence number of the volume change
+	@type sequence: int
+	@return: the event context returned by the audio service with the notification of the change
+	@rtype: GUID
+	"""
+	digits = "%016X" % sequence
+	return GUID("%s%s-%s}" % (EVENT_CONTEXT_PREFIX, digits[:4], digits[4:]))
+
+
+def ownEventSequence(context) -> int:
+	"""Recognize the notification of the volume change made by this add-on.
+	@param context: the event context received with the notification, GUID or pointer to GUID
+	@return: the sequence number of the volume change or 0 if it was made by another client
+	@rtype: int
+	"""
+	try:
+		text = str(getattr(context, "contents", context)).upper()
+	except ValueError:
+		# NULL pointer
+		return 0
+	if not text.startswith(EVENT_CONTEXT_PREFIX):
+		return 0
+	return int(text[len(EVENT_CONTEXT_PREFIX) :].strip("}").replace("-", ""), 16)
+
+
+class DevicesScanReport(NamedTuple):
+	"""Statistics of one scan of audio devices."""
+
+	duration: float
+	comCalls: int
+	devices: int
+
+
+class EndpointActivationPool(object):
+	"""Bounded pool of worker threads which activate audio endpoints concurrently.
+	Each worker initializes its own multithreaded COM apartment and uses its own device enumerator.
+	The endpoints whose drivers do not respond before the common deadline of the scan are dropped.
+	"""
+
+	def __init__(self, workers: int, timeout: float) -> None:
+		"""Settings of the pool.
+		@param workers: maximum number of worker threads
+		@type workers: int
+		@param timeout: maximum time in seconds to activate all audio endpoints of one scan
+		@type timeout: float
 		"""
-		try:
-			number %= self.channelCount
-		except ZeroDivisionError:
-			number = 0
-		self._channel = number
+		self._workers: int = max(1, workers)
+		self._timeout: float = timeout
+		self._calls: int = 0
+		self._dropped: int = 0
+		self._lock = Lock()
 
 	@property
-	def default(self) -> bool:
-		"""Check if the current audio source is the default output device.
-		@return: default output audio device or not
-		@rtype: bool
+	def comCalls(self) -> int:
+		"""The number of COM calls made by all workers.
+		@return: number of COM calls
+		@rtype: int
 		"""
-		return self._default
+		return self._calls
 
-	# MyPy 0.812 is not supported type hints for abstract property getters and setters
-	# https://github.com/python/mypy/issues/4165
-	@property  # type: ignore
-	@abstractmethod
-	def volumeLevel(self) -> float:
-		"""Get the volume level of the sound source.
-		The method must be overridden for each type of sound sources.
-		@return: current volume level
-		@rtype: float [0.0..1.0]
+	@property
+	def dropped(self) -> int:
+		"""The number of audio endpoints dropped due to the timeout.
+		@return: number of dropped endpoints
+		@rtype: int
 		"""
-		raise NotImplementedError("This property must be overridden in the child class!")
+		return self._dropped
 
-	# Decorated property is not supported by MyPy 0.812
-	# https://github.com/python/mypy/issues/1362
-	@volumeLevel.setter  # type: ignore
-	@abstractmethod
-	def volumeLevel(self, level: float) -> None:
-		"""Set the volume level of the sound source.
-		The method must be overridden for each type of sound sources.
-		@param level: target volume level
-		@type level: float [0.0..1.0]
+	def activate(self, ids: List[str]) -> List[Optional[AudioEndpoint]]:
+		"""Activate audio endpoints concurrently and return the results in the order of the given IDs.
+		@param ids: IDs of audio devices
+		@type ids: List[str]
+		@return: detected audio endpoints, None for those which could not be activated in time
+		@rtype: List[Optional[AudioEndpoint]]
 		"""
-		raise NotImplementedError("This property must be overridden in the child class!")
+		results: List[Optional[AudioEndpoint]] = [None] * len(ids)
+		done: List[Event] = [Event() for id in ids]
+		jobs: Queue[int] = Queue()
+		for position in range(len(ids)):
+			jobs.put(position)
+		cancelled = Event()
 
-	def volumeUp(self) -> float:
-		"""Increase the volume level by the specified step.
-		@return: current volume level
-		@rtype: float
-		"""
-		self.isMuted and self.unmute()
-		# Ignore MyPy type hint because setter volumeLevel is not read-only
-		level = self.volumeLevel = min(  # type: ignore
-			1.0,
-			float(round(self.volumeLevel * 100.0) + config.conf[addonName]["step"]) / 100.0,
-		)
-		return level
+		def work() -> None:
+			"""Activate audio endpoints from the queue in the separate COM apartment."""
+			CoInitializeEx(COINIT_MULTITHREADED)
+			scanner = AudioEndpointsScanner()
+			try:
+				while not cancelled.is_set():
+					try:
+						position = jobs.get_nowait()
+					except Empty:
+						break
+					results[position] = scanner.device(ids[position])
+					done[position].set()
+			finally:
+				with self._lock:
+					self._calls += scanner.comCalls
+				CoUninitialize()
 
-	def volumeDown(self) -> float:
-		"""Decrease the volume level by the specified step.
-		@return: current volume level
-		@rtype: float
-		"""
-		self.isMuted and self.unmute()
-		# Ignore MyPy type hint because setter volumeLevel is not read-only
-		level = self.volumeLevel = max(  # type: ignore
-			0.0,
-			float(round(self.volumeLevel * 100.0) - config.conf[addonName]["step"]) / 100.0,
-		)
-		return level
+		deadline = monotonic() + self._timeout
+		for i in range(min(self._workers, len(ids))):
+			Thread(target=work, daemon=True).start()
+		# Each endpoint is classified exactly once, a late result must not be returned without being counted
+		ready: List[bool] = [event.wait(max(0.0, deadline - monotonic())) for event in done]
+		cancelled.set()
+		self._dropped += ready.count(False)
+		return [result if completed else None for result, completed in zip(results, ready)]
 
-	def volumeMax(self) -> float:
-		"""Set the maximum volume level of the audio source.
-		@return: current volume level
-		@rtype: float
+
+class AudioEndpointsScanner(object):
+	"""Detects audio endpoints in one enumeration pass using a single device enumerator.
+	The ID, friendly name, state and activated IAudioEndpointVolume are received together for each device.
+	"""
+
+	def __init__(self) -> None:
+		"""Initial state of the scanner."""
+		self._enumerator = None
+		self._calls: int = 0
+		self._started: float = monotonic()
+
+	@property
+	def comCalls(self) -> int:
+		"""The number of COM calls made by the scanner.
+		@return: number of COM calls
+		@rtype: int
 		"""
-		self.isMuted and self.unmute()
-		# Ignore MyPy type hint because setter volumeLevel is not read-only
-		self.volumeLevel = 1.0  # type: ignore
-		return self.volumeLevel
+		return self._calls
 
-	def volumeMin(self) -> float:
-		"""Set the minimum volume level of the audio source.
-		@return: current volume level
+	@property
+	def duration(self) -> float:
+		"""Time elapsed since the scanner was created.
+		@return: time in seconds
 		@rtype: float
 		"""
-		self.isMuted and self.unmute()
-		# Ignore MyPy type hint because setter volumeLevel is not read-only
-		self.volumeLevel = 0.0  # type: ignore
-		return self.volumeLevel
+		return monotonic() - self._started
 
 	@property
-	def isMuted(self) -> bool:
-		"""Check whether the current audio source is muted.
-		@return: a state of the audio source (muted or no)
-		@rtype: bool
+	def enumerator(self) -> IMMDeviceEnumerator:
+		"""The device enumerator shared by all operations of the scanner.
+		@return: pointer to the device enumerator
+		@rtype: pycaw.IMMDeviceEnumerator
 		"""
-		state = False if self.volume is None else self.volume.GetMute()
-		if not config.conf[addonName]["muteCompletely"]:
-			return (self.id in cfg.muted) or state
-		return state
+		if self._enumerator is None:
+			self._calls += 1
+			self._enumerator = ExtendedAudioUtilities.GetDeviceEnumerator()
+		return accounting.wrap(self._enumerator, "IMMDeviceEnumerator")
 
-	def mute(self) -> bool:
-		"""Mute the current audio source.
-		@return: a state of the audio source (muted or no)
-		@rtype: bool
+	def defaultId(self) -> str:
+		"""Get the ID of the default output audio device (render + multimedia).
+		@return: audio device ID or empty string if there is no default device
+		@rtype: str
 		"""
 		try:
-			if config.conf[addonName]["muteCompletely"]:
-				self.volume.SetMute(True, None)  # type: ignore
-			elif not self.isMuted:
-				# Incorrect handling of AttributeError by MyPy 0.812: https://github.com/python/mypy/issues/8056
-				self.volumeLevel *= (100 - config.conf[addonName]["mutePercentage"]) / 100.0  # type: ignore
-		except AttributeError:
-			return False
-		else:
-			cfg.addMuted(self.id).save()
-			return True
+			self._calls += 2
+			return self.enumerator.GetDefaultAudioEndpoint(
+				EDataFlow.eRender.value,
+				ERole.eMultimedia.value,
+			).GetId()
+		except Exception:
+			return ""
 
-	def unmute(self) -> bool:
-		"""Unmute the current audio source.
-		@return: a state of the audio source (muted or no)
-		@rtype: bool
+	def name(self, id: str) -> str:
+		"""Get the friendly name of the audio device by its ID.
+		@param id: audio device ID
+		@type id: str
+		@return: name of the audio device or empty string if it cannot be determined
+		@rtype: str
 		"""
 		try:
-			# The getattr() function is used for correct processing by the MyPy analyzer
-			getattr(self.volume, "SetMute")(False, None)
-			if self.isMuted:
-				# Setter volumeLevel is not read-only, MyPy issue
-				self.volumeLevel = min(  # type: ignore
-					1.0,
-					round(self.volumeLevel * 100.0) / (100.0 - config.conf[addonName]["mutePercentage"]),
-				)
+			self._calls += 1
+			return self.friendlyName(self.enumerator.GetDevice(id))
+		except Exception:
+			return ""
+
+	def friendlyName(self, immDevice: IMMDevice) -> str:
+		"""Read only the name of the audio device instead of the whole property store.
+		@param immDevice: pointer to the audio device
+		@type immDevice: pycaw.IMMDevice
+		@return: human friendly name of audio device or empty string
+		@rtype: str
+		"""
+		try:
+			self._calls += 1
+			store = immDevice.OpenPropertyStore(STGM.STGM_READ.value)
+			for key in (PKEY_Device_FriendlyName, PKEY_Device_DeviceDesc):
+				self._calls += 1
+				value = store.GetValue(key)
+				name = value.GetValue()
+				value.clear()
+				if name and isinstance(name, str):
+					return name
+		except Exception:
+			pass
+		return ""
+
+	def endpoint(
+		self,
+		immDevice: IMMDevice,
+		id: Optional[str] = None,
+		state: int = DEVICE_STATE.ACTIVE.value,
+	) -> Optional[AudioEndpoint]:
+		"""Activate the volume control interface of the audio device and read its name.
+		@param immDevice: pointer to the audio device
+		@type immDevice: pycaw.IMMDevice
+		@param id: audio device ID if it is already known
+		@type id: Optional[str]
+		@param state: the state of the audio device
+		@type state: int
+		@return: detected audio endpoint or None if it cannot be activated
+		@rtype: Optional[AudioEndpoint]
+		"""
+		try:
+			if id is None:
+				self._calls += 1
+				id = immDevice.GetId()
+			self._calls += 1
+			interface = immDevice.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+		except Exception:
+			return None
+		return AudioEndpoint(
+			id=id or "",
+			name=self.friendlyName(immDevice),
+			state=state,
+			volume=cast(interface, POINTER(IAudioEndpointVolume)),
+		)
+
+	def device(self, id: str) -> Optional[AudioEndpoint]:
+		"""Find the audio device by its ID and activate its volume control interface.
+		@param id: audio device ID
+		@type id: str
+		@return: detected audio endpoint or None if it cannot be activated
+		@rtype: Optional[AudioEndpoint]
+		"""
+		try:
+			self._calls += 1
+			immDevice = self.enumerator.GetDevice(id)
+		except Exception:
+			return None
+		return self.endpoint(immDevice, id)
+
+	def meter(self, id: str) -> Optional[IAudioMeterInformation]:
+		"""Activate the peak meter interface of the audio device.
+		@param id: audio device ID
+		@type id: str
+		@return: pointer to the peak meter or None if it cannot be activated
+		@rtype: Optional[pycaw.IAudioMeterInformation]
+		"""
+		try:
+			self._calls += 2
+			interface = self.enumerator.GetDevice(id).Activate(IAudioMeterInformation._iid_, CLSCTX_ALL, None)
+		except Exception:
+			return None
+		return cast(interface, POINTER(IAudioMeterInformation))
+
+	def endpoints(
+		self,
+		dataFlow: int = EDataFlow.eAll.value,
+		stateMask: int = DEVICE_STATE.ACTIVE.value,
+		workers: int = 0,
+		timeout: float = 2.0,
+	) -> Iterator[AudioEndpoint]:
+		"""Enumerate audio endpoints and activate their volume control interfaces in one pass.
+		The devices which cannot be activated are skipped.
+		@param dataFlow: the data flow direction of audio devices
+		@type dataFlow: int
+		@param stateMask: the states of audio devices to include
+		@type stateMask: int
+		@param workers: the number of threads to activate endpoints concurrently, 0 - activate sequentially
+		@type workers: int
+		@param timeout: maximum time in seconds to activate all audio endpoints by the worker threads
+		@type timeout: float
+		@return: iterator of detected audio endpoints in the order of enumeration
+		@rtype: Iterator[AudioEndpoint]
+		"""
+		if workers > 0:
+			yield from self.endpointsConcurrently(dataFlow, stateMask, workers, timeout)
+			return
+		self._calls += 2
+		collection = self.enumerator.EnumAudioEndpoints(dataFlow, stateMask)
+		for i in range(collection.GetCount()):
+			try:
+				self._calls += 1
+				immDevice = collection.Item(i)
+				state = stateMask
+				if stateMask != DEVICE_STATE.ACTIVE.value:
+					self._calls += 1
+					state = immDevice.GetState()
+			except Exception:
+				continue
+			endpoint = self.endpoint(immDevice, state=state)
+			if endpoint is not None:
+				yield endpoint
+
+	def endpointsConcurrently(
+		self,
+		dataFlow: int,
+		stateMask: int,
+		workers: int,
+		timeout: float,
+	) -> Iterator[AudioEndpoint]:
+		"""Enumerate audio endpoints and activate them using the pool of worker threads.
+		@param dataFlow: the data flow direction of audio devices
+		@type dataFlow: int
+		@param stateMask: the states of audio devices to include
+		@type stateMask: int
+		@param workers: the number of threads to activate endpoints concurrently
+		@type workers: int
+		@param timeout: maximum time in seconds to activate all audio endpoints
+		@type timeout: float
+		@return: iterator of detected audio endpoints in the order of enumeration
+		@rtype: Iterator[AudioEndpoint]
+		"""
+		self._calls += 2
+		collection = self.enumerator.EnumAudioEndpoints(dataFlow, stateMask)
+		ids: List[str] = []
+		for i in range(collection.GetCount()):
+			try:
+				self._calls += 2
+				ids.append(collection.Item(i).GetId())
+			except Exception:
+				continue
+		pool = EndpointActivationPool(workers, timeout)
+		endpoints = pool.activate(ids)
+		self._calls += pool.comCalls
+		for endpoint in endpoints:
+			if endpoint is not None:
+				yield endpoint
+
+
+class ProcessNamesCache(object):
+	"""Names of processes that own audio sessions, keyed by the PID and creation time of the process,
+	so the reused PID of a new process never returns the name of the finished one.
+	The name of each process is requested only once during its lifetime.
+	"""
+
+	def __init__(self) -> None:
+		"""Initial state of the cache."""
+		self._names: Dict[Tuple[int, float], str] = {}
+		self._lock = Lock()
+		self._hits: int = 0
+		self._misses: int = 0
+		self._evictions: int = 0
+
+	@property
+	def hits(self) -> int:
+		"""The number of names returned from the cache.
+		@return: number of cache hits
+		@rtype: int
+		"""
+		return self._hits
+
+	@property
+	def misses(self) -> int:
+		"""The number of names requested from the operating system.
+		@return: number of cache misses
+		@rtype: int
+		"""
+		return self._misses
+
+	@property
+	def evictions(self) -> int:
+		"""The number of names removed from the cache because their processes have finished.
+		@return: number of evicted names
+		@rtype: int
+		"""
+		return self._evictions
+
+	def __len__(self) -> int:
+		"""The number of processes which names are stored in the cache.
+		@return: number of cached names
+		@rtype: int
+		"""
+		return len(self._names)
+
+	def _resolve(self, session: AudioSession) -> Tuple[Optional[Tuple[int, float]], str]:
+		"""Get the identity and the name of the process which owns the audio session.
+		@param session: audio session of the running process
+		@type session: pycaw.AudioSession
+		@return: PID with the creation time of the process and its full name
+		@rtype: Tuple[Optional[Tuple[int, float]], str]
+		"""
+		try:
+			process = session.Process
+			if not process:
+				return None, ""
+			# psutil determines the creation time when the process object is created, so it is not a syscall
+			key: Tuple[int, float] = (process.pid, process.create_time())
+		except Exception:
+			return None, ""
+		name = self._names.get(key)
+		if name is not None:
+			self._hits += 1
+			return key, name
+		self._misses += 1
+		try:
+			name = process.name()
+		except Exception:
+			# Inaccessible processes are also remembered so as not to query them again
+			name = ""
+		self._names[key] = name
+		return key, name
+
+	def name(self, session: AudioSession) -> str:
+		"""Get the name of the process to which the audio session belongs.
+		@param session: audio session of the running process
+		@type session: pycaw.AudioSession
+		@return: full name of the process or empty string if it cannot be determined
+		@rtype: str
+		"""
+		return self.identify(session)[1]
+
+	def identify(self, session: AudioSession) -> Tuple[int, str]:
+		"""Get the PID and the name of the process to which the audio session belongs.
+		@param session: audio session of the running process
+		@type session: pycaw.AudioSession
+		@return: PID or 0 and full name of the process or empty string if they cannot be determined
+		@rtype: Tuple[int, str]
+		"""
+		with self._lock:
+			key, name = self._resolve(session)
+		return key[0] if key else 0, name
+
+	def resolve(self, sessions: List[AudioSession]) -> List[Tuple[int, str]]:
+		"""Get PIDs and names of processes for the whole set of audio sessions at once
+		and remove from the cache the names of processes that have finished.
+		@param sessions: all audio sessions detected in the system
+		@type sessions: List[pycaw.AudioSession]
+		@return: PIDs and full names of processes in the same order as audio sessions, PID is 0 if unknown
+		@rtype: List[Tuple[int, str]]
+		"""
+		with self._lock:
+			resolved = [self._resolve(session) for session in sessions]
+			seen = {key for key, name in resolved}
+			unseen = [key for key in self._names if key not in seen]
+			if unseen:
+				try:
+					alive = backend.pids()
+				except Exception:
+					alive = set()
+				for key in unseen:
+					if key[0] not in alive:
+						del self._names[key]
+						self._evictions += 1
+		return [(key[0] if key else 0, name) for key, name in resolved]
+
+	def clear(self) -> None:
+		"""Remove all names from the cache."""
+		with self._lock:
+			self._names.clear()
+
+
+# Global cache of process names
+processNames = ProcessNamesCache()
+
+
+class AudioSessionsIndex(object):
+	"""Lookup tables for fast search of audio sessions by the name or PID of the process.
+	Built once per snapshot, so process names are not compared one by one on each keystroke.
+	"""
+
+	def __init__(
+		self,
+		entries: List[Tuple[str, AudioSession]],
+		pids: Optional[Dict[int, int]] = None,
+		instances: Optional[Dict[int, str]] = None,
+	) -> None:
+		"""Build lookup tables for the specified audio sessions.
+		@param entries: pairs of the process name and its audio session
+		@type entries: List[Tuple[str, pycaw.AudioSession]]
+		@param pids: already known PIDs keyed by id() of the session object
+		@type pids: Optional[Dict[int, int]]
+		@param instances: already known session instance identifiers keyed by id() of the session object
+		@type instances: Optional[Dict[int, str]]
+		"""
+		self._entries = entries
+		self._known: Dict[int, int] = pids or {}
+		self._instances: Dict[int, str] = instances or {}
+		self._exact: Dict[str, int] = {}
+		self._pids: Dict[int, int] = {}
+		self._identities: Dict[int, Tuple[str, int, str]] = {}
+		# Lowercase process names in the order of enumeration
+		self._names: List[str] = []
+		for position, (name, session) in enumerate(entries):
+			lowered = name.lower()
+			self._exact.setdefault(lowered, position)
+			pid = self.pid(session)
+			if pid:
+				self._pids.setdefault(pid, position)
+			self._names.append(lowered)
+		self._substrings: Dict[str, Optional[int]] = {}
+
+	def find(self, name: str) -> Optional[int]:
+		"""Find the position of the first audio session whose process name contains the given string.
+		Only the audio sessions preceding the exact match of the name are checked for the occurrence,
+		and the result for each string is calculated once per snapshot.
+		@param name: full name or part of the process name
+		@type name: str
+		@return: position of the audio session in the snapshot or None if not found
+		@rtype: Optional[int]
+		"""
+		name = name.lower()
+		if name not in self._substrings:
+			exact = self._exact.get(name)
+			end = len(self._names) if exact is None else exact
+			self._substrings[name] = next(
+				(position for position in range(end) if name in self._names[position]), exact
+			)
+		return self._substrings[name]
+
+	def select(self, name: str, pid: Optional[int] = None) -> int:
+		"""Find the position of the audio session using the same fallback order as the add-on does:
+		the process identifier, the name of the process, the NVDA process and the first audio session.
+		@param name: full name or part of the process name
+		@type name: str
+		@param pid: the identifier of the running process
+		@type pid: Optional[int]
+		@return: position of the audio session in the snapshot
+		@rtype: int
+		"""
+		position = self.findByPid(pid) if pid is not None else None
+		if position is None:
+			position = self.find(name)
+		if position is None:
+			position = self.find("nvda.exe")
+		return position or 0
+
+	def findByPid(self, pid: int) -> Optional[int]:
+		"""Find the position of the audio session by the process identifier.
+		@param pid: the identifier of the running process
+		@type pid: int
+		@return: position of the audio session in the snapshot or None if not found
+		@rtype: Optional[int]
+		"""
+		return self._pids.get(pid)
+
+	def hasPid(self, pid: int) -> bool:
+		"""Check whether the specified process owns any audio session of the snapshot.
+		@param pid: the identifier of the running process
+		@type pid: int
+		@return: whether the process is present in the snapshot
+		@rtype: bool
+		"""
+		return pid in self._pids
+
+	def pid(self, session: AudioSession) -> int:
+		"""The PID of the process which owns the audio session, requested only if it was not known to the snapshot.
+		@param session: audio session of the snapshot
+		@type session: pycaw.AudioSession
+		@return: the identifier of the process or 0 if it cannot be determined
+		@rtype: int
+		"""
+		pid = self._known.get(id(session))
+		if pid is None:
+			try:
+				pid = session.Process.pid
+			except AttributeError:
+				pid = 0
+		return pid or 0
+
+	def identity(self, position: int) -> Tuple[str, int, str]:
+		"""Identity of the audio session that does not change during its lifetime.
+		The session instance identifier is requested only once per snapshot if the snapshot does not know it.
+		@param position: position of the audio session in the snapshot
+		@type position: int
+		@return: the process name, PID and session instance identifier
+		@rtype: Tuple[str, int, str]
+		"""
+		if position not in self._identities:
+			name, session = self._entries[position]
+			instance = self._instances.get(id(session))
+			if instance is None:
+				try:
+					instance = session.InstanceIdentifier
+				except Exception:
+					instance = ""
+			self._identities[position] = (name, self.pid(session), instance or "")
+		return self._identities[position]
+
+
+class AudioSessionsSnapshot(object):
+	"""The list of audio sessions of running processes detected at a certain moment.
+	The name of the process is requested only once for each session when taking the snapshot.
+	"""
+
+	def __init__(
+		self,
+		entries: List[Tuple[str, AudioSession]],
+		states: Optional[Dict[int, int]] = None,
+		pids: Optional[Dict[int, int]] = None,
+		instances: Optional[Dict[int, str]] = None,
+	) -> None:
+		"""Create a snapshot from audio sessions with already resolved names of processes.
+		@param entries: pairs of the process name and its audio session
+		@type entries: List[Tuple[str, pycaw.AudioSession]]
+		@param states: already known states of audio sessions keyed by id() of the session object
+		@type states: Optional[Dict[int, int]]
+		@param pids: already known PIDs of processes keyed by id() of the session object
+		@type pids: Optional[Dict[int, int]]
+		@param instances: already known session instance identifiers keyed by id() of the session object
+		@type instances: Optional[Dict[int, str]]
+		"""
+		self._entries: List[Tuple[str, AudioSession]] = [entry for entry in entries if entry[0]]
+		self._created: float = monotonic()
+		self._index: Optional[AudioSessionsIndex] = None
+		self._pids: Dict[int, int] = pids or {}
+		self._instances: Dict[int, str] = instances or {}
+		self._known: Dict[int, int] = states or {}
+		self._states: Optional[List[int]] = None
+		self._peaks: Optional[List[float]] = None
+		self._measured: float = 0.0
+
+	@classmethod
+	def fromSessions(cls, sessions: List[AudioSession]) -> AudioSessionsSnapshot:
+		"""Resolve process names and leave only sessions related to running processes.
+		@param sessions: all audio sessions detected in the system
+		@type sessions: List[pycaw.AudioSession]
+		@return: snapshot of audio sessions of running processes
+		@rtype: AudioSessionsSnapshot
+		"""
+		resolved = processNames.resolve(sessions)
+		return cls(
+			[(name, session) for (pid, name), session in zip(resolved, sessions)],
+			pids={id(session): pid for (pid, name), session in zip(resolved, sessions) if pid},
+		)
+
+	@property
+	def created(self) -> float:
+		"""The moment when the snapshot was taken.
+		@return: value of the monotonic clock in seconds
+		@rtype: float
+		"""
+		return self._created
+
+	@property
+	def names(self) -> List[str]:
+		"""Names of processes in the same order as their audio sessions.
+		@return: list of full names of processes
+		@rtype: List[str]
+		"""
+		return [name for name, session in self._entries]
+
+	@property
+	def index(self) -> AudioSessionsIndex:
+		"""Lookup tables for the audio sessions of the snapshot, built at the first request.
+		@return: index of audio sessions by process names and PIDs
+		@rtype: AudioSessionsIndex
+		"""
+		if self._index is None:
+			self._index = AudioSessionsIndex(self._entries, self._pids, self._instances)
+		return self._index
+
+	@property
+	def entries(self) -> List[Tuple[str, AudioSession]]:
+		"""Pairs of the process name and its audio session.
+		@return: list of process names with their audio sessions
+		@rtype: List[Tuple[str, pycaw.AudioSession]]
+		"""
+		return self._entries
+
+	def __len__(self) -> int:
+		"""The number of audio sessions in the snapshot.
+		@return: number of audio sessions
+		@rtype: int
+		"""
+		return len(self._entries)
+
+	def __getitem__(self, index: int) -> AudioSession:
+		"""Return the audio session by its sequence number in the snapshot.
+		@param index: the index of the audio session in the snapshot
+		@type index: int
+		@return: audio session from the snapshot
+		@rtype: pycaw.AudioSession
+		"""
+		return self._entries[index][1]
+
+	def __iter__(self) -> Iterator[AudioSession]:
+		"""Iteration through all audio sessions in the snapshot.
+		@return: iterator of all audio sessions
+		@rtype: Iterator[pycaw.AudioSession]
+		"""
+		for name, session in self._entries:
+			yield session
+
+	@property
+	def states(self) -> List[int]:
+		"""States of audio sessions, requested only once for each snapshot.
+		@return: 0 - inactive, 1 - active, 2 - expired for each audio session
+		@rtype: List[int]
+		"""
+		if self._states is None:
+			states: List[int] = []
+			for name, session in self._entries:
+				state = self._known.get(id(session))
+				if state is None:
+					try:
+						state = session.State
+					except Exception:
+						state = AudioSessionState.Expired
+				states.append(int(state))
+			self._states = states
+		return self._states
+
+	def peaks(self, lifetime: float = 1.0) -> List[float]:
+		"""Peak values of the audio meters of active sessions, inactive sessions are not measured.
+		@param lifetime: how long in seconds the measured values are reused
+		@type lifetime: float
+		@return: peak sample values in the range [0.0..1.0] for each audio session
+		@rtype: List[float]
+		"""
+		if self._peaks is None or monotonic() - self._measured > lifetime:
+			peaks: List[float] = []
+			for (name, session), state in zip(self._entries, self.states):
+				peak = 0.0
+				if state == AudioSessionState.Active:
+					try:
+						peak = session.meter.GetPeakValue()
+					except Exception:
+						pass
+				peaks.append(peak)
+			self._peaks, self._measured = peaks, monotonic()
+		return self._peaks
+
+	def activeNames(self, meters: bool = False, lifetime: float = 1.0) -> List[str]:
+		"""Names of processes whose audio sessions are active or audible at the moment.
+		@param meters: whether to leave only the sessions which currently play a sound
+		@type meters: bool
+		@param lifetime: how long in seconds the measured peak values are reused
+		@type lifetime: float
+		@return: list of full names of processes
+		@rtype: List[str]
+		"""
+		if meters:
+			return [name for (name, session), peak in zip(self._entries, self.peaks(lifetime)) if peak > 0.0]
+		return [
+			name
+			for (name, session), state in zip(self._entries, self.states)
+			if state == AudioSessionState.Active
+		]
+
+
+class SessionNotificationSource(metaclass=ABCMeta):
+	"""Source of notifications about creation, state changes and expiration of audio sessions."""
+
+	@abstractmethod
+	def start(self, registry: AudioSessionsRegistry) -> List[AudioSession]:
+		"""Subscribe to notifications and deliver them to the specified registry.
+		The method must be overridden for each type of notification sources.
+		@param registry: the receiver of notifications
+		@type registry: AudioSessionsRegistry
+		@return: audio sessions which already exist at the moment of subscription
+		@rtype: List[pycaw.AudioSession]
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+	@abstractmethod
+	def stop(self) -> None:
+		"""Unsubscribe from all notifications.
+		The method must be overridden for each type of notification sources.
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+
+class SessionCreatedCallback(AudioSessionNotification):
+	"""Receives IAudioSessionNotification::OnSessionCreated events from the audio session manager."""
+
+	def __init__(self, source: WASAPISessionNotificationSource) -> None:
+		"""Remember the notification source that handles the events.
+		@param source: the owner of the callback
+		@type source: WASAPISessionNotificationSource
+		"""
+		super(SessionCreatedCallback, self).__init__()
+		self._source = source
+
+	def OnSessionCreated(self, new_session) -> None:
+		"""Called by the audio session manager, wraps the new audio session so its peak meter is accessible.
+		@param new_session: the IAudioSessionControl interface of the new audio session
+		"""
+		self.on_session_created(MeteredAudioSession(new_session.QueryInterface(IAudioSessionControl2)))
+
+	def on_session_created(self, new_session: AudioSession) -> None:
+		"""Called by pycaw when a new audio session is created.
+		@param new_session: the newly created audio session
+		@type new_session: pycaw.AudioSession
+		"""
+		self._source.watch(new_session)
+
+
+class SessionEventsCallback(AudioSessionEvents):
+	"""Receives IAudioSessionEvents state change and disconnect events of one audio session."""
+
+	def __init__(self, registry: AudioSessionsRegistry, session: AudioSession) -> None:
+		"""Remember the audio session and the registry which must be notified.
+		@param registry: the receiver of notifications
+		@type registry: AudioSessionsRegistry
+		@param session: the observed audio session
+		@type session: pycaw.AudioSession
+		"""
+		super(SessionEventsCallback, self).__init__()
+		self._registry = registry
+		self._session = session
+
+	def on_state_changed(self, new_state: str, new_state_id: int) -> None:
+		"""Called by pycaw when the state of the audio session changes.
+		@param new_state: the name of the new state
+		@type new_state: str
+		@param new_state_id: 0 - inactive, 1 - active, 2 - expired
+		@type new_state_id: int
+		"""
+		if new_state_id == AudioSessionState.Expired:
+			self._registry.sessionExpired(self._session)
+		else:
+			self._registry.sessionStateChanged(self._session, new_state_id)
+
+	def on_session_disconnected(self, disconnect_reason: str, disconnect_reason_id: int) -> None:
+		"""Called by pycaw when the audio session is disconnected.
+		@param disconnect_reason: the name of the reason of disconnection
+		@type disconnect_reason: str
+		@param disconnect_reason_id: the code of the reason of disconnection
+		@type disconnect_reason_id: int
+		"""
+		self._registry.sessionExpired(self._session)
+
+	def on_simple_volume_changed(self, new_volume: float, new_mute: int, event_context) -> None:
+		"""Called by pycaw when the volume level or the mute state of the audio session changes.
+		@param new_volume: the new volume level
+		@type new_volume: float [0.0..1.0]
+		@param new_mute: 1 - muted, 0 - unmuted
+		@type new_mute: int
+		@param event_context: the context value passed by the client which initiated the change
+		"""
+		self._registry.sessionVolumeChanged(self._session, new_volume, bool(new_mute), event_context)
+
+
+class WASAPISessionNotificationSource(SessionNotificationSource):
+	"""Notifications delivered by IAudioSessionManager2 of the default audio device.
+	The audio service delivers them only if the source is started on a thread of the multithreaded apartment.
+	"""
+
+	def __init__(self) -> None:
+		"""Initial state of the notification source."""
+		self._registry: Optional[AudioSessionsRegistry] = None
+		self._manager = None
+		self._callback: Optional[SessionCreatedCallback] = None
+		self._sessions: List[AudioSession] = []
+
+	def start(self, registry: AudioSessionsRegistry) -> List[AudioSession]:
+		"""Register for session-created notifications and enumerate already existing sessions.
+		@param registry: the receiver of notifications
+		@type registry: AudioSessionsRegistry
+		@return: audio sessions which already exist at the moment of subscription
+		@rtype: List[pycaw.AudioSession]
+		"""
+		self._registry = registry
+		self._manager = ExtendedAudioUtilities.GetAudioSessionManager()
+		self._callback = SessionCreatedCallback(self)
+		self._manager.RegisterSessionNotification(self._callback)
+		# Enumeration of sessions is also required to activate notifications
+		enumerator = self._manager.GetSessionEnumerator()
+		sessions: List[AudioSession] = []
+		for i in range(enumerator.GetCount()):
+			control = enumerator.GetSession(i)
+			if control is None:
+				continue
+			session = MeteredAudioSession(control.QueryInterface(IAudioSessionControl2))
+			self.watch(session, notify=False)
+			sessions.append(session)
+		return sessions
+
+	def watch(self, session: AudioSession, notify: bool = True) -> None:
+		"""Subscribe to state change and disconnect events of the audio session.
+		@param session: the observed audio session
+		@type session: pycaw.AudioSession
+		@param notify: whether to inform the registry about the new session
+		@type notify: bool
+		"""
+		if self._registry is None:
+			return
+		try:
+			session.register_notification(SessionEventsCallback(self._registry, session))
+		except Exception:
+			pass
+		else:
+			self._sessions.append(session)
+		notify and self._registry.sessionCreated(session)
+
+	def stop(self) -> None:
+		"""Unsubscribe from all session manager and audio session notifications."""
+		for session in self._sessions:
+			try:
+				session.unregister_notification()
+			except Exception:
+				pass
+		self._sessions = []
+		if self._manager is not None and self._callback is not None:
+			try:
+				self._manager.UnregisterSessionNotification(self._callback)
+			except Exception:
+				pass
+		self._manager = self._callback = self._registry = None
+
+
+class AudioSessionsRegistry(object):
+	"""Always current table of audio sessions which is updated incrementally by notifications
+	instead of enumerating all audio sessions on each request.
+	"""
+
+	def __init__(self, source: SessionNotificationSource) -> None:
+		"""Initial state of the registry.
+		@param source: the source of notifications about audio sessions
+		@type source: SessionNotificationSource
+		"""
+		self._source = source
+		self._entries: Dict[str, Tuple[str, AudioSession]] = {}
+		self._keys: Dict[int, str] = {}
+		self._states: Dict[str, int] = {}
+		self._pids: Dict[str, int] = {}
+		self._snapshot: Optional[AudioSessionsSnapshot] = None
+		self._accounted: bool = False
+		self._lock = Lock()
+		self._running: bool = False
+		self._live: bool = False
+		self._events: int = 0
+		# Notified with the session instance identifier when the audio session expires or disconnects
+		self.sessionRemoved = Action()
+		# Notified with the session instance identifier, level and muted when the volume of the session changes
+		self.volumeChanged = Action()
+
+	@property
+	def source(self) -> SessionNotificationSource:
+		"""The source of notifications about audio sessions.
+		@return: notification source used by the registry
+		@rtype: SessionNotificationSource
+		"""
+		return self._source
+
+	@source.setter
+	def source(self, source: SessionNotificationSource) -> None:
+		"""Replace the source of notifications, the registry is stopped.
+		@param source: the new source of notifications about audio sessions
+		@type source: SessionNotificationSource
+		"""
+		self.stop()
+		self._source = source
+
+	@property
+	def isRunning(self) -> bool:
+		"""Whether the registry receives notifications and contains the current list of audio sessions.
+		@return: the state of the registry
+		@rtype: bool
+		"""
+		return self._running
+
+	@property
+	def isLive(self) -> bool:
+		"""Whether at least one notification has arrived since the registry was started.
+		Notifications are silently not delivered if the registration was made in a wrong COM apartment,
+		so the table is trusted only after the delivery of notifications has been confirmed.
+		@return: whether the registry can replace polling
+		@rtype: bool
+		"""
+		return self._running and self._live
+
+	@property
+	def events(self) -> int:
+		"""The number of notifications handled by the registry.
+		@return: number of handled notifications
+		@rtype: int
+		"""
+		return self._events
+
+	def start(self) -> bool:
+		"""Subscribe to notifications and fill the table with already existing audio sessions.
+		@return: whether the subscription was successful
+		@rtype: bool
+		"""
+		self.stop()
+		with self._lock:
+			self._entries, self._keys, self._states, self._pids = {}, {}, {}, {}
+			self._snapshot = None
+		try:
+			sessions = self._source.start(self)
+		except Exception:
+			self._source.stop()
+			return False
+		for session in sessions:
+			self._add(session)
+		self._running = True
+		return True
+
+	def stop(self) -> None:
+		"""Unsubscribe from notifications, the registry can not be used until it is started again."""
+		self._live = False
+		if self._running:
+			self._running = False
+			self._source.stop()
+
+	def _add(self, session: AudioSession) -> bool:
+		"""Add the audio session to the table.
+		@param session: the audio session
+		@type session: pycaw.AudioSession
+		@return: whether the audio session has been identified
+		@rtype: bool
+		"""
+		try:
+			key: str = session.InstanceIdentifier
+		except Exception:
+			return False
+		pid, name = processNames.identify(session)
+		with self._lock:
+			if name:
+				self._entries[key] = (name, session)
+				self._keys[id(session)] = key
+				self._pids[key] = pid
+				self._snapshot = None
+		return True
+
+	def sessionCreated(self, session: AudioSession) -> None:
+		"""Add the new audio session to the table.
+		@param session: the newly created audio session
+		@type session: pycaw.AudioSession
+		"""
+		if self._add(session):
+			with self._lock:
+				self._events += 1
+				self._live = True
+
+	def sessionStateChanged(self, session: AudioSession, state: int) -> None:
+		"""Remember the new state of the audio session.
+		@param session: the observed audio session
+		@type session: pycaw.AudioSession
+		@param state: 0 - inactive, 1 - active
+		@type state: int
+		"""
+		with self._lock:
+			self._events += 1
+			self._live = True
+			key = self._keys.get(id(session))
+			if key is not None:
+				self._states[key] = state
+				# The activity of sessions is classified once for each snapshot
+				self._snapshot = None
+
+	def sessionExpired(self, session: AudioSession) -> None:
+		"""Remove the expired or disconnected audio session from the table.
+		@param session: the expired audio session
+		@type session: pycaw.AudioSession
+		"""
+		with self._lock:
+			self._events += 1
+			self._live = True
+			key = self._keys.pop(id(session), None)
+			if key is not None:
+				self._entries.pop(key, None)
+				self._states.pop(key, None)
+				self._pids.pop(key, None)
+				self._snapshot = None
+		if key is not None:
+			self.sessionRemoved.notify(instance=key)
+
+	def sessionVolumeChanged(self, session: AudioSession, level: float, muted: bool, context=None) -> None:
+		"""Pass the new volume level and mute state of the audio session to the subscribers.
+		@param session: the observed audio session
+		@type session: pycaw.AudioSession
+		@param level: the new volume level
+		@type level: float [0.0..1.0]
+		@param muted: the new mute state
+		@type muted: bool
+		@param context: the event context passed by the client which initiated the change
+		"""
+		with self._lock:
+			self._events += 1
+			self._live = True
+			key = self._keys.get(id(session))
+		if key is not None:
+			self.volumeChanged.notify(instance=key, level=level, muted=muted, context=context)
+
+	def snapshot(self) -> AudioSessionsSnapshot:
+		"""Return the current list of audio sessions.
+		The snapshot is rebuilt only after the table has been changed by notifications
+		or when the accounting of COM calls is switched, so the calls through its audio sessions are accounted.
+		@return: snapshot of audio sessions of running processes
+		@rtype: AudioSessionsSnapshot
+		"""
+		snapshot = self._snapshot
+		if snapshot is None or self._accounted != accounting.enabled:
+			with self._lock, timings.span("enumeration"):
+				entries: List[Tuple[str, AudioSession]] = []
+				states: Dict[int, int] = {}
+				pids: Dict[int, int] = {}
+				instances: Dict[int, str] = {}
+				for key, (name, session) in self._entries.items():
+					session = accounting.wrap(session, "IAudioSessionControl2")
+					entries.append((name, session))
+					# The identity of the session is known to the registry, the index does not request it again
+					instances[id(session)] = key
+					if self._pids.get(key):
+						pids[id(session)] = self._pids[key]
+					if key in self._states:
+						states[id(session)] = self._states[key]
+				self._accounted = accounting.enabled
+				snapshot = self._snapshot = AudioSessionsSnapshot(entries, states, pids, instances)
+		return snapshot
+
+
+class AudioSessionsCache(object):
+	"""Shared snapshot of audio sessions which is reused by all consumers until it expires.
+	Allows to avoid repeated enumeration of all audio sessions within one burst of keystrokes.
+	"""
+
+	def __init__(self, ttl: float = 1.0, registry: Optional[AudioSessionsRegistry] = None) -> None:
+		"""Initial state of the cache.
+		@param ttl: lifetime of the snapshot in seconds
+		@type ttl: float
+		@param registry: event-driven registry which replaces polling while it is running
+		@type registry: Optional[AudioSessionsRegistry]
+		"""
+		self._ttl: float = ttl
+		self._registry = registry
+		self._snapshot: Optional[AudioSessionsSnapshot] = None
+		self._accounted: bool = False
+		self._lock = Lock()
+		self._hits: int = 0
+		self._misses: int = 0
+
+	@property
+	def ttl(self) -> float:
+		"""Lifetime of the snapshot of audio sessions.
+		@return: time in seconds
+		@rtype: float
+		"""
+		return self._ttl
+
+	@ttl.setter
+	def ttl(self, ttl: float) -> None:
+		"""Change the lifetime of the snapshot of audio sessions.
+		@param ttl: time in seconds, zero disables caching
+		@type ttl: float
+		"""
+		self._ttl = max(0.0, ttl)
+
+	@property
+	def hits(self) -> int:
+		"""The number of requests served from the cache.
+		@return: number of cache hits
+		@rtype: int
+		"""
+		return self._hits
+
+	@property
+	def misses(self) -> int:
+		"""The number of requests that required enumeration of all audio sessions.
+		@return: number of cache misses
+		@rtype: int
+		"""
+		return self._misses
+
+	def snapshot(self) -> AudioSessionsSnapshot:
+		"""Return the current snapshot of audio sessions, take a new one if it has expired.
+		The registry is used only after its notifications have actually been delivered.
+		@return: snapshot of audio sessions of running processes
+		@rtype: AudioSessionsSnapshot
+		"""
+		if self._registry is not None and self._registry.isLive:
+			self._hits += 1
+			return self._registry.snapshot()
+		with self._lock:
+			snapshot = self._snapshot
+			# The audio sessions are wrapped for the accounting of COM calls only when they are enumerated
+			if (
+				snapshot is not None
+				and monotonic() - snapshot.created < self._ttl
+				and self._accounted == accounting.enabled
+			):
+				self._hits += 1
+				return snapshot
+			self._misses += 1
+			with timings.span("enumeration"):
+				with accounting.call("IAudioSessionEnumerator.GetAllSessions"):
+					sessions = backend.getAllSessions()
+				self._accounted = accounting.enabled
+				snapshot = self._snapshot = AudioSessionsSnapshot.fromSessions(
+					accounting.wrapAll(sessions, "IAudioSessionControl2")
+				)
+			return snapshot
+
+	def invalidate(self) -> None:
+		"""Discard the current snapshot, so the next request enumerates all audio sessions again."""
+		with self._lock:
+			self._snapshot = None
+
+	def resetStats(self) -> None:
+		"""Reset the counters of cache hits and misses."""
+		self._hits = self._misses = 0
+
+
+# Global registry of audio sessions, updated by notifications of the audio session manager
+sessionsRegistry = AudioSessionsRegistry(WASAPISessionNotificationSource())
+# Global instance of the audio sessions cache, used while the registry is not running
+sessionsCache = AudioSessionsCache(registry=sessionsRegistry)
+
+
+class ChannelLevels(object):
+	"""Transformations of the volume levels of all channels of an audio source.
+	The levels are kept in a compact array of 32-bit floats, the same type used by the audio endpoint.
+	"""
+
+	@staticmethod
+	def average(levels: array) -> array:
+		"""Set the same average volume level for all channels.
+		@param levels: volume levels of all channels
+		@type levels: array
+		@return: new volume levels
+		@rtype: array
+		"""
+		if not levels:
+			return array("f")
+		return array("f", [sum(levels) / len(levels)]) * len(levels)
+
+	@staticmethod
+	def clamp(levels: array, low: float = 0.0, high: float = 1.0) -> array:
+		"""Limit the volume levels of all channels to the specified range.
+		@param levels: volume levels of all channels
+		@type levels: array
+		@param low: the minimum volume level
+		@type low: float
+		@param high: the maximum volume level
+		@type high: float
+		@return: new volume levels
+		@rtype: array
+		"""
+		return array("f", [min(high, max(low, level)) for level in levels])
+
+
+class VolumeState(NamedTuple):
+	"""Shadow copy of the volume controls of an audio source kept current by notifications.
+	None means that the value is unknown and must be read from the audio source.
+	"""
+
+	level: Optional[float]
+	muted: bool
+	channels: Optional[Tuple[float, ...]]
+
+
+class AudioSource(metaclass=ABCMeta):
+	"""Represents the basic properties of audio source."""
+
+	def __init__(
+		self,
+		id: str,
+		name: str,
+		volume: Union[ISimpleAudioVolume, pointer[IAudioEndpointVolume], None] = None,
+	) -> None:
+		"""The main properties of an audio source.
+		@param id: audio source ID (audio device ID or audio session name)
+		@type id: str
+		@param name: name of audio source
+		@type name: str
+		@param volume: pointer on the interface to adjust the volume of the audio source
+		@type volume: Union[pycaw.ISimpleAudioVolume, pointer[pycaw.IAudioEndpointVolume], None]
+		"""
+		self._id = id
+		self._name = name
+		self._volume = volume
+		self._channel: int = 0
+		self._default: bool = False
+		self._shadow: Optional[VolumeState] = None
+		self._written: int = 0
+
+	@property
+	def id(self) -> str:
+		"""ID of the current audio source.
+		@return: device ID or audio session name
+		@rtype: str
+		"""
+		return self._id
+
+	@property
+	def name(self) -> str:
+		"""Name of the current audio source.
+		@return: audio source name
+		@rtype: str
+		"""
+		return self._name
+
+	@property
+	def volume(self) -> Union[ISimpleAudioVolume, IAudioEndpointVolume, None]:
+		"""An object that gives access to control the volume of the sound source.
+		@return: volume control object
+		@rtype: Union[pycaw.ISimpleAudioVolume, pycaw.IAudioEndpointVolume, None]
+		"""
+		return accounting.wrap(self._volume, "IAudioEndpointVolume")
+
+	@property
+	def shadow(self) -> Optional[VolumeState]:
+		"""The copy of the volume controls which is used instead of reading them from the audio source.
+		@return: the shadow volume state or None if the audio source is not tracked
+		@rtype: Optional[VolumeState]
+		"""
+		return self._shadow
+
+	@property
+	def knownLevel(self) -> float:
+		"""The volume level taken from the shadow volume state, so it is known without COM calls.
+		@return: volume level or NaN if the audio source is not tracked
+		@rtype: float
+		"""
+		shadow = self._shadow
+		return shadow.level if shadow is not None and shadow.level is not None else nan
+
+	def updateShadow(
+		self, level: float, muted: bool, channels: Optional[Tuple[float, ...]] = None, context=None
+	) -> None:
+		"""Replace the shadow volume state, called by the volume change notifications.
+		@param level: the current volume level
+		@type level: float [0.0..1.0]
+		@param muted: the current mute state
+		@type muted: bool
+		@param channels: the current volume levels of all channels
+		@type channels: Optional[Tuple[float, ...]]
+		@param context: the event context of the notification
+		"""
+		sequence = ownEventSequence(context)
+		if sequence and sequence < self._written:
+			# Late notification of an older change made by this add-on, the newer change is already applied
+			return
+		self._shadow = VolumeState(level, muted, channels)
+
+	def ownChange(self) -> GUID:
+		"""Start the volume change made by this add-on,
+		so the notifications of the older changes cannot overwrite its result in the shadow volume state.
+		@return: the event context which must be passed to the volume control
+		@rtype: GUID
+		"""
+		self._written = next(eventSequence)
+		return ownEventContext(self._written)
+
+	def patchShadow(self, **fields) -> None:
+		"""Apply the change made by this add-on to the shadow volume state without waiting for notification.
+		@param fields: the changed fields of the volume state
+		"""
+		shadow = self._shadow
+		if shadow is not None:
+			self._shadow = shadow._replace(**fields)
+
+	def track(self) -> bool:
+		"""Start keeping the shadow volume state of the audio source.
+		@return: whether the shadow volume state is available
+		@rtype: bool
+		"""
+		return False
+
+	def release(self) -> None:
+		"""Stop keeping the shadow volume state of the audio source."""
+		self._shadow = None
+
+	@property
+	def channel(self) -> int:
+		"""Get selected channel of the audio source.
+		@return: the number of the audio channel
+		@rtype: int
+		"""
+		return self._channel
+
+	@channel.setter
+	def channel(self, number: int) -> None:
+		"""Select the channel of the audio source.
+		@param number: the number of the audio channel
+		@type number: int
+		"""
+		try:
+			number %= self.channelCount
+		except ZeroDivisionError:
+			number = 0
+		self._channel = number
+
+	@property
+	def default(self) -> bool:
+		"""Check if the current audio source is the default output device.
+		@return: default output audio device or not
+		@rtype: bool
+		"""
+		return self._default
+
+	# MyPy 0.812 is not supported type hints for abstract property getters and setters
+	# https://github.com/python/mypy/issues/4165
+	@property  # type: ignore
+	@abstractmethod
+	def volumeLevel(self) -> float:
+		"""Get the volume level of the sound source.
+		The method must be overridden for each type of sound sources.
+		@return: current volume level
+		@rtype: float [0.0..1.0]
+		"""
+		raise NotImplementedError("This property must be overridden in the child class!")
+
+	# Decorated property is not supported by MyPy 0.812
+	# https://github.com/python/mypy/issues/1362
+	@volumeLevel.setter  # type: ignore
+	@abstractmethod
+	def volumeLevel(self, level: float) -> None:
+		"""Set the volume level of the sound source.
+		The method must be overridden for each type of sound sources.
+		@param level: target volume level
+		@type level: float [0.0..1.0]
+		"""
+		raise NotImplementedError("This property must be overridden in the child class!")
+
+	def volumeUp(self) -> float:
+		"""Increase the volume level by the specified step.
+		@return: current volume level
+		@rtype: float
+		"""
+		self.isMuted and self.unmute()
+		# Ignore MyPy type hint because setter volumeLevel is not read-only
+		level = self.volumeLevel = min(  # type: ignore
+			1.0,
+			float(round(self.volumeLevel * 100.0) + options.current.step) / 100.0,
+		)
+		return level
+
+	def volumeDown(self) -> float:
+		"""Decrease the volume level by the specified step.
+		@return: current volume level
+		@rtype: float
+		"""
+		self.isMuted and self.unmute()
+		# Ignore MyPy type hint because setter volumeLevel is not read-only
+		level = self.volumeLevel = max(  # type: ignore
+			0.0,
+			float(round(self.volumeLevel * 100.0) - options.current.step) / 100.0,
+		)
+		return level
+
+	def volumeMax(self) -> float:
+		"""Set the maximum volume level of the audio source.
+		@return: current volume level
+		@rtype: float
+		"""
+		self.isMuted and self.unmute()
+		# Ignore MyPy type hint because setter volumeLevel is not read-only
+		self.volumeLevel = 1.0  # type: ignore
+		return self.volumeLevel
+
+	def volumeMin(self) -> float:
+		"""Set the minimum volume level of the audio source.
+		@return: current volume level
+		@rtype: float
+		"""
+		self.isMuted and self.unmute()
+		# Ignore MyPy type hint because setter volumeLevel is not read-only
+		self.volumeLevel = 0.0  # type: ignore
+		return self.volumeLevel
+
+	@property
+	def isMuted(self) -> bool:
+		"""Check whether the current audio source is muted.
+		@return: a state of the audio source (muted or no)
+		@rtype: bool
+		"""
+		state = self.muteState
+		if not options.current.muteCompletely:
+			return cfg.isMuted(self.id) or state
+		return state
+
+	@property
+	def muteState(self) -> bool:
+		"""The mute flag of the audio source itself regardless of the collection of muted.
+		@return: whether the audio source is muted by the system
+		@rtype: bool
+		"""
+		shadow = self._shadow
+		if shadow is not None:
+			return shadow.muted
+		with timings.span("comRead"):
+			return False if self.volume is None else bool(self.volume.GetMute())
+
+	@property
+	def isLeftMuted(self) -> bool:
+		"""Check by the current state whether the audio source is still muted by this add-on.
+		The collection of muted may be saved before an interrupted unmuting has finished,
+		so the audio sources are checked before they are unmuted again.
+		@return: whether the audio source still has the state left by the muting
+		@rtype: bool
+		"""
+		levels = cfg.mutedLevels
+		if self.id not in levels:
+			# Saved by the previous versions of the add-on without the state left by the muting
+			return cfg.isMuted(self.id)
+		level = levels[self.id]
+		if level is None:
+			return self.muteState
+		return abs(self.volumeLevel - level) < 0.01
+
+	def mute(self) -> bool:
+		"""Mute the current audio source.
+		@return: a state of the audio source (muted or no)
+		@rtype: bool
+		"""
+		try:
+			level: Optional[float] = None
+			if options.current.muteCompletely:
+				with timings.span("comWrite"):
+					self.volume.SetMute(True, self.ownChange())  # type: ignore
+				self.patchShadow(muted=True)
+			elif not self.isMuted:
+				level = self.volumeLevel * (100 - options.current.mutePercentage) / 100.0
+				# Incorrect handling of AttributeError by MyPy 0.812: https://github.com/python/mypy/issues/8056
+				self.volumeLevel = level  # type: ignore
+		except AttributeError:
+			return False
+		else:
+			recorder.record(MUTE, self.id)
+			cfg.addMuted(self.id, level).save()
+			return True
+
+	def unmute(self) -> bool:
+		"""Unmute the current audio source.
+		@return: a state of the audio source (muted or no)
+		@rtype: bool
+		"""
+		try:
+			# The getattr() function is used for correct processing by the MyPy analyzer
+			with timings.span("comWrite"):
+				getattr(self.volume, "SetMute")(False, self.ownChange())
+			self.patchShadow(muted=False)
+			if self.isMuted:
+				# Setter volumeLevel is not read-only, MyPy issue
+				self.volumeLevel = min(  # type: ignore
+					1.0,
+					round(self.volumeLevel * 100.0) / (100.0 - options.current.mutePercentage),
+				)
 		except AttributeError:
 			return False
 		else:
+			recorder.record(UNMUTE, self.id)
 			cfg.delMuted(self.id).save()
 			return True
 
@@ -414,6 +2118,47 @@ class AudioSource(metaclass=ABCMeta):
 		"""
 		raise NotImplementedError("This property must be overridden in the child class!")
 
+	def getChannelVolumeLevels(self) -> array:
+		"""Get the volume levels of all channels of the audio source.
+		@return: volume levels of all channels, empty if channels are not supported
+		@rtype: array
+		"""
+		return array(
+			"f", [self.getChannelVolumeLevel(channel) for channel in range(max(0, self.channelCount))]
+		)
+
+	def setChannelVolumeLevels(self, levels: array, current: Optional[array] = None) -> int:
+		"""Set the volume levels of all channels, only the changed channels are written.
+		@param levels: new volume levels of all channels
+		@type levels: array
+		@param current: the volume levels of channels if they have already been read
+		@type current: Optional[array]
+		@return: the number of written channels
+		@rtype: int
+		"""
+		if current is None:
+			current = self.getChannelVolumeLevels()
+		changed: int = 0
+		for channel, (level, old) in enumerate(zip(levels, current)):
+			if level != old:
+				self.setChannelVolumeLevel(level, channel)
+				changed += 1
+		return changed
+
+	def transformChannels(self, transform: Callable[[array], array]) -> array:
+		"""Read the volume levels of all channels once, transform them and write back only the changed channels.
+		@param transform: the transformation of the volume levels, e.g. one of ChannelLevels methods
+		@type transform: Callable[[array], array]
+		@return: new volume levels of all channels, empty if channels are not supported
+		@rtype: array
+		"""
+		levels: array = self.getChannelVolumeLevels()
+		if not levels:
+			return levels
+		result: array = ChannelLevels.clamp(transform(levels))
+		self.setChannelVolumeLevels(result, levels)
+		return result
+
 	def channelVolumeUp(self, channel: int = -1) -> float:
 		"""Increase the volume level for selected channel by the specified step.
 		@param channel: the number of the specified audio channel
@@ -427,7 +2172,7 @@ class AudioSource(metaclass=ABCMeta):
 		level: float = self.getChannelVolumeLevel(channel)
 		if level < 0:
 			return level
-		level = min(1.0, float(round(level * 100.0) + config.conf[addonName]["step"]) / 100.0)
+		level = min(1.0, float(round(level * 100.0) + options.current.step) / 100.0)
 		self.setChannelVolumeLevel(level, channel)
 		return level
 
@@ -444,7 +2189,7 @@ class AudioSource(metaclass=ABCMeta):
 		level: float = self.getChannelVolumeLevel(channel)
 		if level < 0:
 			return level
-		level = max(0.0, float(round(level * 100.0) - config.conf[addonName]["step"]) / 100.0)
+		level = max(0.0, float(round(level * 100.0) - options.current.step) / 100.0)
 		self.setChannelVolumeLevel(level, channel)
 		return level
 
@@ -479,29 +2224,37 @@ class AudioSource(metaclass=ABCMeta):
 		@return: average volume level
 		@rtype: float [-1.0, 0.0..1.0]
 		"""
-		if self.channelCount <= 0:
-			return -1.0
-		level: float = (
-			sum((self.getChannelVolumeLevel(channel) for channel in range(self.channelCount)))
-			/ self.channelCount
-		)
-		for channel in range(self.channelCount):
-			self.setChannelVolumeLevel(level, channel)
-		return level
+		levels: array = self.transformChannels(ChannelLevels.average)
+		return levels[0] if levels else -1.0
 
 
 class VAAudioDevice(AudioSource):
 	"""Presentation of one audio device."""
 
+	_callback: Optional[EndpointVolumeShadowCallback] = None
+	_comCalls: int = 0
+
+	@property
+	def comCalls(self) -> int:
+		"""The number of COM calls made to start and stop tracking the volume state of the audio device.
+		@return: number of COM calls
+		@rtype: int
+		"""
+		return self._comCalls
+
 	@property
 	def volumeLevel(self) -> float:
 		"""Get the volume level of the audio device.
 		@return: current volume level
 		@rtype: float [-1.0, 0.0..1.0]
 		"""
+		shadow = self._shadow
+		if shadow is not None and shadow.level is not None:
+			return shadow.level
 		try:
 			# Incorrect handling of AttributeError by MyPy 0.812: https://github.com/python/mypy/issues/8056
-			return self.volume.GetMasterVolumeLevelScalar()  # type: ignore
+			with timings.span("comRead"):
+				return self.volume.GetMasterVolumeLevelScalar()  # type: ignore
 		except (AttributeError, TypeError):
 			return -1.0
 
@@ -511,11 +2264,17 @@ class VAAudioDevice(AudioSource):
 		@param level: target volume level
 		@type level: float [0.0..1.0]
 		"""
+		old = self.knownLevel
 		try:
 			# Incorrect handling of AttributeError by MyPy
-			self.volume.SetMasterVolumeLevelScalar(level, None)  # type: ignore
+			with timings.span("comWrite"):
+				self.volume.SetMasterVolumeLevelScalar(level, self.ownChange())  # type: ignore
 		except (AttributeError, TypeError):
 			pass
+		else:
+			recorder.record(LEVEL, self.id, old, level)
+			# The levels of channels are scaled by the system, they will be received with the notification
+			self.patchShadow(level=level, channels=None)
 
 	@property
 	def channelCount(self) -> int:
@@ -523,9 +2282,13 @@ class VAAudioDevice(AudioSource):
 		@return: the number of channels
 		@rtype: int
 		"""
+		shadow = self._shadow
+		if shadow is not None and shadow.channels is not None:
+			return len(shadow.channels)
 		try:
 			# Incorrect handling of AttributeError by MyPy
-			return self.volume.GetChannelCount()  # type: ignore
+			with timings.span("comRead"):
+				return self.volume.GetChannelCount()  # type: ignore
 		except (AttributeError, TypeError):
 			return 0
 
@@ -538,9 +2301,13 @@ class VAAudioDevice(AudioSource):
 		"""
 		if channel < 0:
 			channel = self.channel
+		shadow = self._shadow
+		if shadow is not None and shadow.channels is not None and 0 <= channel < len(shadow.channels):
+			return shadow.channels[channel]
 		try:
 			# Incorrect handling of AttributeError by MyPy 0.812: https://github.com/python/mypy/issues/8056
-			return self.volume.GetChannelVolumeLevelScalar(channel)  # type: ignore
+			with timings.span("comRead"):
+				return self.volume.GetChannelVolumeLevelScalar(channel)  # type: ignore
 		except (AttributeError, TypeError):
 			return -1.0
 
@@ -555,17 +2322,544 @@ class VAAudioDevice(AudioSource):
 			channel = self.channel
 		try:
 			# Incorrect handling of AttributeError by MyPy
-			self.volume.SetChannelVolumeLevelScalar(channel, level, None)  # type: ignore
+			with timings.span("comWrite"):
+				self.volume.SetChannelVolumeLevelScalar(channel, level, self.ownChange())  # type: ignore
 		except (AttributeError, TypeError):
 			pass
+		else:
+			shadow = self._shadow
+			if shadow is not None and shadow.channels is not None and 0 <= channel < len(shadow.channels):
+				recorder.record(CHANNEL, self.id, shadow.channels[channel], level, channel)
+				channels = list(shadow.channels)
+				channels[channel] = level
+				# The master level is derived from the channels by the system
+				self.patchShadow(level=None, channels=tuple(channels))
+			else:
+				recorder.record(CHANNEL, self.id, nan, level, channel)
 
+	def getChannelVolumeLevels(self) -> array:
+		"""Get the volume levels of all channels in one pass.
+		@return: volume levels of all channels, empty if the audio device is unavailable
+		@rtype: array
+		"""
+		shadow = self._shadow
+		if shadow is not None and shadow.channels is not None:
+			return array("f", shadow.channels)
+		try:
+			volume = self.volume
+			with timings.span("comRead"):
+				levels = [volume.GetChannelVolumeLevelScalar(i) for i in range(volume.GetChannelCount())]  # type: ignore
+		except (AttributeError, TypeError):
+			return array("f")
+		return array("f", levels)
+
+	def setChannelVolumeLevels(self, levels: array, current: Optional[array] = None) -> int:
+		"""Set the volume levels of all channels, only the changed channels are written.
+		@param levels: new volume levels of all channels
+		@type levels: array
+		@param current: the volume levels of channels if they have already been read
+		@type current: Optional[array]
+		@return: the number of written channels
+		@rtype: int
+		"""
+		if current is None:
+			current = self.getChannelVolumeLevels()
+		changed: int = 0
+		try:
+			with timings.span("comWrite"):
+				for channel, (level, old) in enumerate(zip(levels, current)):
+					if level != old:
+						# Incorrect handling of AttributeError by MyPy
+						self.volume.SetChannelVolumeLevelScalar(channel, level, self.ownChange())  # type: ignore
+						recorder.record(CHANNEL, self.id, old, level, channel)
+						changed += 1
+		except (AttributeError, TypeError):
+			pass
+		if changed and self._shadow is not None:
+			# The master level is derived from the channels by the system
+			self.patchShadow(
+				level=None, channels=tuple(levels[: len(current)]) + tuple(current[len(levels) :])
+			)
+		return changed
+
+	def copy(self, default: bool) -> VAAudioDevice:
+		"""Create the new entry of the same audio device for the next table of audio devices,
+		so the devices of the already published tables are never changed.
+		@param default: whether the audio device is the default output device
+		@type default: bool
+		@return: the new untracked entry of the audio device
+		@rtype: VAAudioDevice
+		"""
+		device = VAAudioDevice(id=self._id, name=self._name, volume=self._volume)
+		device._channel = self._channel
+		device._default = default
+		return device
+
+	def track(self) -> bool:
+		"""Register for IAudioEndpointVolume control change notifications and read the initial volume state.
+		@return: whether the shadow volume state is available
+		@rtype: bool
+		"""
+		if self._callback is not None:
+			return True
+		callback = EndpointVolumeShadowCallback(self)
+		self._comCalls += 1
+		try:
+			# Incorrect handling of AttributeError by MyPy
+			self.volume.RegisterControlChangeNotify(callback)  # type: ignore
+		except Exception:
+			return False
+		self._callback = callback
+		try:
+			volume = self.volume
+			self._comCalls += 1
+			count: int = volume.GetChannelCount()  # type: ignore
+			self._comCalls += 2 + count
+			self.updateShadow(
+				volume.GetMasterVolumeLevelScalar(),  # type: ignore
+				bool(volume.GetMute()),  # type: ignore
+				tuple(volume.GetChannelVolumeLevelScalar(i) for i in range(count)),  # type: ignore
+			)
+		except Exception:
+			self.release()
+			return False
+		return True
+
+	def adopt(self, previous: VAAudioDevice) -> bool:
+		"""Take over the tracking of the volume state from the entry of the same audio device
+		in the replaced table, so the audio device is not registered and read again.
+		@param previous: the tracked entry of the same audio device
+		@type previous: VAAudioDevice
+		@return: whether the shadow volume state has been carried over
+		@rtype: bool
+		"""
+		callback = previous._callback
+		if callback is None or self._callback is not None:
+			return False
+		previous._callback = None
+		callback._device = self
+		self._callback = callback
+		# The registration belongs to the volume interface of the previous entry
+		self._volume = previous._volume
+		self._shadow, self._written = previous._shadow, previous._written
+		previous._shadow = None
+		return True
+
+	def release(self) -> None:
+		"""Unregister from control change notifications and drop the shadow volume state."""
+		callback, self._callback = self._callback, None
+		if callback is not None:
+			self._comCalls += 1
+			try:
+				# Incorrect handling of AttributeError by MyPy
+				self.volume.UnregisterControlChangeNotify(callback)  # type: ignore
+			except Exception:
+				pass
+		super(VAAudioDevice, self).release()
+
+
+class EndpointVolumeShadowCallback(AudioEndpointVolumeCallback):
+	"""Receives IAudioEndpointVolume control change notifications and updates the shadow volume state,
+	so the changes made in the Windows mixer or by other applications are reflected immediately.
+	"""
+
+	def __init__(self, device: VAAudioDevice) -> None:
+		"""Remember the audio device whose volume state is tracked.
+		@param device: the observed audio device
+		@type device: VAAudioDevice
+		"""
+		super(EndpointVolumeShadowCallback, self).__init__()
+		self._device = device
+
+	def on_notify(
+		self, new_volume: float, new_mute: int, event_context, channels: int, channel_volumes: List[float]
+	) -> None:
+		"""Called by pycaw when the volume level, channel levels or the mute state of the audio device change.
+		@param new_volume: the new master volume level
+		@type new_volume: float [0.0..1.0]
+		@param new_mute: 1 - muted, 0 - unmuted
+		@type new_mute: int
+		@param event_context: the context value passed by the client which initiated the change
+		@param channels: the number of channels
+		@type channels: int
+		@param channel_volumes: the new volume levels of all channels
+		@type channel_volumes: List[float]
+		"""
+		self._device.updateShadow(
+			new_volume, bool(new_mute), tuple(channel_volumes[:channels]), event_context
+		)
 
-class VAAudioDevices(object):
-	"""Detection and presentation of all system audio devices."""
+
+class DeviceNotificationSource(metaclass=ABCMeta):
+	"""Source of notifications about connection, disconnection and state changes of audio devices."""
+
+	@abstractmethod
+	def start(self, devices: VAAudioDevices) -> None:
+		"""Subscribe to notifications and deliver them to the specified collection of audio devices.
+		The method must be overridden for each type of notification sources.
+		@param devices: the receiver of notifications
+		@type devices: VAAudioDevices
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+	@abstractmethod
+	def stop(self) -> None:
+		"""Unsubscribe from all notifications.
+		The method must be overridden for each type of notification sources.
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+	@abstractmethod
+	def activate(self, id: str) -> Optional[VAAudioDevice]:
+		"""Create the object to control the volume of the audio device with the specified ID.
+		The method must be overridden for each type of notification sources.
+		@param id: audio device ID
+		@type id: str
+		@return: audio device or None if it cannot be activated
+		@rtype: Optional[VAAudioDevice]
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+
+class EndpointNotificationCallback(MMNotificationClient):
+	"""Receives IMMNotificationClient events and passes them to the main thread of NVDA,
+	because the endpoint enumerator must not be used inside the callback.
+	"""
+
+	def __init__(self, devices: VAAudioDevices) -> None:
+		"""Remember the collection of audio devices that handles the events.
+		@param devices: the receiver of notifications
+		@type devices: VAAudioDevices
+		"""
+		super(EndpointNotificationCallback, self).__init__()
+		self._devices = devices
+
+	def on_device_added(self, added_device_id: str) -> None:
+		"""Called by pycaw when a new audio endpoint device is added.
+		@param added_device_id: audio device ID
+		@type added_device_id: str
+		"""
+		queueFunction(eventQueue, self._devices.deviceAdded, added_device_id)
+
+	def on_device_removed(self, removed_device_id: str) -> None:
+		"""Called by pycaw when an audio endpoint device is removed.
+		@param removed_device_id: audio device ID
+		@type removed_device_id: str
+		"""
+		queueFunction(eventQueue, self._devices.deviceRemoved, removed_device_id)
+
+	def on_device_state_changed(self, device_id: str, new_state: str, new_state_id: int) -> None:
+		"""Called by pycaw when the state of an audio endpoint device changes.
+		@param device_id: audio device ID
+		@type device_id: str
+		@param new_state: the name of the new state
+		@type new_state: str
+		@param new_state_id: 1 - active, 2 - disabled, 4 - not present, 8 - unplugged
+		@type new_state_id: int
+		"""
+		queueFunction(eventQueue, self._devices.deviceStateChanged, device_id, new_state_id)
+
+	def on_default_device_changed(
+		self,
+		flow: str,
+		flow_id: int,
+		role: str,
+		role_id: int,
+		default_device_id: str,
+	) -> None:
+		"""Called by pycaw when the default audio device for a role changes.
+		@param flow: the name of the data flow direction
+		@type flow: str
+		@param flow_id: the code of the data flow direction
+		@type flow_id: int
+		@param role: the name of the device role
+		@type role: str
+		@param role_id: the code of the device role
+		@type role_id: int
+		@param default_device_id: ID of the new default audio device
+		@type default_device_id: str
+		"""
+		if flow_id == EDataFlow.eRender.value and role_id == ERole.eMultimedia.value:
+			queueFunction(eventQueue, self._devices.defaultDeviceChanged, default_device_id)
+
+
+class WASAPIDeviceNotificationSource(DeviceNotificationSource):
+	"""Notifications delivered by IMMDeviceEnumerator::RegisterEndpointNotificationCallback."""
 
 	def __init__(self) -> None:
-		"""Initial values of default audio device and a list of all detected devices."""
-		self._devices: List[VAAudioDevice] = []
+		"""Initial state of the notification source."""
+		self._enumerator = None
+		self._callback: Optional[EndpointNotificationCallback] = None
+
+	def start(self, devices: VAAudioDevices) -> None:
+		"""Register the callback for notifications of the endpoint enumerator.
+		@param devices: the receiver of notifications
+		@type devices: VAAudioDevices
+		"""
+		self._enumerator = ExtendedAudioUtilities.GetDeviceEnumerator()
+		self._callback = EndpointNotificationCallback(devices)
+		self._enumerator.RegisterEndpointNotificationCallback(self._callback)
+
+	def stop(self) -> None:
+		"""Unregister the callback of the endpoint enumerator."""
+		if self._enumerator is not None and self._callback is not None:
+			try:
+				self._enumerator.UnregisterEndpointNotificationCallback(self._callback)
+			except Exception:
+				pass
+		self._enumerator = self._callback = None
+
+	def activate(self, id: str) -> Optional[VAAudioDevice]:
+		"""Create the object to control the volume of the audio device with the specified ID.
+		@param id: audio device ID
+		@type id: str
+		@return: audio device or None if it cannot be activated
+		@rtype: Optional[VAAudioDevice]
+		"""
+		endpoint = AudioEndpointsScanner().device(id)
+		if endpoint is None:
+			return None
+		return VAAudioDevice(id=id, name=endpoint.name or id, volume=endpoint.volume)
+
+
+class AudioDevicesTable(object):
+	"""Immutable list of audio devices published by one scan or one change of the connected devices.
+	Each published table gets the next generation number, so readers can detect a newer table.
+	"""
+
+	def __init__(self, devices: List[VAAudioDevice], generation: int) -> None:
+		"""Create the table of audio devices.
+		@param devices: detected audio devices, the default device goes first
+		@type devices: List[VAAudioDevice]
+		@param generation: sequence number of the table
+		@type generation: int
+		"""
+		self._devices: Tuple[VAAudioDevice, ...] = tuple(devices)
+		self._generation: int = generation
+
+	@property
+	def generation(self) -> int:
+		"""Sequence number of the table, increases with each published table.
+		@return: generation of the table
+		@rtype: int
+		"""
+		return self._generation
+
+	def indexOf(self, id: str) -> int:
+		"""Find the position of the audio device in the table.
+		@param id: audio device ID
+		@type id: str
+		@return: index of the audio device or -1 if it is absent
+		@rtype: int
+		"""
+		return next((i for i, device in enumerate(self._devices) if device.id == id), -1)
+
+	def __len__(self) -> int:
+		"""The number of audio devices in the table.
+		@return: number of audio devices
+		@rtype: int
+		"""
+		return len(self._devices)
+
+	def __getitem__(self, index: int) -> VAAudioDevice:
+		"""Return the audio device by its sequence number in the table.
+		@param index: the index of the device in the table
+		@type index: int
+		@return: audio device from the table
+		@rtype: VAAudioDevice
+		"""
+		return self._devices[index]
+
+	def __iter__(self) -> Iterator[VAAudioDevice]:
+		"""Iteration through all audio devices in the table.
+		@return: iterator of all audio devices
+		@rtype: Iterator[VAAudioDevice]
+		"""
+		return iter(self._devices)
+
+
+class DevicesScanScheduler(object):
+	"""Single long-lived worker which performs scans of audio devices requested from different places.
+	Requests received within the debounce window are coalesced, so any number of requests
+	results in at most one running scan and one pending scan.
+	The worker is initialized for the multithreaded COM apartment, so it also runs the jobs
+	which must be performed in MTA, e.g. the registration for audio session notifications.
+	"""
+
+	def __init__(self, devices: VAAudioDevices, delay: float = 0.2) -> None:
+		"""Initial state of the scheduler.
+		@param devices: the collection of audio devices to scan
+		@type devices: VAAudioDevices
+		@param delay: debounce window in seconds
+		@type delay: float
+		"""
+		self._devices = devices
+		self._delay: float = delay
+		self._condition = Condition()
+		self._pending: Optional[Future[AudioDevicesTable]] = None
+		self._jobs: List[Tuple[Future, Callable[[], object]]] = []
+		self._hide: Dict[str, str] = {}
+		self._due: float = 0.0
+		self._thread: Optional[Thread] = None
+		self._stopped: bool = False
+		self._requested: int = 0
+		self._coalesced: int = 0
+		self._executed: int = 0
+
+	@property
+	def requested(self) -> int:
+		"""The number of requested scans.
+		@return: number of requests
+		@rtype: int
+		"""
+		return self._requested
+
+	@property
+	def coalesced(self) -> int:
+		"""The number of requests merged with the already pending scan.
+		@return: number of coalesced requests
+		@rtype: int
+		"""
+		return self._coalesced
+
+	@property
+	def executed(self) -> int:
+		"""The number of actually performed scans.
+		@return: number of executed scans
+		@rtype: int
+		"""
+		return self._executed
+
+	def request(self, hide: Dict[str, str], delay: Optional[float] = None) -> Future[AudioDevicesTable]:
+		"""Request the scan of audio devices.
+		@param hide: a collection of audio devices that needs to hide, the latest request wins
+		@type hide: Dict[str, str]
+		@param delay: debounce window in seconds for this request, the default window is used if None
+		@type delay: Optional[float]
+		@return: future which is resolved with the published table of audio devices when the scan is finished
+		@rtype: Future[AudioDevicesTable]
+		"""
+		with self._condition:
+			self._requested += 1
+			self._hide = dict(hide)
+			due = monotonic() + (self._delay if delay is None else delay)
+			if self._pending is not None:
+				self._coalesced += 1
+				self._due = min(self._due, due) if delay is not None else max(self._due, due)
+				return self._pending
+			future: Future[AudioDevicesTable] = Future()
+			self._pending, self._due, self._stopped = future, due, False
+			self._startWorker()
+			self._condition.notify()
+		return future
+
+	def submit(self, job: Callable[[], object]) -> Future:
+		"""Run the job on the worker thread before the next scan of audio devices.
+		@param job: the function without arguments which must be called in the multithreaded COM apartment
+		@type job: Callable[[], object]
+		@return: future which is resolved with the value returned by the job
+		@rtype: Future
+		"""
+		future: Future = Future()
+		with self._condition:
+			self._jobs.append((future, job))
+			self._stopped = False
+			self._startWorker()
+			self._condition.notify()
+		return future
+
+	def _startWorker(self) -> None:
+		"""Start the worker thread if it is not running, must be called with the condition acquired."""
+		if self._thread is None or not self._thread.is_alive():
+			self._thread = Thread(target=self._run, daemon=True)
+			self._thread.start()
+
+	def stop(self) -> None:
+		"""Stop the worker, the pending scan is cancelled and the already submitted jobs are still performed."""
+		with self._condition:
+			self._stopped = True
+			if self._pending is not None:
+				self._pending.cancel()
+				self._pending = None
+			self._condition.notify()
+
+	def _run(self) -> None:
+		"""The loop of the worker thread that performs the submitted jobs and the requested scans one by one."""
+		CoInitializeEx(COINIT_MULTITHREADED)
+		try:
+			while True:
+				with self._condition:
+					while (
+						not self._jobs
+						and not self._stopped
+						and (self._pending is None or monotonic() < self._due)
+					):
+						self._condition.wait(None if self._pending is None else self._due - monotonic())
+					if self._stopped and not self._jobs:
+						# A request received after this point starts a new worker
+						self._thread = None
+						return
+					jobs, self._jobs = self._jobs, []
+					future, hide = None, self._hide
+					if not self._stopped and self._pending is not None and monotonic() >= self._due:
+						future, self._pending = self._pending, None
+				for done, job in jobs:
+					if not done.set_running_or_notify_cancel():
+						continue
+					try:
+						done.set_result(job())
+					except Exception as e:
+						done.set_exception(e)
+				if future is None or not future.set_running_or_notify_cancel():
+					continue
+				self._executed += 1
+				try:
+					self._devices.initialize(hide)
+				except Exception as e:
+					future.set_exception(e)
+				else:
+					future.set_result(self._devices.snapshot())
+		finally:
+			CoUninitialize()
+
+
+class VAAudioDevices(object):
+	"""Detection and presentation of all system audio devices.
+	The list of devices is never changed in place, each change publishes a new table by one atomic swap.
+	"""
+
+	def __init__(self, source: Optional[DeviceNotificationSource] = None) -> None:
+		"""Initial values of default audio device and a list of all detected devices.
+		@param source: the source of notifications about connected and disconnected audio devices
+		@type source: Optional[DeviceNotificationSource]
+		"""
+		self._table = AudioDevicesTable([], 0)
+		self._lock = Lock()
+		# The table whose audio devices are tracked, it may lag behind the published one
+		self._tracked = self._table
+		self._tracking = Lock()
+		self._hide: Dict[str, str] = {}
+		self._source = source
+		self._subscribed: bool = False
+		self._lastScan: Optional[DevicesScanReport] = None
+		self._scheduler = DevicesScanScheduler(self)
+
+	@property
+	def source(self) -> Optional[DeviceNotificationSource]:
+		"""The source of notifications about audio devices.
+		@return: notification source or None if notifications are not used
+		@rtype: Optional[DeviceNotificationSource]
+		"""
+		return self._source
+
+	@source.setter
+	def source(self, source: Optional[DeviceNotificationSource]) -> None:
+		"""Replace the source of notifications, the subscription is cancelled.
+		@param source: the new source of notifications about audio devices
+		@type source: Optional[DeviceNotificationSource]
+		"""
+		self.unsubscribe()
+		self._source = source
 
 	def initialize(self, hide: Dict[str, str] = {}) -> VAAudioDevices:
 		"""Detect audio devices and save them in the list.
@@ -575,79 +2869,250 @@ class VAAudioDevices(object):
 		@return: collection of the detected audio devices
 		@rtype: VAAudioDevices
 		"""
-		# pycaw 20251023+ wraps GetSpeakers() result in an AudioDevice (no GetId/Activate);
-		# our own GetSpeaker() helper still returns the raw IMMDevice COM interface,
-		# which is what the rest of this method expects.
-		defaultDevice = ExtendedAudioUtilities.GetSpeaker()
-		self._devices = []
-		if config.conf[addonName]["advanced"]:
+		scanner = backend.scanner()
+		defaultId: str = scanner.defaultId()
+		devices: List[VAAudioDevice] = []
+		self._hide = dict(hide)
+		if options.current.advanced:
 			try:
-				mixers: List[AudioDevice] = [mx for mx in ExtendedAudioUtilities.GetAllDevices() if mx]
-			except Exception:
-				mixers = []
-			for mixer in mixers:
-				immDevice = ExtendedAudioUtilities.GetSpeaker(mixer.id)
-				try:
-					interface = immDevice.Activate(
-						IAudioEndpointVolume._iid_,
-						CLSCTX_ALL,
-						None,
+				endpoints: List[AudioEndpoint] = list(
+					scanner.endpoints(
+						workers=options.current.scanWorkers,
+						timeout=options.current.activationTimeout,
 					)
-				except Exception:
-					continue
+				)
+			except Exception:
+				endpoints = []
+			for endpoint in endpoints:
 				device = VAAudioDevice(
-					id=mixer.id or "",
-					name=mixer.FriendlyName or mixer.id or "",
-					volume=cast(interface, POINTER(IAudioEndpointVolume)),
+					id=endpoint.id,
+					name=endpoint.name or endpoint.id,
+					volume=endpoint.volume,
 				)
 				if device.id and device.name and device.id not in hide:
-					if device.id == defaultDevice.GetId():
+					if device.id == defaultId:
 						device._default = True
-						self._devices.insert(0, device)
+						devices.insert(0, device)
 					else:
-						self._devices.append(device)
+						devices.append(device)
 		# Insert to the list the default audio output device if it is not listed
 		# for some reason on some systems it is not determined in the standard way
-		if not next(filter(lambda d: d.default, self._devices), None):
+		if not next(filter(lambda d: d.default, devices), None):
+			endpoint = scanner.device(defaultId)
 			device = VAAudioDevice(
-				id=defaultDevice.GetId() or "default",
-				name=self.getDeviceNameByID(defaultDevice.GetId()) or "",
-				volume=cast(
-					defaultDevice.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None),
-					POINTER(IAudioEndpointVolume),
-				),
+				id=defaultId or "default",
+				name=endpoint.name if endpoint else "",
+				volume=endpoint.volume if endpoint else None,
 			)
 			device._default = True
-			self._devices.insert(0, device)
+			devices.insert(0, device)
+		table, tracking = self.publish(devices)
+		self._lastScan = DevicesScanReport(scanner.duration, scanner.comCalls + tracking, len(devices))
+		log.debug(
+			"Detected %d audio devices in %.3f s using %d COM calls"
+			% (self._lastScan.devices, self._lastScan.duration, self._lastScan.comCalls)
+		)
 		return self
 
-	def getDeviceNameByID(self, id: Optional[str]) -> str:
-		"""Get the name of the audio device by its ID.
-		@param id: audio device ID
-		@type id: Optional[str]
-		@return: human friendly name of audio device or empty string
-		@rtype: str
+	@property
+	def lastScan(self) -> Optional[DevicesScanReport]:
+		"""Statistics of the last scan of audio devices.
+		@return: the duration of the scan, the number of COM calls and detected devices
+		@rtype: Optional[DevicesScanReport]
+		"""
+		return self._lastScan
+
+	def getDeviceNameByID(self, id: Optional[str]) -> str:
+		"""Get the name of the audio device by its ID.
+		@param id: audio device ID
+		@type id: Optional[str]
+		@return: human friendly name of audio device or empty string
+		@rtype: str
+		"""
+		return backend.scanner().name(id) or " "
+
+	def subscribe(self) -> bool:
+		"""Start receiving notifications about connected and disconnected audio devices.
+		@return: whether the subscription was successful
+		@rtype: bool
+		"""
+		if self._source is None:
+			return False
+		self.unsubscribe()
+		try:
+			self._source.start(self)
+		except Exception:
+			self._source.stop()
+			return False
+		self._subscribed = True
+		return True
+
+	def unsubscribe(self) -> None:
+		"""Stop receiving notifications about audio devices."""
+		if self._source is not None and self._subscribed:
+			self._subscribed = False
+			self._source.stop()
+
+	def release(self) -> None:
+		"""Stop tracking the volume state of all audio devices of the current table."""
+		with self._tracking:
+			tracked, self._tracked = self._tracked, AudioDevicesTable([], 0)
+			for device in tracked:
+				device.release()
+
+	@property
+	def generation(self) -> int:
+		"""Sequence number of the currently published table of audio devices.
+		@return: generation of the current table
+		@rtype: int
+		"""
+		return self._table.generation
+
+	def snapshot(self) -> AudioDevicesTable:
+		"""Return the currently published table of audio devices.
+		It is never changed, so it can be used during the whole gesture without locking.
+		@return: the current table of audio devices
+		@rtype: AudioDevicesTable
+		"""
+		return self._table
+
+	def publish(self, devices: List[VAAudioDevice]) -> Tuple[AudioDevicesTable, int]:
+		"""Replace the current table of audio devices with the new one.
+		@param devices: audio devices of the new table, the default device goes first
+		@type devices: List[VAAudioDevice]
+		@return: the published table of audio devices and the number of COM calls made to track them
+		@rtype: Tuple[AudioDevicesTable, int]
+		"""
+		with self._lock:
+			previous = self._table
+			table = self._table = AudioDevicesTable(devices, previous.generation + 1)
+		recorder.record(SCAN, "", len(previous), len(table))
+		return table, self.track()
+
+	def track(self) -> int:
+		"""Keep the shadow volume state only for the audio devices of the currently published table.
+		The audio devices kept from the previously tracked table carry their shadow volume state over,
+		only the audio devices new to the table are registered for notifications and read.
+		@return: the number of COM calls made to start and stop tracking
+		@rtype: int
+		"""
+		with self._tracking:
+			previous, table = self._tracked, self._table
+			self._tracked = table
+			current = {id(device) for device in table}
+			replaced = {device.id: device for device in previous if id(device) not in current}
+			calls: int = 0
+			for device in table:
+				entry = replaced.get(device.id)
+				if entry is None or not device.adopt(entry):
+					before = device.comCalls
+					device.track()
+					calls += device.comCalls - before
+			for device in replaced.values():
+				before = device.comCalls
+				device.release()
+				calls += device.comCalls - before
+		return calls
+
+	def deviceAdded(self, id: str) -> None:
+		"""Add the newly connected audio device to the end of the list without a full scan.
+		@param id: audio device ID
+		@type id: str
+		"""
+		if not options.current.advanced or id in self._hide or self._table.indexOf(id) >= 0:
+			return
+		device = self._source.activate(id) if self._source else None
+		if device is not None and device.name:
+			with self._lock:
+				table = self._table
+				self._table = AudioDevicesTable(list(table) + [device], table.generation + 1)
+			self.track()
+
+	def deviceRemoved(self, id: str) -> None:
+		"""Remove the disconnected audio device from the list.
+		The default audio device is kept until the system selects another one.
+		@param id: audio device ID
+		@type id: str
+		"""
+		with self._lock:
+			table = self._table
+			index = table.indexOf(id)
+			if index < 0 or table[index].default:
+				return
+			devices = [device for device in table if device.id != id]
+			self._table = AudioDevicesTable(devices, table.generation + 1)
+		self.track()
+
+	def deviceStateChanged(self, id: str, state: int) -> None:
+		"""Add or remove the audio device depending on its new state.
+		@param id: audio device ID
+		@type id: str
+		@param state: 1 - active, 2 - disabled, 4 - not present, 8 - unplugged
+		@type state: int
+		"""
+		if state == DEVICE_STATE.ACTIVE.value:
+			self.deviceAdded(id)
+		else:
+			self.deviceRemoved(id)
+
+	def defaultDeviceChanged(self, id: str) -> None:
+		"""Mark the new default audio device and move it to the beginning of the list.
+		@param id: ID of the new default audio device
+		@type id: str
+		"""
+		index = self._table.indexOf(id)
+		if index >= 0:
+			device: Optional[VAAudioDevice] = self._table[index]
+		else:
+			device = self._source.activate(id) if self._source else None
+		if device is None:
+			return
+		recorder.record(DEFAULT, id)
+		with self._lock:
+			table = self._table
+			# The devices whose role changes are replaced by new entries, the published tables stay intact
+			others = [
+				other.copy(default=False) if other.default else other for other in table if other.id != id
+			]
+			if not options.current.advanced:
+				# Only the default audio device is controlled in the basic mode
+				others = []
+			default = device if device.default else device.copy(default=True)
+			self._table = AudioDevicesTable([default] + others, table.generation + 1)
+		self.track()
+		# Audio sessions are enumerated on the default output device, so they must be detected again
+		sessionsCache.invalidate()
+		sessionsPool.clear()
+		if sessionsRegistry.isRunning:
+			# Session notifications are delivered only to the registrations made in the multithreaded apartment
+			self._scheduler.submit(sessionsRegistry.start)
+
+	@property
+	def scheduler(self) -> DevicesScanScheduler:
+		"""The worker which performs the background scans of audio devices.
+		@return: scheduler of background scans
+		@rtype: DevicesScanScheduler
 		"""
-		try:
-			mixers: List[AudioDevice] = [mx for mx in ExtendedAudioUtilities.GetAllDevices() if mx]
-		except Exception:
-			mixers = []
-		mixer = next(filter(lambda m: m.id == id, mixers), None)
-		return mixer.FriendlyName if mixer else " "
+		return self._scheduler
 
-	def scan(self, hide: Dict[str, str] = {}) -> None:
+	def scan(self, hide: Dict[str, str] = {}, delay: Optional[float] = None) -> Future[AudioDevicesTable]:
 		"""Search for available audio devices in the system and save them in the current object.
+		The scan is performed in the background, requests received in a short time are coalesced.
 		@param hide: a collection of audio devices that needs to hide
 		@type hide: Dict[str, str]
+		@param delay: debounce window in seconds, the default window of the scheduler is used if None
+		@type delay: Optional[float]
+		@return: future which is resolved with the new table of audio devices when the scan is finished
+		@rtype: Future[AudioDevicesTable]
 		"""
-		Thread(target=self.initialize, args=[hide]).start()
+		return self._scheduler.request(hide, delay)
 
 	def __len__(self) -> int:
 		"""The number of audio devices detected in the system.
 		@return: number of audio devices
 		@rtype: int
 		"""
-		return len(self._devices)
+		return len(self._table)
 
 	def __getitem__(self, index: int) -> VAAudioDevice:
 		"""Return the audio device by its sequence number in the list.
@@ -656,47 +3121,62 @@ class VAAudioDevices(object):
 		@return: audio device from the list
 		@rtype: VAAudioDevice
 		"""
-		return self._devices[index]
+		return self._table[index]
 
 	def __iter__(self) -> Iterator[VAAudioDevice]:
 		"""Iteration through all detected audio devices.
 		@return: iterator of all detected audio devices
 		@rtype: Iterator[VAAudioDevice]
 		"""
-		for device in self._devices:
-			yield device
+		return iter(self._table)
 
 
 class VAAudioSession(AudioSource):
 	"""Object for working with the audio session of a separate running process."""
 
-	def __init__(self, name: str) -> None:
+	def __init__(self, name: str, pid: Optional[int] = None, session: Optional[AudioSession] = None) -> None:
 		"""Initialize an audio session.
 		@param name: the name of the running process
 		@type name: str
+		@param pid: the identifier of the running process, preferred over the name if specified
+		@type pid: Optional[int]
+		@param session: already selected audio session, the name must be the full name of its process
+		@type session: Optional[pycaw.AudioSession]
 		"""
-		self._sessions: List[AudioSession] = [
-			session
-			for session in AudioUtilities.GetAllSessions()
-			if session.Process and session.Process.name()
-		]
-		self._current: AudioSession = self.selectAudioSession(name)
 		super(VAAudioSession, self).__init__(id=name, name="", volume=None)
+		# The display name is requested once, the audio session objects are reused by the pool
+		self._title: Optional[str] = None
+		# The already selected audio session does not require the enumeration of all sessions
+		self._sessions: AudioSessionsSnapshot = (
+			sessionsCache.snapshot() if session is None else AudioSessionsSnapshot([(name, session)])
+		)
+		if session is None:
+			self._current: AudioSession = self.selectAudioSession(name, pid)
+		else:
+			self._current, self._name = session, name
+		# The muted audio sessions are stored by the full name of their processes
+		self._id = self.name or name
 
-	def selectAudioSession(self, name: str = "nvda.exe") -> AudioSession:
+	def selectAudioSession(self, name: str = "nvda.exe", pid: Optional[int] = None) -> AudioSession:
 		"""Find and return an audio session by its specified name.
+		If nothing is found, the audio session of NVDA or the first available session is returned.
 		@param name: full name or part of the process name
 		@type name: str
+		@param pid: the identifier of the running process
+		@type pid: Optional[int]
 		@return: an audio session related to a given process
 		@rtype: pycaw.AudioSession
 		"""
-		return next(
-			filter(lambda s: name.lower() in s.Process.name().lower(), self._sessions),  # noqa ET113
-			next(
-				filter(lambda s: "nvda.exe" in s.Process.name().lower(), self._sessions),  # noqa E128
-				self._sessions[0],
-			),
-		)  # noqa E128
+		self._name, session = self._sessions.entries[self._sessions.index.select(name, pid)]
+		return session
+
+	@property
+	def control(self) -> AudioSession:
+		"""The audio session of the current process, its calls are counted while COM calls are accounted.
+		@return: the audio session
+		@rtype: pycaw.AudioSession
+		"""
+		return accounting.wrap(self._current, "IAudioSessionControl2")
 
 	@property
 	def name(self) -> str:
@@ -705,10 +3185,7 @@ class VAAudioSession(AudioSource):
 		@rtype: str
 		"""
 		if not self._name:
-			try:
-				self._name = self._current.Process.name()
-			except AttributeError:
-				self._name = ""
+			self._name = processNames.name(self.control)
 		return self._name
 
 	@property
@@ -717,14 +3194,15 @@ class VAAudioSession(AudioSource):
 		@return: human friendly name of the current running process
 		@rtype: str
 		"""
-		try:
-			name: str = self._current.DisplayName
-		except AttributeError:
-			name = ""
-		name = {
-			r"@%SystemRoot%\System32\AudioSrv.Dll,-202": "System Sound",
-		}.get(name, name)
-		return name or self.name.replace(".exe", "")
+		if self._title is None:
+			try:
+				name: str = self.control.DisplayName
+			except AttributeError:
+				name = ""
+			self._title = {
+				r"@%SystemRoot%\System32\AudioSrv.Dll,-202": "System Sound",
+			}.get(name, name)
+		return self._title or self.name.replace(".exe", "")
 
 	@property
 	def volume(self) -> Union[ISimpleAudioVolume, IAudioEndpointVolume, None]:
@@ -733,8 +3211,8 @@ class VAAudioSession(AudioSource):
 		@rtype: Union[pycaw.ISimpleAudioVolume, pycaw.IAudioEndpointVolume, None]
 		"""
 		if not self._volume:
-			self._volume = self._current.SimpleAudioVolume
-		return self._volume
+			self._volume = self.control.SimpleAudioVolume
+		return accounting.wrap(self._volume, "ISimpleAudioVolume")
 
 	@property
 	def volumeLevel(self) -> float:
@@ -742,9 +3220,13 @@ class VAAudioSession(AudioSource):
 		@return: current volume level
 		@rtype: float [-1.0, 0.0..1.0]
 		"""
+		shadow = self._shadow
+		if shadow is not None and shadow.level is not None:
+			return shadow.level
 		try:
 			# Incorrect handling of AttributeError by MyPy
-			return self.volume.GetMasterVolume()  # type: ignore
+			with timings.span("comRead"):
+				return self.volume.GetMasterVolume()  # type: ignore
 		except (AttributeError, TypeError):
 			return -1.0
 
@@ -754,11 +3236,30 @@ class VAAudioSession(AudioSource):
 		@param level: target volume level
 		@type level: float [0.0..1.0]
 		"""
+		old = self.knownLevel
 		try:
 			# Incorrect handling of AttributeError by MyPy
-			self.volume.SetMasterVolume(level, None)  # type: ignore
+			with timings.span("comWrite"):
+				self.volume.SetMasterVolume(level, self.ownChange())  # type: ignore
 		except (AttributeError, TypeError):
 			pass
+		else:
+			recorder.record(LEVEL, self.id, old, level)
+			self.patchShadow(level=level)
+
+	def track(self) -> bool:
+		"""Read the initial volume state, it is updated by the session events delivered by the registry.
+		@return: whether the shadow volume state is available
+		@rtype: bool
+		"""
+		if self._shadow is not None:
+			return True
+		try:
+			volume = self.volume
+			self.updateShadow(volume.GetMasterVolume(), bool(volume.GetMute()), ())  # type: ignore
+		except Exception:
+			return False
+		return True
 
 	@property
 	def channelCount(self) -> int:
@@ -788,4 +3289,865 @@ class VAAudioSession(AudioSource):
 
 
 # global instance to avoid multiple scans of all audio devices
-devices = VAAudioDevices()
+devices = VAAudioDevices(WASAPIDeviceNotificationSource())
+
+
+class VAAudioSessionsPool(object):
+	"""Bounded LRU pool of live audio session objects keyed by the identity of the audio session.
+	Allows to reuse the volume control interfaces already received for the audio session
+	when the same application is adjusted several times in a row.
+	"""
+
+	def __init__(self, size: int = 16) -> None:
+		"""Initial state of the pool.
+		@param size: maximum number of audio sessions kept in the pool
+		@type size: int
+		"""
+		self._size: int = size
+		self._pool: OrderedDict[Tuple[str, int, str], VAAudioSession] = OrderedDict()
+		self._snapshot: Optional[AudioSessionsSnapshot] = None
+		self._lock = Lock()
+		self._hits: int = 0
+		self._misses: int = 0
+		sessionsRegistry.sessionRemoved.register(self.discard)
+		sessionsRegistry.volumeChanged.register(self.volumeChanged)
+
+	@property
+	def hits(self) -> int:
+		"""The number of requests served by already existing audio session objects.
+		@return: number of pool hits
+		@rtype: int
+		"""
+		return self._hits
+
+	@property
+	def misses(self) -> int:
+		"""The number of requests that required creation of a new audio session object.
+		@return: number of pool misses
+		@rtype: int
+		"""
+		return self._misses
+
+	def get(self, name: str, pid: Optional[int] = None) -> VAAudioSession:
+		"""Return the audio session object for the specified process, create it if necessary.
+		@param name: full name or part of the process name
+		@type name: str
+		@param pid: the identifier of the running process, preferred over the name if specified
+		@type pid: Optional[int]
+		@return: audio session object related to a given process
+		@rtype: VAAudioSession
+		"""
+		snapshot = sessionsCache.snapshot()
+		if snapshot is not self._snapshot:
+			self.prune(snapshot)
+		position = snapshot.index.select(name, pid)
+		key = snapshot.index.identity(position)
+		with self._lock:
+			session = self._pool.get(key)
+			if session is not None:
+				self._pool.move_to_end(key)
+				self._hits += 1
+				return session
+			self._misses += 1
+			procName, audioSession = snapshot.entries[position]
+			session = self._pool[key] = VAAudioSession(procName, session=audioSession)
+			while len(self._pool) > self._size:
+				self._pool.popitem(last=False)[1].release()
+		# The shadow volume state is kept current only after the registry has received session events,
+		# otherwise the changes made in the Windows mixer would never be seen
+		sessionsRegistry.isLive and session.track()
+		return session
+
+	def prune(self, snapshot: AudioSessionsSnapshot) -> None:
+		"""Evict audio sessions of processes which are absent in the new snapshot.
+		@param snapshot: the current snapshot of audio sessions
+		@type snapshot: AudioSessionsSnapshot
+		"""
+		with self._lock:
+			self._snapshot = snapshot
+			for key in [key for key in self._pool if not snapshot.index.hasPid(key[1])]:
+				self._pool.pop(key).release()
+
+	def discard(self, instance: str) -> None:
+		"""Evict the expired or disconnected audio session.
+		@param instance: the session instance identifier
+		@type instance: str
+		"""
+		with self._lock:
+			for key in [key for key in self._pool if key[2] == instance]:
+				self._pool.pop(key).release()
+
+	def volumeChanged(self, instance: str, level: float, muted: bool, context=None) -> None:
+		"""Update the shadow volume state of the audio session objects.
+		@param instance: the session instance identifier
+		@type instance: str
+		@param level: the new volume level
+		@type level: float [0.0..1.0]
+		@param muted: the new mute state
+		@type muted: bool
+		@param context: the event context passed by the client which initiated the change
+		"""
+		with self._lock:
+			sessions = [session for key, session in self._pool.items() if key[2] == instance]
+		for session in sessions:
+			session.shadow is not None and session.updateShadow(level, muted, (), context)
+
+	def clear(self) -> None:
+		"""Remove all audio sessions from the pool."""
+		with self._lock:
+			for session in self._pool.values():
+				session.release()
+			self._pool.clear()
+			self._snapshot = None
+
+
+# Global pool of audio session objects reused between keystrokes
+sessionsPool = VAAudioSessionsPool()
+
+
+class VolumeStepsBurst(object):
+	"""Volume steps of one audio source accumulated during a burst of auto-repeated gestures."""
+
+	def __init__(
+		self, source: AudioSource, level: float, announce: Callable[[AudioSource, float], None]
+	) -> None:
+		"""Start a burst from the level that has already been written to the audio source.
+		@param source: audio source whose volume is adjusted
+		@type source: AudioSource
+		@param level: the volume level written at the beginning of the burst
+		@type level: float
+		@param announce: reports the volume level to the user
+		@type announce: Callable[[AudioSource, float], None]
+		"""
+		self.source: AudioSource = source
+		self.target: float = level
+		self.written: float = level
+		self.announced: float = level
+		self.announce: Callable[[AudioSource, float], None] = announce
+		self.writtenAt: float = monotonic()
+		self.timer = None
+
+
+class VolumeStepsCoalescer(object):
+	"""Coalesces volume steps of auto-repeated gestures.
+	The first step of a burst is applied and announced immediately, the following ones only move the target level,
+	which is written at most once per delay and announced once when the keys are released.
+	"""
+
+	def __init__(self) -> None:
+		"""Initialize the collection of pending bursts and counters."""
+		self._bursts: Dict[str, VolumeStepsBurst] = {}
+		self._requests: int = 0
+		self._writes: int = 0
+		self._announcements: int = 0
+
+	@staticmethod
+	def shift(level: float, steps: int) -> float:
+		"""Move the volume level by the specified number of percent.
+		@param level: the initial volume level
+		@type level: float
+		@param steps: offset in percent, negative to decrease
+		@type steps: int
+		@return: the new volume level
+		@rtype: float [0.0..1.0]
+		"""
+		return min(1.0, max(0.0, float(round(level * 100.0) + steps) / 100.0))
+
+	def adjust(
+		self, source: AudioSource, direction: int, announce: Callable[[AudioSource, float], None]
+	) -> float:
+		"""Change the volume level of the audio source by one step in the specified direction.
+		@param source: audio source whose volume is adjusted
+		@type source: AudioSource
+		@param direction: 1 to increase or -1 to decrease the volume level
+		@type direction: int
+		@param announce: reports the volume level to the user
+		@type announce: Callable[[AudioSource, float], None]
+		@return: the target volume level of the audio source
+		@rtype: float
+		"""
+		self._requests += 1
+		delay: float = options.current.coalescingDelay
+		steps: int = options.current.step * direction
+		burst = self._bursts.get(source.id)
+		if burst is not None and (burst.source is not source or (burst.announced <= 0.0 and steps > 0)):
+			# The source has been replaced or muted at the bottom, start over
+			self.settle(source.id, announce=False)
+			burst = None
+		if burst is None:
+			source.isMuted and source.unmute()
+			level = self.shift(source.volumeLevel, steps)
+			self._write(source, level)
+			self._report(source, level, announce)
+			if delay > 0.0:
+				burst = self._bursts[source.id] = VolumeStepsBurst(source, level, announce)
+				burst.timer = core.callLater(int(delay * 1000), self.settle, source.id)
+			return level
+		burst.target = self.shift(burst.target, steps)
+		burst.announce = announce
+		if monotonic() - burst.writtenAt >= delay:
+			self._flush(burst)
+		burst.timer.Restart(int(delay * 1000))
+		return burst.target
+
+	def settle(self, id: str, announce: bool = True) -> None:
+		"""Complete the burst of the audio source: write and announce the final volume level.
+		@param id: ID of the audio source
+		@type id: str
+		@param announce: whether to report the final volume level
+		@type announce: bool
+		"""
+		burst = self._bursts.pop(id, None)
+		if burst is None:
+			return
+		burst.timer.Stop()
+		self._flush(burst)
+		if announce and burst.target != burst.announced:
+			self._report(burst.source, burst.target, burst.announce)
+
+	def flush(self) -> None:
+		"""Write pending volume levels of all audio sources without announcing them,
+		should be called before any other action on the audio sources.
+		"""
+		for id in list(self._bursts):
+			self.settle(id, announce=False)
+
+	def _flush(self, burst: VolumeStepsBurst) -> None:
+		"""Write the target volume level of the burst if it has not been written yet.
+		@param burst: the pending volume steps
+		@type burst: VolumeStepsBurst
+		"""
+		if burst.target != burst.written:
+			self._write(burst.source, burst.target)
+			burst.written = burst.target
+		burst.writtenAt = monotonic()
+
+	def _write(self, source: AudioSource, level: float) -> None:
+		"""Set the volume level of the audio source.
+		@param source: audio source whose volume is adjusted
+		@type source: AudioSource
+		@param level: target volume level
+		@type level: float
+		"""
+		# Setter volumeLevel is not read-only, MyPy issue
+		source.volumeLevel = level  # type: ignore
+		self._writes += 1
+
+	def _report(
+		self, source: AudioSource, level: float, announce: Callable[[AudioSource, float], None]
+	) -> None:
+		"""Report the volume level to the user.
+		@param source: audio source whose volume is adjusted
+		@type source: AudioSource
+		@param level: the volume level to announce
+		@type level: float
+		@param announce: reports the volume level to the user
+		@type announce: Callable[[AudioSource, float], None]
+		"""
+		burst = self._bursts.get(source.id)
+		if burst is not None:
+			burst.announced = level
+		announce(source, level)
+		self._announcements += 1
+
+	@property
+	def pending(self) -> int:
+		"""The number of audio sources with unsettled volume steps.
+		@return: number of pending bursts
+		@rtype: int
+		"""
+		return len(self._bursts)
+
+	@property
+	def requests(self) -> int:
+		"""The number of volume steps requested by gestures.
+		@return: total number of requests
+		@rtype: int
+		"""
+		return self._requests
+
+	@property
+	def writes(self) -> int:
+		"""The number of volume levels written to the audio sources.
+		@return: total number of writes
+		@rtype: int
+		"""
+		return self._writes
+
+	@property
+	def announcements(self) -> int:
+		"""The number of volume levels reported to the user.
+		@return: total number of announcements
+		@rtype: int
+		"""
+		return self._announcements
+
+
+# Coalesces volume steps of auto-repeated gestures
+volumeSteps = VolumeStepsCoalescer()
+
+
+class MutedSourcesRestorer(object):
+	"""Unmutes all audio sources muted by this add-on using one enumeration of audio sessions
+	and a bounded number of concurrent workers.
+	The audio sources which were not restored remain in the collection of muted and are retried on the next start.
+	"""
+
+	def __init__(self, workers: int = 4) -> None:
+		"""Initial state of the restorer.
+		@param workers: maximum number of audio sources unmuted concurrently
+		@type workers: int
+		"""
+		self._workers: int = max(1, workers)
+		self._cancelled = Event()
+		self._lock = Lock()
+		self._thread: Optional[Thread] = None
+		self._restored: int = 0
+
+	@property
+	def restored(self) -> int:
+		"""The number of audio sources unmuted by the last run.
+		@return: number of restored audio sources
+		@rtype: int
+		"""
+		return self._restored
+
+	@property
+	def isRunning(self) -> bool:
+		"""Whether the audio sources are being restored now.
+		@return: the state of the restorer
+		@rtype: bool
+		"""
+		return self._thread is not None and self._thread.is_alive()
+
+	def collect(self) -> List[AudioSource]:
+		"""Find the audio sources from the collection of muted, audio sessions are enumerated only once.
+		@return: audio devices and audio sessions which must be unmuted
+		@rtype: List[AudioSource]
+		"""
+		sources: List[AudioSource] = [device for device in devices.snapshot() if cfg.isMuted(device.id)]
+		snapshot = AudioSessionsSnapshot.fromSessions(backend.getAllSessions())
+		for name, session in snapshot.entries:
+			if cfg.isMuted(name):
+				sources.append(VAAudioSession(name, session=session))
+		return sources
+
+	def start(self) -> Thread:
+		"""Start unmuting the audio sources in the background.
+		@return: the thread that coordinates the workers
+		@rtype: Thread
+		"""
+		if not self.isRunning:
+			self._cancelled.clear()
+			self._thread = Thread(target=self._run, daemon=True)
+			self._thread.start()
+		return self._thread  # type: ignore
+
+	def restore(self, deadline: float) -> List[str]:
+		"""Unmute the audio sources and wait for no longer than the deadline.
+		Audio sources that have not been restored in time are saved to be retried on the next start.
+		@param deadline: maximum time in seconds to wait for the workers
+		@type deadline: float
+		@return: names of audio sessions and IDs of audio devices which are still muted
+		@rtype: List[str]
+		"""
+		self.start().join(deadline)
+		self._cancelled.set()
+		# The workers which are still unmuting flush the collection of muted again when they stop
+		cfg.flush()
+		leftovers: List[str] = cfg.muted
+		if leftovers:
+			log.debug("%d audio sources were not unmuted in %.1f s", len(leftovers), deadline)
+		return leftovers
+
+	def _run(self) -> None:
+		"""Enumerate the muted audio sources and distribute them between the workers."""
+		CoInitializeEx(COINIT_MULTITHREADED)
+		try:
+			self._restored = 0
+			queue: Queue[AudioSource] = Queue()
+			for source in self.collect():
+				queue.put(source)
+			workers = [
+				Thread(target=self._work, args=(queue,), daemon=True)
+				for i in range(min(self._workers, queue.qsize()))
+			]
+			for worker in workers:
+				worker.start()
+			for worker in workers:
+				worker.join()
+		except Exception:
+			log.error("Unable to restore muted audio sources", exc_info=True)
+		finally:
+			# Written immediately, the delayed write may not happen if NVDA is exiting
+			cfg.flush()
+			CoUninitialize()
+
+	def _work(self, queue: Queue[AudioSource]) -> None:
+		"""Unmute the audio sources from the queue until it is empty or the deadline is reached.
+		@param queue: audio sources which must be unmuted
+		@type queue: Queue[AudioSource]
+		"""
+		CoInitializeEx(COINIT_MULTITHREADED)
+		try:
+			while not self._cancelled.is_set():
+				try:
+					source = queue.get_nowait()
+				except Empty:
+					break
+				try:
+					if source.isLeftMuted:
+						source.unmute() and self._increment()
+					else:
+						# Unmuted by the previous run after the collection of muted was saved
+						cfg.delMuted(source.id)
+				except Exception:
+					log.debug("Unable to unmute %s", source.id, exc_info=True)
+		finally:
+			CoUninitialize()
+
+	def _increment(self) -> None:
+		"""Count the restored audio source."""
+		with self._lock:
+			self._restored += 1
+
+
+# Restores the audio sources muted by this add-on at exit
+mutedSources = MutedSourcesRestorer()
+
+
+class PeakRingBuffer(object):
+	"""Fixed-size ring buffer of the latest peak values of one audio source with the moments of sampling."""
+
+	def __init__(self, size: int = 64) -> None:
+		"""Preallocate the storage of the ring buffer.
+		@param size: the maximum number of stored samples
+		@type size: int
+		"""
+		self._size: int = max(1, size)
+		self._values: array = array("f", [0.0]) * self._size
+		self._times: array = array("d", [0.0]) * self._size
+		self._position: int = 0
+		self._count: int = 0
+
+	def __len__(self) -> int:
+		"""The number of samples in the ring buffer.
+		@return: number of stored samples
+		@rtype: int
+		"""
+		return self._count
+
+	def push(self, value: float, time: float) -> None:
+		"""Add the new sample replacing the oldest one if the ring buffer is full.
+		@param value: the peak value
+		@type value: float [0.0..1.0]
+		@param time: the moment of sampling on the monotonic clock
+		@type time: float
+		"""
+		self._values[self._position] = value
+		self._times[self._position] = time
+		self._position = (self._position + 1) % self._size
+		self._count = min(self._count + 1, self._size)
+
+	def window(self, seconds: Optional[float] = None) -> array:
+		"""Peak values sampled during the specified period, the newest goes last.
+		@param seconds: the length of the period, all stored samples if None
+		@type seconds: Optional[float]
+		@return: peak values in chronological order
+		@rtype: array
+		"""
+		start = (self._position - self._count) % self._size
+		indexes = [(start + i) % self._size for i in range(self._count)]
+		if seconds is not None:
+			since = monotonic() - seconds
+			indexes = [i for i in indexes if self._times[i] >= since]
+		return array("f", [self._values[i] for i in indexes])
+
+	@property
+	def current(self) -> float:
+		"""The latest peak value.
+		@return: the peak value or 0.0 if nothing has been sampled yet
+		@rtype: float
+		"""
+		return self._values[(self._position - 1) % self._size] if self._count else 0.0
+
+	def maximum(self, seconds: Optional[float] = None) -> float:
+		"""The highest peak value during the specified period.
+		@param seconds: the length of the period, all stored samples if None
+		@type seconds: Optional[float]
+		@return: the maximum peak value
+		@rtype: float
+		"""
+		return max(self.window(seconds), default=0.0)
+
+	def rms(self, seconds: Optional[float] = None) -> float:
+		"""The root mean square of peak values during the specified period.
+		@param seconds: the length of the period, all stored samples if None
+		@type seconds: Optional[float]
+		@return: the RMS of peak values
+		@rtype: float
+		"""
+		values = self.window(seconds)
+		return (sum(value * value for value in values) / len(values)) ** 0.5 if values else 0.0
+
+
+class MeterSource(metaclass=ABCMeta):
+	"""Source of the peak values of audio devices and audio sessions."""
+
+	@abstractmethod
+	def sample(self) -> Dict[str, float]:
+		"""Read the current peak values of all audio sources.
+		The method must be overridden for each type of meter sources.
+		@return: peak values keyed by the names of audio sources
+		@rtype: Dict[str, float]
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+
+class WASAPIMeterSource(MeterSource):
+	"""Peak values read through IAudioMeterInformation of audio devices and audio sessions.
+	The audio sessions are enumerated by the source itself on the sampling thread,
+	so the meter interfaces are never shared with the threads of the gestures.
+	The meter interfaces are requested again only when the table of devices changes,
+	the registry receives session events or the enumerated audio sessions become outdated.
+	"""
+
+	def __init__(self, lifetime: float = 5.0) -> None:
+		"""Initial state of the meter source.
+		@param lifetime: how long in seconds the enumerated audio sessions are reused
+		@type lifetime: float
+		"""
+		self._lifetime: float = lifetime
+		self._thread: Optional[int] = None
+		self._generation: int = -1
+		self._events: int = -1
+		self._enumerated: float = 0.0
+		self._deviceMeters: List[Tuple[str, IAudioMeterInformation]] = []
+		self._sessionMeters: List[Tuple[str, IAudioMeterInformation]] = []
+
+	def sample(self) -> Dict[str, float]:
+		"""Read the current peak values of all audio devices and audio sessions.
+		@return: peak values keyed by the names of audio sources
+		@rtype: Dict[str, float]
+		"""
+		now = monotonic()
+		if get_ident() != self._thread:
+			# The interfaces are used only on the thread which has requested them
+			self._thread, self._generation, self._events = get_ident(), -1, -1
+		if devices.generation != self._generation:
+			self._generation = devices.generation
+			scanner = backend.scanner()
+			self._deviceMeters = []
+			for device in devices.snapshot():
+				meter = scanner.meter(device.id)
+				if meter is not None:
+					self._deviceMeters.append((device.name, meter))
+		if sessionsRegistry.events != self._events or now - self._enumerated > self._lifetime:
+			self._events, self._enumerated = sessionsRegistry.events, now
+			self._sessionMeters = []
+			with accounting.call("IAudioSessionEnumerator.GetAllSessions"):
+				sessions = backend.getAllSessions()
+			sessions = accounting.wrapAll(sessions, "IAudioSessionControl2")
+			for name, session in AudioSessionsSnapshot.fromSessions(sessions).entries:
+				try:
+					meter = session.meter
+				except Exception:
+					continue
+				self._sessionMeters.append((name.replace(".exe", ""), meter))
+		peaks: Dict[str, float] = {}
+		for name, meter in self._deviceMeters + self._sessionMeters:
+			try:
+				peak = meter.GetPeakValue()
+			except Exception:
+				peak = 0.0
+			# Processes can own several audio sessions, the loudest one is reported
+			peaks[name] = max(peak, peaks.get(name, 0.0))
+		return peaks
+
+
+class PeakMeterSampler(object):
+	"""Background sampler of the peak values of audio sources with adaptive polling.
+	The polling slows down while nothing is audible and pauses after a period of silence until it is woken,
+	the interval is also never shorter than allowed by the CPU budget.
+	"""
+
+	def __init__(
+		self,
+		source: MeterSource,
+		interval: float = 0.05,
+		idleInterval: float = 1.0,
+		size: int = 64,
+		budget: float = 0.02,
+		threshold: float = 0.001,
+		pauseAfter: float = 2.0,
+		heartbeat: float = 10.0,
+	) -> None:
+		"""Initial state of the sampler.
+		@param source: the source of peak values
+		@type source: MeterSource
+		@param interval: polling interval in seconds while a sound is playing
+		@type interval: float
+		@param idleInterval: polling interval in seconds after a period of silence
+		@type idleInterval: float
+		@param size: the number of samples stored for each audio source
+		@type size: int
+		@param budget: the maximum share of one CPU core spent on sampling
+		@type budget: float
+		@param threshold: the peak value above which the audio source is considered audible
+		@type threshold: float
+		@param pauseAfter: the period of silence in seconds after which the sampler pauses
+		@type pauseAfter: float
+		@param heartbeat: polling interval in seconds while the sampler is paused and not woken
+		@type heartbeat: float
+		"""
+		self._source = source
+		self._fastInterval: float = interval
+		self._idleInterval: float = idleInterval
+		self._interval: float = interval
+		self._size: int = size
+		self._budget: float = budget
+		self._threshold: float = threshold
+		self._pauseAfter: float = pauseAfter
+		self._heartbeat: float = heartbeat
+		self._buffers: Dict[str, PeakRingBuffer] = {}
+		self._lock = Lock()
+		self._sampled = Condition(self._lock)
+		self._wake = Event()
+		self._stopped: bool = True
+		self._thread: Optional[Thread] = None
+		self._silentSince: Optional[float] = None
+		self._samples: int = 0
+		self._started: float = 0.0
+		self._busy: float = 0.0
+
+	@property
+	def source(self) -> MeterSource:
+		"""The source of peak values.
+		@return: meter source used by the sampler
+		@rtype: MeterSource
+		"""
+		return self._source
+
+	@source.setter
+	def source(self, source: MeterSource) -> None:
+		"""Replace the source of peak values, the sampler is stopped.
+		@param source: the new source of peak values
+		@type source: MeterSource
+		"""
+		self.stop()
+		self._source = source
+
+	@property
+	def isRunning(self) -> bool:
+		"""Whether the background sampling is active.
+		@return: the state of the sampler
+		@rtype: bool
+		"""
+		return self._thread is not None and self._thread.is_alive()
+
+	@property
+	def isPaused(self) -> bool:
+		"""Whether nothing has been audible for longer than the pause period.
+		@return: the sampler waits until it is woken
+		@rtype: bool
+		"""
+		with self._lock:
+			return self._silentSince is not None and monotonic() - self._silentSince >= self._pauseAfter
+
+	@property
+	def interval(self) -> float:
+		"""The current polling interval.
+		@return: interval in seconds
+		@rtype: float
+		"""
+		return self._interval
+
+	@property
+	def samples(self) -> int:
+		"""The number of samples taken.
+		@return: total number of samples
+		@rtype: int
+		"""
+		return self._samples
+
+	@property
+	def cpuTime(self) -> float:
+		"""The time spent on sampling.
+		@return: total duration of samples in seconds
+		@rtype: float
+		"""
+		return self._busy
+
+	def start(self, interval: Optional[float] = None) -> None:
+		"""Start sampling in the background thread.
+		@param interval: polling interval in seconds while a sound is playing
+		@type interval: Optional[float]
+		"""
+		if interval is not None:
+			self._fastInterval = self._interval = interval
+		self._stopped = False
+		if not self.isRunning:
+			self._thread = Thread(target=self._run, daemon=True)
+			self._thread.start()
+
+	def stop(self) -> None:
+		"""Stop sampling, the collected peak values remain available."""
+		self._stopped = True
+		self._wake.set()
+
+	def wake(self) -> None:
+		"""Return to the fast polling, e.g. when the user is interested in the current peak values."""
+		with self._lock:
+			self._silentSince = None
+		self._interval = self._fastInterval
+		self._wake.set()
+
+	def refresh(self, timeout: float = 1.0) -> bool:
+		"""Take a new sample before the peak values are requested, so they are not stale after a pause.
+		The sample is taken by the background thread if it is running, otherwise on the calling thread.
+		@param timeout: the maximum time in seconds to wait for the background thread
+		@type timeout: float
+		@return: whether the new sample has been taken
+		@rtype: bool
+		"""
+		if not self.isRunning:
+			self.sampleOnce()
+			return True
+		requested = monotonic()
+		self.wake()
+		with self._sampled:
+			return self._sampled.wait_for(lambda: self._started >= requested, timeout)
+
+	def sampleOnce(self) -> Dict[str, float]:
+		"""Read the peak values of all audio sources, store them and adapt the polling interval.
+		@return: peak values keyed by the names of audio sources
+		@rtype: Dict[str, float]
+		"""
+		started = monotonic()
+		peaks = self._source.sample()
+		now = monotonic()
+		audible = any(peak > self._threshold for peak in peaks.values())
+		with self._lock:
+			for name in [name for name in self._buffers if name not in peaks]:
+				del self._buffers[name]
+			for name, peak in peaks.items():
+				buffer = self._buffers.get(name)
+				if buffer is None:
+					buffer = self._buffers[name] = PeakRingBuffer(self._size)
+				buffer.push(peak, now)
+			self._samples += 1
+			self._started = started
+			self._busy += now - started
+			if audible:
+				self._silentSince = None
+			elif self._silentSince is None:
+				self._silentSince = now
+			paused = self._silentSince is not None and now - self._silentSince >= self._pauseAfter
+			self._sampled.notify_all()
+		if audible:
+			interval = self._fastInterval
+		else:
+			interval = self._idleInterval if paused else min(self._idleInterval, self._interval * 2.0)
+		self._interval = max(interval, (now - started) / self._budget)
+		return peaks
+
+	def names(self) -> List[str]:
+		"""Names of the audio sources that have been sampled.
+		@return: list of names of audio sources
+		@rtype: List[str]
+		"""
+		with self._lock:
+			return list(self._buffers)
+
+	def current(self, name: str) -> float:
+		"""The latest peak value of the audio source.
+		@param name: name of the audio source
+		@type name: str
+		@return: the peak value or 0.0 if the audio source is unknown
+		@rtype: float
+		"""
+		with self._lock:
+			buffer = self._buffers.get(name)
+			return buffer.current if buffer is not None else 0.0
+
+	def maximum(self, name: str, seconds: Optional[float] = None) -> float:
+		"""The highest peak value of the audio source during the specified period.
+		@param name: name of the audio source
+		@type name: str
+		@param seconds: the length of the period, all stored samples if None
+		@type seconds: Optional[float]
+		@return: the maximum peak value
+		@rtype: float
+		"""
+		with self._lock:
+			buffer = self._buffers.get(name)
+			return buffer.maximum(seconds) if buffer is not None else 0.0
+
+	def rms(self, name: str, seconds: Optional[float] = None) -> float:
+		"""The root mean square of peak values of the audio source during the specified period.
+		@param name: name of the audio source
+		@type name: str
+		@param seconds: the length of the period, all stored samples if None
+		@type seconds: Optional[float]
+		@return: the RMS of peak values
+		@rtype: float
+		"""
+		with self._lock:
+			buffer = self._buffers.get(name)
+			return buffer.rms(seconds) if buffer is not None else 0.0
+
+	def loudest(self, seconds: float = 1.0) -> Optional[Tuple[str, float]]:
+		"""Find the audio source with the highest RMS of peak values during the specified period.
+		@param seconds: the length of the period
+		@type seconds: float
+		@return: name of the audio source and its RMS or None if nothing was audible
+		@rtype: Optional[Tuple[str, float]]
+		"""
+		with self._lock:
+			levels = [(name, buffer.rms(seconds)) for name, buffer in self._buffers.items()]
+		name, level = max(levels, key=lambda item: item[1], default=("", 0.0))
+		return (name, level) if level > self._threshold else None
+
+	def _run(self) -> None:
+		"""The loop of the background thread."""
+		CoInitializeEx(COINIT_MULTITHREADED)
+		try:
+			while not self._stopped:
+				# Cleared before sampling, so a wake requested during the sample starts the next one at once
+				self._wake.clear()
+				try:
+					self.sampleOnce()
+				except Exception:
+					log.debug("Unable to sample audio meters", exc_info=True)
+					self._interval = self._idleInterval
+				self._wake.wait(self._heartbeat if self.isPaused else self._interval)
+		finally:
+			CoUninitialize()
+
+
+# Background sampler of audio meters of all audio sources
+peakSampler = PeakMeterSampler(WASAPIMeterSource())
+
+
+def useBackend(new: AudioBackend) -> AudioBackend:
+	"""Switch all components of the module to another audio backend, e.g. the simulated one for measurements.
+	All notifications are stopped, so the audio devices must be scanned and the registry started again.
+	@param new: the audio backend to use
+	@type new: AudioBackend
+	@return: the previously used audio backend
+	@rtype: AudioBackend
+	"""
+	global backend
+	volumeSteps.flush()
+	peakSampler.stop()
+	sessionsRegistry.stop()
+	devices.unsubscribe()
+	devices.release()
+	sessionsPool.clear()
+	previous, backend = backend, new
+	sessionsRegistry.source = new.sessionSource()
+	devices.source = new.deviceSource()
+	peakSampler.source = WASAPIMeterSource()
+	processNames.clear()
+	sessionsCache.invalidate()
+	return previous
@@ -0,0 +1,70 @@
+# backends.py
+# Sources of audio devices and audio sessions used by the audiocore module
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from __future__ import annotations
+from abc import ABCMeta, abstractmethod
+from typing import Any, List, NamedTuple, Set
+
+
+class AudioEndpoint(NamedTuple):
+	"""Audio endpoint detected during the scan together with its activated volume control interface."""
+
+	id: str
+	name: str
+	state: int
+	volume: Any
+
+
+class AudioBackend(metaclass=ABCMeta):
+	"""Provider of audio sessions and audio endpoints for the audiocore module.
+	Allows to replace the Windows Core Audio API with other implementations.
+	"""
+
+	@abstractmethod
+	def getAllSessions(self) -> List[Any]:
+		"""Enumerate all audio sessions of the default output device.
+		The method must be overridden for each type of audio backends.
+		@return: audio sessions compatible with pycaw.AudioSession which also provide the meter property
+		@rtype: List[Any]
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+	@abstractmethod
+	def pids(self) -> Set[int]:
+		"""Identifiers of all running processes.
+		The method must be overridden for each type of audio backends.
+		@return: set of PIDs
+		@rtype: Set[int]
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+	@abstractmethod
+	def scanner(self) -> Any:
+		"""Create the object that enumerates audio endpoints and activates their interfaces.
+		The method must be overridden for each type of audio backends.
+		@return: object with the interface of audiocore.AudioEndpointsScanner
+		@rtype: Any
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+	@abstractmethod
+	def sessionSource(self) -> Any:
+		"""Create the source of notifications about audio sessions.
+		The method must be overridden for each type of audio backends.
+		@return: object with the interface of audiocore.SessionNotificationSource
+		@rtype: Any
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+	@abstractmethod
+	def deviceSource(self) -> Any:
+		"""Create the source of notifications about audio devices.
+		The method must be overridden for each type of audio backends.
+		@return: object with the interface of audiocore.DeviceNotificationSource
+		@rtype: Any
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
@@ -0,0 +1,322 @@
+# comcalls.py
+# Accounting of COM calls made by the add-on, per interface method and per calling script
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from __future__ import annotations
+import sys
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# Properties of pycaw.AudioSession which call COM methods of the session control
+PROPERTIES: Dict[str, str] = {
+	"Process": "GetProcessId",
+	"ProcessId": "GetProcessId",
+	"DisplayName": "GetDisplayName",
+	"Identifier": "GetSessionIdentifier",
+	"InstanceIdentifier": "GetSessionInstanceIdentifier",
+	"State": "GetState",
+	"SimpleAudioVolume": "QueryInterface",
+	"meter": "QueryInterface",
+}
+
+# Interfaces returned by the accounted methods and properties, they are accounted as well
+RESULTS: Dict[str, str] = {
+	"GetDevice": "IMMDevice",
+	"GetDefaultAudioEndpoint": "IMMDevice",
+	"EnumAudioEndpoints": "IMMDeviceCollection",
+	"Item": "IMMDevice",
+	"OpenPropertyStore": "IPropertyStore",
+	"SimpleAudioVolume": "ISimpleAudioVolume",
+	"meter": "IAudioMeterInformation",
+}
+
+# The name used for the calls made outside of the add-on scripts, e.g. by background workers
+BACKGROUND: str = "background"
+
+
+def callingScript() -> str:
+	"""Find the script of the global plugin which has caused the current call.
+	@return: the name of the script without the "script_" prefix or BACKGROUND
+	@rtype: str
+	"""
+	frame = sys._getframe(2)
+	while frame is not None:
+		name = frame.f_code.co_name
+		if name.startswith("script_"):
+			return name[7:]
+		frame = frame.f_back
+	return BACKGROUND
+
+
+class MethodStats(object):
+	"""The number of calls of one COM method and the time spent in them."""
+
+	__slots__ = ("count", "seconds")
+
+	def __init__(self) -> None:
+		self.count: int = 0
+		self.seconds: float = 0.0
+
+
+class ComCallProxy(object):
+	"""Wraps the COM interface and reports each call of its methods to the accounting."""
+
+	__slots__ = ("_accounting", "_target", "_interface")
+
+	def __init__(self, accounting: ComCallAccounting, target: Any, interface: str) -> None:
+		"""Wrap the COM interface.
+		@param accounting: the accounting which receives the calls
+		@type accounting: ComCallAccounting
+		@param target: the wrapped COM interface
+		@type target: Any
+		@param interface: the name of the interface used in the reports
+		@type interface: str
+		"""
+		object.__setattr__(self, "_accounting", accounting)
+		object.__setattr__(self, "_target", target)
+		object.__setattr__(self, "_interface", interface)
+
+	@property
+	def target(self) -> Any:
+		"""The wrapped COM interface.
+		@return: the original object
+		@rtype: Any
+		"""
+		return self._target
+
+	def __getattr__(self, name: str) -> Any:
+		accounting = self._accounting
+		if name in PROPERTIES:
+			if not accounting.enabled:
+				return getattr(self._target, name)
+			started = perf_counter()
+			try:
+				value = getattr(self._target, name)
+			finally:
+				accounting.record(self._interface + "." + PROPERTIES[name], perf_counter() - started)
+			return accounting.wrap(value, RESULTS[name]) if name in RESULTS else value
+		value = getattr(self._target, name)
+		if not callable(value) or name.startswith("_"):
+			return value
+		return self._method(name, value)
+
+	def __setattr__(self, name: str, value: Any) -> None:
+		setattr(self._target, name, value)
+
+	def __bool__(self) -> bool:
+		return bool(self._target)
+
+	def _method(self, name: str, method: Callable) -> Callable:
+		"""Create the function which calls the method of the interface and accounts the call.
+		@param name: the name of the method
+		@type name: str
+		@param method: the bound method of the wrapped interface
+		@type method: Callable
+		@return: accounted method
+		@rtype: Callable
+		"""
+		accounting = self._accounting
+		qualified = self._interface + "." + name
+		result = RESULTS.get(name)
+
+		def accounted(*args, **kwargs) -> Any:
+			if not accounting.enabled:
+				return method(*args, **kwargs)
+			started = perf_counter()
+			try:
+				value = method(*args, **kwargs)
+			finally:
+				accounting.record(qualified, perf_counter() - started)
+			return accounting.wrap(value, result) if result else value
+
+		return accounted
+
+
+class AccountedCall(object):
+	"""Context manager which accounts the composite call, e.g. enumeration of all audio sessions."""
+
+	__slots__ = ("_accounting", "_method", "_started")
+
+	def __init__(self, accounting: ComCallAccounting, method: str) -> None:
+		self._accounting = accounting
+		self._method = method
+		self._started: float = 0.0
+
+	def __enter__(self) -> AccountedCall:
+		self._started = perf_counter()
+		return self
+
+	def __exit__(self, *args: Any) -> None:
+		self._accounting.record(self._method, perf_counter() - self._started)
+
+
+class IdleCall(object):
+	"""Context manager which does nothing, it is used while the accounting is disabled."""
+
+	__slots__ = ()
+
+	def __enter__(self) -> IdleCall:
+		return self
+
+	def __exit__(self, *args: Any) -> None:
+		pass
+
+
+class ComCallAccounting(object):
+	"""Counts COM calls and the time spent in them per interface method and per calling script.
+	The interfaces are wrapped only while the accounting is enabled, so there is no overhead when it is disabled.
+	"""
+
+	def __init__(self) -> None:
+		"""The accounting is disabled by default."""
+		self.enabled: bool = False
+		self._lock = Lock()
+		self._idle = IdleCall()
+		self._stats: Dict[Tuple[str, str], MethodStats] = {}
+
+	def wrap(self, target: Any, interface: str) -> Any:
+		"""Wrap the COM interface to account the calls of its methods.
+		@param target: the COM interface
+		@type target: Any
+		@param interface: the name of the interface used in the reports
+		@type interface: str
+		@return: the accounted interface or the original object if the accounting is disabled
+		@rtype: Any
+		"""
+		if not self.enabled or target is None or isinstance(target, ComCallProxy):
+			return target
+		return ComCallProxy(self, target, interface)
+
+	def wrapAll(self, targets: List[Any], interface: str) -> List[Any]:
+		"""Wrap the collection of COM interfaces of the same type.
+		@param targets: COM interfaces
+		@type targets: List[Any]
+		@param interface: the name of the interface used in the reports
+		@type interface: str
+		@return: the accounted interfaces or the original list if the accounting is disabled
+		@rtype: List[Any]
+		"""
+		if not self.enabled:
+			return targets
+		return [self.wrap(target, interface) for target in targets]
+
+	def call(self, method: str) -> Union[AccountedCall, IdleCall]:
+		"""Account the composite call, should be used in the "with" statement.
+		@param method: the qualified name of the method
+		@type method: str
+		@return: the context manager which accounts the time spent inside it
+		@rtype: Union[AccountedCall, IdleCall]
+		"""
+		if not self.enabled:
+			return self._idle
+		return AccountedCall(self, method)
+
+	def record(self, method: str, seconds: float) -> None:
+		"""Account one call of the COM method.
+		@param method: the qualified name of the method, e.g. "ISimpleAudioVolume.GetMute"
+		@type method: str
+		@param seconds: the time spent in the call
+		@type seconds: float
+		"""
+		key = (callingScript(), method)
+		with self._lock:
+			stats = self._stats.get(key)
+			if stats is None:
+				stats = self._stats[key] = MethodStats()
+			stats.count += 1
+			stats.seconds += seconds
+
+	def _select(self, script: Optional[str], method: Optional[str]) -> List[MethodStats]:
+		"""Select the counters of the specified script and method.
+		@param script: the name of the script without the "script_" prefix, any script if None
+		@type script: Optional[str]
+		@param method: the method name, either qualified or short, any method if None
+		@type method: Optional[str]
+		@return: the selected counters
+		@rtype: List[MethodStats]
+		"""
+		with self._lock:
+			return [
+				stats
+				for (caller, qualified), stats in self._stats.items()
+				if (script is None or caller == script)
+				and (method is None or qualified == method or qualified.endswith("." + method))
+			]
+
+	def calls(self, script: Optional[str] = None, method: Optional[str] = None) -> int:
+		"""The number of accounted calls, e.g. calls("volumeUp") or calls(method="GetMute").
+		@param script: the name of the script without the "script_" prefix, any script if None
+		@type script: Optional[str]
+		@param method: the method name, either qualified or short, any method if None
+		@type method: Optional[str]
+		@return: number of calls
+		@rtype: int
+		"""
+		return sum(stats.count for stats in self._select(script, method))
+
+	def seconds(self, script: Optional[str] = None, method: Optional[str] = None) -> float:
+		"""The time spent in the accounted calls.
+		@param script: the name of the script without the "script_" prefix, any script if None
+		@type script: Optional[str]
+		@param method: the method name, either qualified or short, any method if None
+		@type method: Optional[str]
+		@return: time in seconds
+		@rtype: float
+		"""
+		return sum(stats.seconds for stats in self._select(script, method))
+
+	def table(self) -> Dict[str, Dict[str, Tuple[int, float]]]:
+		"""All counters grouped by the calling script.
+		@return: the number of calls and the time in seconds keyed by the script and by the method
+		@rtype: Dict[str, Dict[str, Tuple[int, float]]]
+		"""
+		table: Dict[str, Dict[str, Tuple[int, float]]] = {}
+		with self._lock:
+			for (script, method), stats in sorted(self._stats.items()):
+				table.setdefault(script, {})[method] = (stats.count, stats.seconds)
+		return table
+
+	def exceeded(self, budgets: Dict[str, int], invocations: Optional[Dict[str, int]] = None) -> List[str]:
+		"""Check that the scripts do not make more COM calls than allowed.
+		@param budgets: the maximum number of COM calls per invocation keyed by the script
+		@type budgets: Dict[str, int]
+		@param invocations: the number of invocations of each script, one by default
+		@type invocations: Optional[Dict[str, int]]
+		@return: descriptions of the scripts which have exceeded their budgets
+		@rtype: List[str]
+		"""
+		violations: List[str] = []
+		for script, budget in budgets.items():
+			count = (invocations or {}).get(script, 1)
+			calls = self.calls(script)
+			if calls > budget * count:
+				violations.append(
+					"%s made %g COM calls per invocation, at most %d allowed"
+					% (script, calls / count, budget)
+				)
+		return violations
+
+	def reset(self) -> None:
+		"""Discard all counters."""
+		with self._lock:
+			self._stats = {}
+
+	def report(self) -> str:
+		"""Describe all counters, grouped by the calling script.
+		@return: multiline report
+		@rtype: str
+		"""
+		lines: List[str] = []
+		for script, methods in self.table().items():
+			lines.append("%s: %d calls" % (script, sum(count for count, seconds in methods.values())))
+			for method, (count, seconds) in methods.items():
+				lines.append("  %s: %d calls, %g ms" % (method, count, round(seconds * 1000.0, 3)))
+		return "\n".join(lines)
+
+
+# Global accounting of COM calls made by the add-on
+accounting = ComCallAccounting()
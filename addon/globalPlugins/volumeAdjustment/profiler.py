@@ -0,0 +1,184 @@
+# profiler.py
+# Profiling of the next invocations of the add-on scripts
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from __future__ import annotations
+import pstats
+from cProfile import Profile
+from functools import wraps
+from io import StringIO
+from os import path
+from time import localtime, monotonic, strftime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# The number of functions listed in the text summary for each sort order
+TOP_FUNCTIONS: int = 30
+
+# Sort orders of the text summary: pstats sort key and its description
+SORT_ORDERS: Tuple[Tuple[str, str], ...] = (
+	("cumulative", "cumulative"),
+	("tottime", "own"),
+)
+
+
+class GestureProfiler(object):
+	"""Collects cProfile statistics of the next invocations of the scripts.
+	The scripts are wrapped only while the profiler is armed, so it costs nothing otherwise.
+	"""
+
+	def __init__(self) -> None:
+		"""The profiler is not armed initially."""
+		self._profile: Optional[Profile] = None
+		self._remaining: int = 0
+		self._deadline: float = 0.0
+		self._folder: str = ""
+		self._prefix: str = ""
+		self._invocations: Dict[str, int] = {}
+		self._wrappers: Dict[Callable[[Any], None], Callable[[Any], None]] = {}
+		self._onFinish: Optional[Callable[[str, Optional[str]], None]] = None
+
+	@property
+	def armed(self) -> bool:
+		"""Whether the next invocations of the scripts are profiled.
+		@return: state of the profiler
+		@rtype: bool
+		"""
+		return self._profile is not None
+
+	@property
+	def remaining(self) -> int:
+		"""The number of script invocations which will be profiled before the profiler stops.
+		@return: number of invocations
+		@rtype: int
+		"""
+		return self._remaining
+
+	def arm(
+		self,
+		count: int,
+		timeout: float,
+		folder: str,
+		prefix: str,
+		onFinish: Optional[Callable[[str, Optional[str]], None]] = None,
+	) -> None:
+		"""Start profiling the next invocations of the scripts.
+		@param count: the number of script invocations to profile
+		@type count: int
+		@param timeout: the maximum time in seconds while the profiler waits for the invocations
+		@type timeout: float
+		@param folder: the folder where the statistics are saved
+		@type folder: str
+		@param prefix: the beginning of the names of the saved files
+		@type prefix: str
+		@param onFinish: called with the reason and the path to the saved summary (None if nothing was saved)
+		@type onFinish: Optional[Callable[[str, Optional[str]], None]]
+		@raise ValueError: if another profiler is already active in the process
+		"""
+		profile = Profile()
+		# Fail here rather than in the middle of a gesture if another profiling tool is active
+		profile.enable()
+		profile.disable()
+		self._profile = profile
+		self._remaining = count
+		self._deadline = monotonic() + timeout
+		self._folder = folder
+		self._prefix = prefix
+		self._invocations = {}
+		self._wrappers = {}
+		self._onFinish = onFinish
+
+	def wrap(self, script: Callable[[Any], None]) -> Callable[[Any], None]:
+		"""Create the script which is profiled while the profiler is armed.
+		The same wrapper is returned for each invocation of the script,
+		so NVDA still recognizes the repeated presses of the gesture.
+		@param script: the script of the global plugin
+		@type script: Callable[[InputGesture], None]
+		@return: the profiled script with the same name and attributes
+		@rtype: Callable[[InputGesture], None]
+		"""
+		key = getattr(script, "__func__", script)
+		if key not in self._wrappers:
+
+			@wraps(script)
+			def profiled(gesture: Any) -> None:
+				self.run(script, gesture)
+
+			self._wrappers[key] = profiled
+		return self._wrappers[key]
+
+	def run(self, script: Callable[[Any], None], gesture: Any) -> None:
+		"""Execute the script under the profiler, stop the profiler after the last invocation.
+		@param script: the script of the global plugin
+		@type script: Callable[[InputGesture], None]
+		@param gesture: the input gesture which has triggered the script
+		@type gesture: InputGesture
+		"""
+		profile = self._profile
+		if profile is not None and monotonic() > self._deadline:
+			self.finish("timeout")
+			profile = None
+		if profile is None:
+			script(gesture)
+			return
+		name = getattr(script, "__name__", "script")
+		profile.enable()
+		try:
+			script(gesture)
+		finally:
+			profile.disable()
+			self._invocations[name] = self._invocations.get(name, 0) + 1
+			self._remaining -= 1
+		if self._remaining <= 0:
+			self.finish("count")
+
+	def finish(self, reason: str) -> Optional[str]:
+		"""Disarm the profiler and save the collected statistics.
+		@param reason: why the profiling is finished, e.g. "count", "timeout" or "cancel"
+		@type reason: str
+		@return: the path to the text summary or None if no scripts have been profiled
+		@rtype: Optional[str]
+		"""
+		profile, self._profile = self._profile, None
+		onFinish, self._onFinish = self._onFinish, None
+		summary: Optional[str] = None
+		if profile is not None and self._invocations:
+			summary = self.save(profile, reason)
+		self._remaining = 0
+		self._wrappers = {}
+		onFinish and onFinish(reason, summary)
+		return summary
+
+	def save(self, profile: Profile, reason: str) -> Optional[str]:
+		"""Write the statistics to the .pstats file and the top functions to the text file next to it.
+		@param profile: the profile with the collected statistics
+		@type profile: Profile
+		@param reason: why the profiling is finished
+		@type reason: str
+		@return: the path to the text summary or None if the files cannot be written
+		@rtype: Optional[str]
+		"""
+		base = path.join(
+			self._folder, "%s-profile-%s" % (self._prefix, strftime("%Y%m%d-%H%M%S", localtime()))
+		)
+		stream = StringIO()
+		stream.write("Profiled scripts (finished by %s):\n" % reason)
+		for name, count in sorted(self._invocations.items()):
+			stream.write("  %s: %d\n" % (name, count))
+		stats = pstats.Stats(profile, stream=stream)
+		for key, description in SORT_ORDERS:
+			stream.write("\nTop %d functions by %s time:\n" % (TOP_FUNCTIONS, description))
+			stats.sort_stats(key).print_stats(TOP_FUNCTIONS)
+		try:
+			profile.dump_stats(base + ".pstats")
+			with open(base + ".txt", "w", encoding="utf-8") as f:
+				f.write(stream.getvalue())
+		except Exception:
+			return None
+		return base + ".txt"
+
+
+# Global profiler of the add-on scripts
+profiler = GestureProfiler()
@@ -0,0 +1,199 @@
+# recorder.py
+# Flight recorder of the audio operations performed by the add-on
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from __future__ import annotations
+import json
+import logging
+from array import array
+from itertools import count
+from math import isnan, nan
+from os import path, replace
+from threading import Lock, local
+from time import monotonic, time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Types of the recorded operations, the index in the tuple is stored in the record
+KINDS: Tuple[str, ...] = (
+	"none",
+	"mute",
+	"unmute",
+	"level",
+	"channel",
+	"scan",
+	"default",
+	"output",
+)
+MUTE, UNMUTE, LEVEL, CHANNEL, SCAN, DEFAULT, OUTPUT = range(1, len(KINDS))
+
+
+class FlightRecorder(object):
+	"""Fixed-size ring buffer of the audio operations, the oldest records are overwritten.
+	All fields are kept in preallocated arrays, so recording neither formats nor allocates the records.
+	"""
+
+	def __init__(self, capacity: int = 1024) -> None:
+		"""Preallocate the storage of the records.
+		@param capacity: the maximum number of stored records
+		@type capacity: int
+		"""
+		self._capacity: int = capacity
+		self._counter = count()
+		self._times: array = array("d", [0.0]) * capacity
+		self._kinds: array = array("B", [0]) * capacity
+		self._old: array = array("f", [0.0]) * capacity
+		self._new: array = array("f", [0.0]) * capacity
+		self._channels: array = array("h", [0]) * capacity
+		self._ids: List[str] = [""] * capacity
+		self._scripts: List[str] = [""] * capacity
+		self._recorded: int = 0
+		self._lock = Lock()
+		self._local = local()
+
+	@property
+	def capacity(self) -> int:
+		"""The maximum number of stored records.
+		@return: size of the ring buffer
+		@rtype: int
+		"""
+		return self._capacity
+
+	@property
+	def recorded(self) -> int:
+		"""The number of operations recorded since the start, including the overwritten ones.
+		@return: number of records
+		@rtype: int
+		"""
+		return self._recorded
+
+	def setScript(self, name: str) -> None:
+		"""Remember the script which handles the current gesture, it is stored with the following records.
+		Only the records made on the calling thread are attributed to the script.
+		@param name: the name of the script function, e.g. "script_volumeUp", or empty string
+		@type name: str
+		"""
+		self._local.script = name
+
+	def record(self, kind: int, id: str, old: float = nan, new: float = nan, channel: int = -1) -> None:
+		"""Store the operation in the next slot of the ring buffer.
+		@param kind: the type of the operation, one of MUTE, UNMUTE, LEVEL, CHANNEL, SCAN, DEFAULT, OUTPUT
+		@type kind: int
+		@param id: ID of the audio source or audio device
+		@type id: str
+		@param old: volume level before the operation, the number of devices for scans, NaN if unknown
+		@type old: float
+		@param new: volume level after the operation, the number of devices for scans, NaN if unknown
+		@type new: float
+		@param channel: the number of the audio channel or -1 if the whole audio source is affected
+		@type channel: int
+		"""
+		sequence = next(self._counter)
+		slot = sequence % self._capacity
+		self._times[slot] = time()
+		self._kinds[slot] = kind
+		self._old[slot] = old
+		self._new[slot] = new
+		self._channels[slot] = channel
+		self._ids[slot] = id
+		self._scripts[slot] = getattr(self._local, "script", "")
+		self._recorded = sequence + 1
+
+	def records(self) -> Iterator[Dict[str, Any]]:
+		"""Stored records from the oldest to the newest.
+		@return: records with time, kind, source, channel, old and new levels and the triggering script
+		@rtype: Iterator[Dict[str, Any]]
+		"""
+		recorded = self._recorded
+		for sequence in range(max(0, recorded - self._capacity), recorded):
+			slot = sequence % self._capacity
+			old, new = self._old[slot], self._new[slot]
+			script = self._scripts[slot]
+			yield {
+				"time": round(self._times[slot], 3),
+				"kind": KINDS[self._kinds[slot]],
+				"source": self._ids[slot],
+				"channel": self._channels[slot],
+				"old": None if isnan(old) else round(old, 4),
+				"new": None if isnan(new) else round(new, 4),
+				"script": script[7:] if script.startswith("script_") else script,
+			}
+
+	def dump(self, file: str, reason: str = "request") -> int:
+		"""Write the stored records to the file in JSON-lines format, the first line describes the dump.
+		The file is replaced atomically.
+		@param file: full path to the file
+		@type file: str
+		@param reason: why the records are dumped, e.g. "request" or "exception"
+		@type reason: str
+		@return: the number of written records or -1 if the file cannot be written
+		@rtype: int
+		"""
+		with self._lock:
+			records = list(self.records())
+			temp = file + ".tmp"
+			try:
+				with open(temp, "w", encoding="utf-8") as f:
+					header = {"dump": reason, "time": round(time(), 3), "recorded": self._recorded}
+					f.write(json.dumps(header) + "\n")
+					for record in records:
+						f.write(json.dumps(record, ensure_ascii=False) + "\n")
+				replace(temp, file)
+			except Exception:
+				return -1
+		return len(records)
+
+	def clear(self) -> None:
+		"""Discard all stored records."""
+		with self._lock:
+			self._counter = count()
+			self._recorded = 0
+
+
+class ExceptionDumpHandler(logging.Handler):
+	"""Dumps the flight recorder when an exception raised in the add-on is logged."""
+
+	def __init__(self, recorder: FlightRecorder, file: str, interval: float = 10.0) -> None:
+		"""Bind the handler to the flight recorder.
+		@param recorder: the flight recorder to dump
+		@type recorder: FlightRecorder
+		@param file: full path to the file of the dump
+		@type file: str
+		@param interval: the minimum time in seconds between the dumps
+		@type interval: float
+		"""
+		super(ExceptionDumpHandler, self).__init__(logging.ERROR)
+		self._recorder = recorder
+		self._file = file
+		self._interval = interval
+		self._dumpedAt: Optional[float] = None
+		self._package = path.dirname(path.abspath(__file__))
+
+	def fromAddon(self, record: logging.LogRecord) -> bool:
+		"""Check whether the logged exception has been raised in the add-on code.
+		@param record: the log record with the exception info
+		@type record: logging.LogRecord
+		@return: whether any frame of the traceback belongs to the add-on
+		@rtype: bool
+		"""
+		traceback = record.exc_info[2] if record.exc_info else None
+		while traceback is not None:
+			if path.abspath(traceback.tb_frame.f_code.co_filename).startswith(self._package):
+				return True
+			traceback = traceback.tb_next
+		return False
+
+	def emit(self, record: logging.LogRecord) -> None:
+		if not self.fromAddon(record):
+			return
+		now = monotonic()
+		if self._dumpedAt is not None and now - self._dumpedAt < self._interval:
+			return
+		self._dumpedAt = now
+		self._recorder.dump(self._file, "exception")
+
+
+# Global flight recorder of the audio operations
+recorder = FlightRecorder()
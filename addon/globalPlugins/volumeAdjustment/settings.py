@@ -13,10 +13,9 @@ from globalPluginHandler import reloadGlobalPlugins
 from gui import guiHelper, nvdaControls
 from gui.settingsDialogs import SettingsPanel
 from logHandler import log
-from pycaw.utils import AudioUtilities
 from queueHandler import eventQueue, queueFunction
 from . import addonName, addonSummary
-from .audiocore import cfg, devices
+from .audiocore import cfg, devices, options, sessionsCache
 
 try:
 	addonHandler.initTranslation()
@@ -124,12 +123,24 @@ class VASettingsPanel(SettingsPanel):
 			wx.CheckBox(self, label=_("Hide audio sessions with the same &names")),
 		)
 		self.hideDuplicatesChk.SetValue(config.conf[addonName]["duplicates"])
+		self.activeOnlyChk = addonHelper.addItem(
+			# Translators: This is the label for a checkbox in the settings panel.
+			wx.CheckBox(self, label=_("Switch only between a&ctive audio sessions")),
+		)
+		self.activeOnlyChk.SetValue(config.conf[addonName]["activeOnly"])
+		self.activeOnlyChk.Bind(wx.EVT_CHECKBOX, self.onActiveOnlyCheckbox)
+		self.peakMetersChk = addonHelper.addItem(
+			# Translators: This is the label for a checkbox in the settings panel.
+			wx.CheckBox(self, label=_("Skip active audio sessions that are &silent at the moment")),
+		)
+		self.peakMetersChk.SetValue(config.conf[addonName]["peakMeters"])
+		# Silent audio sessions are skipped only while switching between active audio sessions
+		self.peakMetersChk.Enable(config.conf[addonName]["activeOnly"])
 
-		procs: List[str] = [
-			s.Process.name() for s in AudioUtilities.GetAllSessions() if s.Process and s.Process.name()
-		]
+		procs: List[str] = sessionsCache.snapshot().names
 		self.procs = list(set(procs)) if config.conf[addonName]["duplicates"] else procs
-		self.procs.extend([proc for proc in cfg.processes if proc not in procs])
+		known = set(procs)
+		self.procs.extend([proc for proc in cfg.processes if proc not in known])
 		self.hideProcesses = addonHelper.addLabeledControl(
 			# Translators: The label of the Checkable list in the settings panel
 			_("Hide &processes:"),
@@ -159,13 +170,7 @@ class VASettingsPanel(SettingsPanel):
 			nvdaControls.CustomCheckListBox,
 			choices=[],
 		)
-		self.devs = dict(cfg.devices)
-		self.devs.update({devices[i].id: devices[i].name for i in range(len(devices))})
-		for id, name in self.devs.items():
-			self.hideDevices.Append(name, id)
-		if len(self.devs) > 0:
-			self.hideDevices.SetCheckedStrings([self.devs[id] for id in cfg.devices])
-			self.hideDevices.SetSelection(0)
+		self.fillDevices()
 		self.hideDevices.Show(show=self.advancedChk.GetValue())
 
 		self.devButtons = guiHelper.ButtonHelper(orientation=wx.HORIZONTAL)
@@ -217,20 +222,22 @@ class VASettingsPanel(SettingsPanel):
 		@type event: wx.PyEvent
 		"""
 		config.conf[addonName]["advanced"] = event.IsChecked()
-		devices.initialize(cfg.devices)
-		self.hideDevices.Clear()
-		self.devs = dict(cfg.devices)
-		self.devs.update({devices[i].id: devices[i].name for i in range(len(devices))})
-		for id, name in self.devs.items():
-			self.hideDevices.Append(name, id)
-		if event.IsChecked() and len(self.devs) > 0:
-			self.hideDevices.SetCheckedStrings([self.devs[id] for id in cfg.devices])
-			self.hideDevices.SetSelection(0)
+		options.rebuild()
+		# The list is filled when the scan is finished, the GUI thread is not blocked while scanning
+		devices.scan(cfg.devices, delay=0).add_done_callback(lambda scan: wx.CallAfter(self.onDevicesScanned))
 		self.hideDevices.Show(show=event.IsChecked())
 		self.sizer.Show(self.devButtons.sizer, show=event.IsChecked())
 		self.sizer.Fit(self)
 		self.hideDevices.GetParent().Layout()
 
+	def onActiveOnlyCheckbox(self, event: wx.PyEvent) -> None:
+		"""Enabling or disabling switching only between active audio sessions,
+		dynamically controls the availability of skipping silent audio sessions.
+		@param event: event binder object which processes changing of the wx.Checkbox
+		@type event: wx.PyEvent
+		"""
+		self.peakMetersChk.Enable(event.IsChecked())
+
 	def onMuteModeChoice(self, event: wx.PyEvent) -> None:
 		"""Select the mute mode - completely turn off or partial decrease of the volume level,
 		dynamically controls the showing of the volume mute slider.
@@ -256,16 +263,30 @@ class VASettingsPanel(SettingsPanel):
 		@param event: event that occurs when a wx.Button is pressed
 		@type event: wx.PyEvent
 		"""
-		devices.initialize()
+		# The list is filled when the scan is finished, the GUI thread is not blocked while scanning
+		devices.scan(delay=0).add_done_callback(lambda scan: wx.CallAfter(self.onDevicesScanned, focus=True))
+
+	def onDevicesScanned(self, focus: bool = False) -> None:
+		"""Refill the list of audio devices when the scan requested from the panel is finished.
+		@param focus: whether to move the focus to the list of audio devices
+		@type focus: bool
+		"""
+		# The panel may have been closed while the audio devices were scanned
+		if not self:
+			return
+		self.fillDevices()
+		focus and self.hideDevices.SetFocus()
+
+	def fillDevices(self) -> None:
+		"""Fill the list of audio devices from the currently published table of audio devices."""
 		self.hideDevices.Clear()
 		self.devs = dict(cfg.devices)
-		self.devs.update({devices[i].id: devices[i].name for i in range(len(devices))})
+		self.devs.update({device.id: device.name for device in devices.snapshot()})
 		for id, name in self.devs.items():
 			self.hideDevices.Append(name, id)
 		if len(self.devs) > 0:
 			self.hideDevices.SetCheckedStrings([self.devs[id] for id in cfg.devices])
 			self.hideDevices.SetSelection(0)
-		self.hideDevices.SetFocus()
 
 	def onClearDevicesButton(self, event: wx.PyEvent) -> None:
 		"""Uncheck all installed checkboxes and remove unnecessary audio devices.
@@ -273,9 +294,10 @@ class VASettingsPanel(SettingsPanel):
 		@type event: wx.PyEvent
 		"""
 		self.hideDevices.Clear()
-		for dev in devices:
+		table = devices.snapshot()
+		for dev in table:
 			self.hideDevices.Append(dev.name, dev.id)
-		if len(devices) > 0:
+		if len(table) > 0:
 			self.hideDevices.SetSelection(0)
 		self.hideDevices.SetFocus()
 
@@ -284,9 +306,11 @@ class VASettingsPanel(SettingsPanel):
 		@param event: event that occurs when a wx.Button is pressed
 		@type event: wx.PyEvent
 		"""
-		procs = [s.Process.name() for s in AudioUtilities.GetAllSessions() if s.Process and s.Process.name()]
+		sessionsCache.invalidate()
+		procs = sessionsCache.snapshot().names
 		self.procs = list(set(procs)) if config.conf[addonName]["duplicates"] else procs
-		self.procs.extend([proc for proc in cfg.processes if proc not in procs])
+		known = set(procs)
+		self.procs.extend([proc for proc in cfg.processes if proc not in known])
 		self.hideProcesses.Clear()
 		self.hideProcesses.SetItems(self.procs)
 		if len(self.procs) > 0:
@@ -299,9 +323,7 @@ class VASettingsPanel(SettingsPanel):
 		@param event: event that occurs when a wx.Button is pressed
 		@type event: wx.PyEvent
 		"""
-		self.procs = [
-			s.Process.name() for s in AudioUtilities.GetAllSessions() if s.Process and s.Process.name()
-		]
+		self.procs = sessionsCache.snapshot().names
 		self.hideProcesses.Clear()
 		self.hideProcesses.SetItems(self.procs)
 		if len(self.procs) > 0:
@@ -318,11 +340,15 @@ class VASettingsPanel(SettingsPanel):
 		config.conf[addonName]["step"] = self.volumeStep.GetValue()
 		config.conf[addonName]["focus"] = self.followFocusChk.GetValue()
 		config.conf[addonName]["duplicates"] = self.hideDuplicatesChk.GetValue()
+		config.conf[addonName]["activeOnly"] = self.activeOnlyChk.GetValue()
+		config.conf[addonName]["peakMeters"] = self.peakMetersChk.GetValue()
 		config.conf[addonName]["muteCompletely"] = not self.muteMode.GetClientData(
 			self.muteMode.GetSelection()
 		)
 		config.conf[addonName]["mutePercentage"] = self.mutePercentageSlider.GetValue()
 		config.conf[addonName]["unmuteOnExit"] = self.unmuteOnExitChk.GetValue()
+		# The configuration is not saved here, so the hooks will not refresh the snapshot
+		options.rebuild()
 		devs = {}
 		for checked in self.hideDevices.GetCheckedItems():
 			id = self.hideDevices.GetClientData(checked)
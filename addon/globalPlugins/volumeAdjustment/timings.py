@@ -0,0 +1,268 @@
+# timings.py
+# Latency histograms of the main phases of the add-on gestures
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Upper bounds of the histogram buckets in seconds, the spans slower than the last bound get the extra bucket
+BUCKETS: Tuple[float, ...] = (
+	0.00005,
+	0.0001,
+	0.00025,
+	0.0005,
+	0.001,
+	0.0025,
+	0.005,
+	0.01,
+	0.025,
+	0.05,
+	0.1,
+	0.25,
+	0.5,
+	1.0,
+)
+
+# Measured phases of the gestures in the order of the reports
+PHASES: Tuple[str, ...] = (
+	"enumeration",
+	"selection",
+	"comRead",
+	"comWrite",
+	"configSave",
+	"announcement",
+)
+
+
+def milliseconds(seconds: float) -> str:
+	"""Format the duration for reports.
+	@param seconds: duration in seconds
+	@type seconds: float
+	@return: duration in milliseconds
+	@rtype: str
+	"""
+	return "%g ms" % round(seconds * 1000.0, 3)
+
+
+class LatencyHistogram(object):
+	"""Durations of one phase counted in fixed buckets, so recording does not allocate memory."""
+
+	def __init__(self, name: str) -> None:
+		"""Create the empty histogram.
+		@param name: the name of the measured phase
+		@type name: str
+		"""
+		self.name: str = name
+		self._lock = Lock()
+		self._counts: array = array("L", [0]) * (len(BUCKETS) + 1)
+		self._count: int = 0
+		self._total: float = 0.0
+		self._maximum: float = 0.0
+
+	@property
+	def count(self) -> int:
+		"""The number of recorded spans.
+		@return: number of spans
+		@rtype: int
+		"""
+		return self._count
+
+	@property
+	def total(self) -> float:
+		"""The sum of durations of all recorded spans.
+		@return: time in seconds
+		@rtype: float
+		"""
+		return self._total
+
+	@property
+	def maximum(self) -> float:
+		"""The longest recorded span.
+		@return: time in seconds
+		@rtype: float
+		"""
+		return self._maximum
+
+	@property
+	def counts(self) -> List[int]:
+		"""The number of spans in each bucket, the last one holds the spans longer than all bounds.
+		@return: counts of spans
+		@rtype: List[int]
+		"""
+		return self._counts.tolist()
+
+	def record(self, duration: float) -> None:
+		"""Count the duration of the span in the corresponding bucket.
+		@param duration: time in seconds
+		@type duration: float
+		"""
+		bucket = bisect_left(BUCKETS, duration)
+		with self._lock:
+			self._counts[bucket] += 1
+			self._count += 1
+			self._total += duration
+			if duration > self._maximum:
+				self._maximum = duration
+
+	def percentile(self, rank: float) -> float:
+		"""The upper bound of the bucket which contains the specified percentile.
+		@param rank: the percentile rank
+		@type rank: float [0..100]
+		@return: time in seconds, not more than the longest span
+		@rtype: float
+		"""
+		if not self._count:
+			return 0.0
+		threshold = rank / 100.0 * self._count
+		accumulated: int = 0
+		for bucket, count in enumerate(self._counts):
+			accumulated += count
+			if accumulated >= threshold and count:
+				return min(BUCKETS[bucket], self._maximum) if bucket < len(BUCKETS) else self._maximum
+		return self._maximum
+
+	def reset(self) -> None:
+		"""Discard all recorded spans."""
+		with self._lock:
+			for bucket in range(len(self._counts)):
+				self._counts[bucket] = 0
+			self._count = 0
+			self._total = 0.0
+			self._maximum = 0.0
+
+	def summary(self) -> str:
+		"""Short description of the histogram.
+		@return: the number of spans, the 95th percentile and the longest span
+		@rtype: str
+		"""
+		return "%s %d, p95 %s, max %s" % (
+			self.name,
+			self._count,
+			milliseconds(self.percentile(95)),
+			milliseconds(self._maximum),
+		)
+
+	def lines(self) -> List[str]:
+		"""Full description of the histogram with one line for each non-empty bucket.
+		@return: lines of the report
+		@rtype: List[str]
+		"""
+		lines = [
+			"%s: %d spans, mean %s, p50 %s, p95 %s, p99 %s, max %s"
+			% (
+				self.name,
+				self._count,
+				milliseconds(self._total / self._count if self._count else 0.0),
+				milliseconds(self.percentile(50)),
+				milliseconds(self.percentile(95)),
+				milliseconds(self.percentile(99)),
+				milliseconds(self._maximum),
+			)
+		]
+		for bucket, count in enumerate(self._counts):
+			if count:
+				bound = (
+					"<= " + milliseconds(BUCKETS[bucket])
+					if bucket < len(BUCKETS)
+					else "> " + milliseconds(BUCKETS[-1])
+				)
+				lines.append("  %s: %d" % (bound, count))
+		return lines
+
+
+class TimingSpan(object):
+	"""Context manager which records the time spent inside it into the histogram."""
+
+	__slots__ = ("_histogram", "_started")
+
+	def __init__(self, histogram: LatencyHistogram) -> None:
+		"""Bind the span to the histogram.
+		@param histogram: the histogram of the measured phase
+		@type histogram: LatencyHistogram
+		"""
+		self._histogram = histogram
+		self._started: float = 0.0
+
+	def __enter__(self) -> TimingSpan:
+		self._started = perf_counter()
+		return self
+
+	def __exit__(self, *args: Any) -> None:
+		self._histogram.record(perf_counter() - self._started)
+
+
+class IdleSpan(object):
+	"""Context manager which does nothing, it is shared by all spans while the measurements are disabled."""
+
+	__slots__ = ()
+
+	def __enter__(self) -> IdleSpan:
+		return self
+
+	def __exit__(self, *args: Any) -> None:
+		pass
+
+
+class Timings(object):
+	"""Histograms of all measured phases.
+	While the measurements are disabled, each span costs one attribute check and returns a shared idle span.
+	"""
+
+	def __init__(self) -> None:
+		"""Create empty histograms of all phases, the measurements are disabled by default."""
+		self.enabled: bool = False
+		self._idle = IdleSpan()
+		self._histograms: Dict[str, LatencyHistogram] = {phase: LatencyHistogram(phase) for phase in PHASES}
+
+	def span(self, phase: str) -> Union[TimingSpan, IdleSpan]:
+		"""Measure the phase of the gesture, should be used in the "with" statement.
+		@param phase: the name of the phase from PHASES
+		@type phase: str
+		@return: the context manager which records the time spent inside it
+		@rtype: Union[TimingSpan, IdleSpan]
+		"""
+		if not self.enabled:
+			return self._idle
+		return TimingSpan(self._histograms[phase])
+
+	def histogram(self, phase: str) -> Optional[LatencyHistogram]:
+		"""Get the histogram of the phase.
+		@param phase: the name of the phase
+		@type phase: str
+		@return: the histogram or None if the phase is unknown
+		@rtype: Optional[LatencyHistogram]
+		"""
+		return self._histograms.get(phase)
+
+	def reset(self) -> None:
+		"""Discard the spans recorded for all phases."""
+		for histogram in self._histograms.values():
+			histogram.reset()
+
+	def summary(self) -> str:
+		"""One line description of all phases which have recorded spans.
+		@return: the number of spans, the 95th percentile and the longest span of each phase
+		@rtype: str
+		"""
+		return "; ".join(histogram.summary() for histogram in self._histograms.values() if histogram.count)
+
+	def report(self) -> str:
+		"""Full description of the histograms of all phases.
+		@return: multiline report
+		@rtype: str
+		"""
+		lines: List[str] = []
+		for histogram in self._histograms.values():
+			lines.extend(histogram.lines())
+		return "\n".join(lines)
+
+
+# Global latency histograms of the add-on gestures
+timings = Timings()
@@ -0,0 +1,130 @@
+# configlookups.py
+# The number of configobj lookups made by the volume gestures
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Count the lookups of the NVDA configuration performed by each gesture with and without the settings snapshot.
+Before the snapshot was introduced, every access to a setting read config.conf[addonName][...],
+which is reproduced by replacing the snapshot with LiveSettingsSnapshot.
+
+Usage:
+	python benchmarks/configlookups.py --iterations 20
+"""
+
+from __future__ import annotations
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Optional, Sequence
+
+import stubs
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "addon", "globalPlugins"))
+
+
+class LiveSettings(object):
+	"""The add-on settings read from the NVDA configuration on each access."""
+
+	def __init__(self, section: str) -> None:
+		"""Remember the configuration section of the add-on.
+		@param section: the name of the add-on section
+		@type section: str
+		"""
+		self._section = section
+
+	def __getattr__(self, name: str) -> Any:
+		if name.startswith("_"):
+			raise AttributeError(name)
+		return stubs.conf[self._section][name]
+
+
+def lookups(bench: Any, iterations: int) -> Dict[str, float]:
+	"""Call each script repeatedly and count the configuration lookups.
+	@param bench: the global plugin running against the simulated audio backend
+	@type bench: gestures.Bench
+	@param iterations: the number of calls of each script
+	@type iterations: int
+	@return: the mean number of lookups per call keyed by the name of the script
+	@rtype: Dict[str, float]
+	"""
+	from gestures import SCRIPTS
+
+	counts: Dict[str, float] = {}
+	for script in SCRIPTS:
+		method = getattr(bench.plugin, "script_" + script)
+		setup = bench.setup(script)
+		total = 0
+		for i in range(iterations):
+			setup()
+			started = stubs.conf.lookups
+			method(bench.gesture)
+			# Pending volume steps belong to the gesture which produced them
+			bench.audiocore.volumeSteps.flush()
+			total += stubs.conf.lookups - started
+		counts[script] = total / iterations
+	return counts
+
+
+def measure(iterations: int) -> List[Dict[str, Any]]:
+	"""Count the lookups with the settings snapshot and with the settings read on each access.
+	@param iterations: the number of calls of each script
+	@type iterations: int
+	@return: the lookups per call of each script in both modes
+	@rtype: List[Dict[str, Any]]
+	"""
+	from gestures import Bench
+	import volumeAdjustment
+
+	bench = Bench(2, 10)
+	audiocore = bench.audiocore
+	snapshot = lookups(bench, iterations)
+	options = audiocore.options
+
+	class LiveSettingsSnapshot(type(options)):
+		"""The settings snapshot which reads the NVDA configuration on each access to a setting."""
+
+		@property
+		def current(self) -> Any:
+			return LiveSettings(audiocore.addonName)
+
+	live = LiveSettingsSnapshot()
+	audiocore.options = volumeAdjustment.options = live
+	try:
+		direct = lookups(bench, iterations)
+	finally:
+		audiocore.options = volumeAdjustment.options = options
+	bench.plugin.terminate()
+	return [{"script": script, "live": direct[script], "snapshot": snapshot[script]} for script in snapshot]
+
+
+def parse(argv: Optional[Sequence[str]] = None) -> Namespace:
+	"""Parse the command line arguments.
+	@return: the options of the benchmark
+	@rtype: Namespace
+	"""
+	parser = ArgumentParser(description="Configuration lookups of the Volume Adjustment gestures")
+	parser.add_argument("--iterations", type=int, default=20, help="calls of each script")
+	return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""Run the benchmark and print the results.
+	@return: exit code, 1 if any gesture makes more lookups with the snapshot than without it
+	@rtype: int
+	"""
+	args = parse(argv)
+	with TemporaryDirectory() as configPath:
+		stubs.install(configPath)
+		results = measure(args.iterations)
+	print("%-22s %14s %14s" % ("script", "per access", "snapshot"))
+	for item in results:
+		print("%-22s %14.1f %14.1f" % (item["script"], item["live"], item["snapshot"]))
+	return 1 if any(item["snapshot"] > item["live"] for item in results) else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
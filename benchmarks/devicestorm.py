@@ -0,0 +1,159 @@
+# devicestorm.py
+# Replay of plug and unplug storms through the in-memory emitter of audio endpoint notifications
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Connect, disconnect, disable and make default the audio devices at random as USB and Bluetooth headsets do.
+After each notification the published table of audio devices is compared with the simulated endpoints,
+and the cost of patching the table is compared with the full scan which was needed before.
+
+Usage:
+	python benchmarks/devicestorm.py --devices 4 --headsets 8 --events 5000
+"""
+
+from __future__ import annotations
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import stubs
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "addon", "globalPlugins"))
+
+
+def storm(devices: int, headsets: int, events: int, seed: int) -> Dict[str, Any]:
+	"""Emit the random notifications and check the table of audio devices after each of them.
+	@param devices: the number of permanently connected audio devices
+	@type devices: int
+	@param headsets: the number of audio devices which are connected and disconnected during the storm
+	@type headsets: int
+	@param events: the number of emitted notifications
+	@type events: int
+	@param seed: the seed of the random generator
+	@type seed: int
+	@return: time and simulated COM calls per notification and per full scan, detected mismatches
+	@rtype: Dict[str, Any]
+	"""
+	from gestures import Bench
+
+	bench = Bench(devices, 2)
+	audiocore, backend = bench.audiocore, bench.backend
+	# All audio devices are published in the advanced mode
+	stubs.conf[audiocore.addonName]["advanced"] = True
+	audiocore.options.rebuild()
+	audiocore.devices.scan(audiocore.cfg.devices, delay=0.0).result(timeout=30.0)
+	source = audiocore.devices.source
+	plugged = {"{0.0.0.00000000}.{headset-%d}" % i: "Headset %d" % i for i in range(headsets)}
+	generator = Random(seed)
+	handled = 0.0
+	calls = 0
+	mismatches: List[str] = []
+	for i in range(events):
+		kind = generator.random()
+		id = generator.choice(list(plugged))
+		backend.resetCalls()
+		started = perf_counter()
+		if kind < 0.35 and id not in backend.deviceNames:
+			backend.addDevice(id, plugged[id])
+			source.emitAdded(id, plugged[id])
+		elif kind < 0.7 and id in backend.deviceNames and id != backend.defaultDeviceId:
+			if generator.random() < 0.5:
+				backend.removeDevice(id)
+				source.emitRemoved(id)
+			else:
+				# The disabled device stays in the system but leaves the list of active devices
+				backend.removeDevice(id)
+				source.emitStateChanged(id, 2)
+		else:
+			id = generator.choice(list(backend.deviceNames))
+			backend.defaultDeviceId = id
+			source.emitDefaultChanged(id)
+		handled += perf_counter() - started
+		calls += backend.totalCalls
+		table = audiocore.devices.snapshot()
+		ids = [device.id for device in table]
+		if sorted(ids) != sorted(backend.deviceNames):
+			mismatches.append(
+				"event %d: %d devices published, %d connected" % (i, len(ids), len(backend.deviceNames))
+			)
+		elif (
+			not table[0].default
+			or table[0].id != backend.defaultDeviceId
+			or sum(d.default for d in table) != 1
+		):
+			mismatches.append(
+				"event %d: %s is not the only default device at the first position" % (i, ids[0])
+			)
+
+	# The registry of audio sessions restarted after the changes of the default device is not measured
+	audiocore.devices.scheduler.submit(lambda: None).result(timeout=30.0)
+	started = perf_counter()
+	audiocore.devices.scan(audiocore.cfg.devices, delay=0.0).result(timeout=30.0)
+	scanned = perf_counter() - started
+	scanCalls = audiocore.devices.lastScan.comCalls
+	bench.close()
+	return {
+		"devices": devices + headsets,
+		"events": events,
+		"event": {"us": handled / events * 1e6, "comCalls": calls / events},
+		"scan": {"us": scanned * 1e6, "comCalls": scanCalls},
+		"mismatches": mismatches,
+	}
+
+
+def parse(argv: Optional[Sequence[str]] = None) -> Namespace:
+	"""Parse the command line arguments.
+	@return: the options of the benchmark
+	@rtype: Namespace
+	"""
+	parser = ArgumentParser(description="Plug and unplug storms: patching of the table of audio devices")
+	parser.add_argument(
+		"--devices", type=int, default=4, help="number of permanently connected audio devices"
+	)
+	parser.add_argument(
+		"--headsets", type=int, default=8, help="number of plugged and unplugged audio devices"
+	)
+	parser.add_argument("--events", type=int, default=5000, help="number of emitted notifications")
+	parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+	return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""Run the benchmark and print the results.
+	@return: exit code, 1 if any published table has differed from the connected audio devices
+	@rtype: int
+	"""
+	args = parse(argv)
+	with TemporaryDirectory() as configPath:
+		stubs.install(configPath)
+		result = storm(args.devices, args.headsets, args.events, args.seed)
+	print(
+		"%8s %8s %10s %11s %10s %9s %9s"
+		% ("devices", "events", "event us", "event COM", "scan us", "scan COM", "mismatch")
+	)
+	print(
+		"%8d %8d %10.3f %11.1f %10.1f %9d %9d"
+		% (
+			result["devices"],
+			result["events"],
+			result["event"]["us"],
+			result["event"]["comCalls"],
+			result["scan"]["us"],
+			result["scan"]["comCalls"],
+			len(result["mismatches"]),
+		)
+	)
+	for mismatch in result["mismatches"][:10]:
+		print("MISMATCH " + mismatch)
+	return 1 if result["mismatches"] else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
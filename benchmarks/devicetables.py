@@ -0,0 +1,181 @@
+# devicetables.py
+# Stress check of the publication of the tables of audio devices
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Hammer the tables of audio devices with reads while they are replaced by scans and default device changes.
+Each reader verifies that every table it holds is complete, has exactly one default audio device
+at the first position, is never changed after publication and that generations never go backwards.
+
+Usage:
+	python benchmarks/devicetables.py --devices 6 --readers 4 --seconds 3
+"""
+
+from __future__ import annotations
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from random import Random
+from tempfile import TemporaryDirectory
+from threading import Event, Lock, Thread
+from time import monotonic, sleep
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import stubs
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "addon", "globalPlugins"))
+
+
+class Stress(object):
+	"""Writers replacing the tables of audio devices and readers checking them."""
+
+	def __init__(self, devices: int, seed: int) -> None:
+		"""Start the global plugin in the advanced mode against the simulated audio backend.
+		@param devices: the number of simulated audio devices
+		@type devices: int
+		@param seed: the seed of the random generator
+		@type seed: int
+		"""
+		from gestures import Bench
+
+		self.bench = Bench(devices, 2)
+		self.audiocore = self.bench.audiocore
+		self.backend = self.bench.backend
+		# All audio devices are published in the advanced mode
+		stubs.conf[self.audiocore.addonName]["advanced"] = True
+		self.audiocore.options.rebuild()
+		self._random = Random(seed)
+		self._finished = Event()
+		self._lock = Lock()
+		self.violations: List[str] = []
+		self.scans: int = 0
+		self.switches: int = 0
+		self.reads: int = 0
+		self.generations: int = 0
+
+	def violation(self, message: str) -> None:
+		"""Remember the detected inconsistency.
+		@param message: the description of the inconsistency
+		@type message: str
+		"""
+		with self._lock:
+			self.violations.append(message)
+
+	def scan(self) -> None:
+		"""Perform full scans of audio devices one after another."""
+		devices = self.audiocore.devices
+		while not self._finished.is_set():
+			try:
+				devices.scan(self.audiocore.cfg.devices, delay=0.0).result(timeout=10.0)
+			except Exception as e:
+				self.violation("scan failed: %r" % e)
+			self.scans += 1
+
+	def switch(self) -> None:
+		"""Change the default audio device, the table is replaced without a full scan."""
+		ids = list(self.backend.deviceNames)
+		while not self._finished.is_set():
+			id = self._random.choice(ids)
+			self.backend.defaultDeviceId = id
+			self.audiocore.devices.defaultDeviceChanged(id)
+			self.switches += 1
+			sleep(0)
+
+	def read(self) -> None:
+		"""Check the consistency of the tables as the gestures see them."""
+		devices = self.audiocore.devices
+		last = -1
+		seen = set()
+		while not self._finished.is_set():
+			table = devices.snapshot()
+			if table.generation < last:
+				self.violation("generation %d follows %d" % (table.generation, last))
+			last = table.generation
+			seen.add(table.generation)
+			signature: List[Tuple[str, bool]] = [(device.id, device.default) for device in table]
+			if len(signature) != len(table) or not signature:
+				self.violation(
+					"generation %d: %d devices iterated, len() is %d" % (last, len(signature), len(table))
+				)
+				continue
+			defaults = sum(1 for id, default in signature if default)
+			if defaults != 1 or not table[0].default:
+				self.violation(
+					"generation %d: %d default devices, the first is %s" % (last, defaults, signature[0])
+				)
+			sleep(0)
+			if [(device.id, device.default) for device in table] != signature:
+				self.violation("generation %d has been changed after publication" % last)
+			self.reads += 1
+		with self._lock:
+			self.generations = max(self.generations, len(seen))
+
+	def run(self, readers: int, seconds: float) -> None:
+		"""Run the writers and readers concurrently.
+		@param readers: the number of reader threads
+		@type readers: int
+		@param seconds: the duration of the stress in seconds
+		@type seconds: float
+		"""
+		threads = [Thread(target=self.scan), Thread(target=self.switch)]
+		threads += [Thread(target=self.read) for i in range(readers)]
+		for thread in threads:
+			thread.start()
+		deadline = monotonic() + seconds
+		while monotonic() < deadline and not self.violations:
+			sleep(0.05)
+		self._finished.set()
+		for thread in threads:
+			thread.join(timeout=10.0)
+
+	def summary(self) -> Dict[str, Any]:
+		"""The numbers of performed operations and detected inconsistencies.
+		@return: counters of the stress run
+		@rtype: Dict[str, Any]
+		"""
+		return {
+			"scans": self.scans,
+			"switches": self.switches,
+			"reads": self.reads,
+			"generations": self.generations,
+			"violations": len(self.violations),
+		}
+
+
+def parse(argv: Optional[Sequence[str]] = None) -> Namespace:
+	"""Parse the command line arguments.
+	@return: the options of the stress check
+	@rtype: Namespace
+	"""
+	parser = ArgumentParser(
+		description="Concurrent reads of the tables of audio devices during repeated scans"
+	)
+	parser.add_argument("--devices", type=int, default=6, help="number of simulated audio devices")
+	parser.add_argument("--readers", type=int, default=4, help="number of reader threads")
+	parser.add_argument("--seconds", type=float, default=3.0, help="duration of the stress")
+	parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+	return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""Run the stress check and print the results.
+	@return: exit code, 1 if any inconsistency has been detected
+	@rtype: int
+	"""
+	args = parse(argv)
+	with TemporaryDirectory() as configPath:
+		stubs.install(configPath)
+		stress = Stress(args.devices, args.seed)
+		stress.run(args.readers, args.seconds)
+		stress.bench.plugin.terminate()
+	print(" ".join("%s=%d" % item for item in stress.summary().items()))
+	for violation in stress.violations[:20]:
+		print("VIOLATION " + violation)
+	return 1 if stress.violations else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
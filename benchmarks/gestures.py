@@ -0,0 +1,404 @@
+# gestures.py
+# Latency benchmark of the GlobalPlugin scripts running against the simulated audio backend
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Measure the time from the gesture to the end of the script and to the first announcement.
+The add-on is imported with stubbed NVDA modules and uses the simulated audio backend,
+so the benchmark runs without NVDA and without Windows.
+
+Usage:
+	python benchmarks/gestures.py --devices 1 4 --sessions 10 100 500 --output gestures.json
+	python benchmarks/gestures.py --baseline baseline.json --threshold 20
+	python benchmarks/gestures.py --baseline baseline.json --update-baseline
+"""
+
+from __future__ import annotations
+import gc
+import json
+import os
+import platform
+import sys
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timezone
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import stubs
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "addon", "globalPlugins"))
+
+# Benchmarked scripts in the order of the report
+SCRIPTS: Sequence[str] = ("volumeUp", "next", "mute", "channelVolumeAverage")
+
+# The maximum number of COM calls counted by the accounting layer for one invocation of each script:
+# two calls for the gestures that adjust the volume, the first selection of the audio session also queries
+# its volume interface and reads the display name, the volume level and the mute state
+BUDGETS: Dict[str, int] = {
+	"volumeUp": 2,
+	"next": 4,
+	"mute": 2,
+	"channelVolumeAverage": 2,
+}
+
+
+class Sample(NamedTuple):
+	"""The measurements of a single script call."""
+
+	latency: float
+	announcement: Optional[float]
+	calls: Dict[str, int]
+
+
+def percentile(values: List[float], rank: float) -> float:
+	"""The nearest-rank percentile of the values.
+	@param values: sorted measured values
+	@type values: List[float]
+	@param rank: the percentile rank
+	@type rank: float [0..100]
+	@return: the value below which the specified percentage of values falls
+	@rtype: float
+	"""
+	if not values:
+		return 0.0
+	index = max(0, min(len(values) - 1, int(round(rank / 100.0 * len(values) + 0.5)) - 1))
+	return values[index]
+
+
+def distribution(values: List[float]) -> Dict[str, float]:
+	"""Summary of the measured values in milliseconds.
+	@param values: measured values in seconds
+	@type values: List[float]
+	@return: p50, p95, p99, mean and max values
+	@rtype: Dict[str, float]
+	"""
+	ordered = sorted(value * 1000.0 for value in values)
+	return {
+		"p50": percentile(ordered, 50),
+		"p95": percentile(ordered, 95),
+		"p99": percentile(ordered, 99),
+		"mean": sum(ordered) / len(ordered) if ordered else 0.0,
+		"max": ordered[-1] if ordered else 0.0,
+	}
+
+
+def summarize(samples: List[Sample]) -> Dict[str, Any]:
+	"""Aggregate the samples of the script.
+	@param samples: measurements of the script calls
+	@type samples: List[Sample]
+	@return: latency, announcement latency and COM calls per script call
+	@rtype: Dict[str, Any]
+	"""
+	totals = [sum(sample.calls.values()) for sample in samples]
+	methods: Dict[str, int] = {}
+	for sample in samples:
+		for method, count in sample.calls.items():
+			methods[method] = methods.get(method, 0) + count
+	announced = [sample.announcement for sample in samples if sample.announcement is not None]
+	return {
+		"samples": len(samples),
+		"latency": distribution([sample.latency for sample in samples]),
+		"announcement": distribution(announced),
+		"comCalls": {
+			"mean": sum(totals) / len(totals) if totals else 0.0,
+			"max": max(totals, default=0),
+			"methods": {method: count / len(samples) for method, count in sorted(methods.items())},
+		},
+	}
+
+
+class Bench(object):
+	"""GlobalPlugin running against the simulated audio backend with the specified numbers of devices and sessions."""
+
+	def __init__(self, devices: int, sessions: int) -> None:
+		"""Create the simulated backend and the instance of the global plugin.
+		@param devices: the number of simulated audio devices
+		@type devices: int
+		@param sessions: the number of simulated audio sessions
+		@type sessions: int
+		"""
+		from volumeAdjustment import GlobalPlugin, audiocore
+		from simulated import SimulatedBackend
+
+		self.audiocore = audiocore
+		self.backend = SimulatedBackend(devices=devices, sessions=sessions, seed=0)
+		audiocore.useBackend(self.backend)
+		stubs.outputDevices[1:] = [
+			stubs.AudioOutputDevice(id, name) for id, name in self.backend.deviceNames.items()
+		]
+		self.plugin = GlobalPlugin()
+		audiocore.devices.scan(audiocore.cfg.devices, delay=0.0).result(timeout=30.0)
+		# The focused application is the last started process that plays sound
+		session = self.backend.sessions[-1]
+		# The registry replaces polling only after its notifications are delivered
+		audiocore.sessionsRegistry.source.emitStateChanged(session, 1)
+		stubs.focus.appModule.appName = os.path.splitext(session.Process.name())[0]
+		stubs.focus.processID = session.ProcessId
+		self.gesture = stubs.placeholder("InputGesture")()
+
+	def followFocus(self) -> None:
+		"""Select the audio session of the focused application at half volume."""
+		self.plugin._index = -1
+		source = self.audiocore.sessionsPool.get(stubs.focus.appModule.appName, pid=stubs.focus.processID)
+		source.volumeLevel = 0.5
+
+	def selectDefaultDevice(self) -> None:
+		"""Select the default audio device."""
+		self.plugin._index = 0
+
+	def setup(self, script: str) -> Callable[[], None]:
+		"""The preparation performed before each call of the script, it is not measured.
+		@param script: the name of the script without the "script_" prefix
+		@type script: str
+		@return: the function preparing the state of the global plugin
+		@rtype: Callable[[], None]
+		"""
+		return {
+			"volumeUp": self.followFocus,
+			"mute": self.followFocus,
+			"channelVolumeAverage": self.selectDefaultDevice,
+		}.get(script, lambda: None)
+
+	def measure(self, script: str, iterations: int, warmup: int) -> List[Sample]:
+		"""Call the script repeatedly and measure each call.
+		@param script: the name of the script without the "script_" prefix
+		@type script: str
+		@param iterations: the number of measured calls
+		@type iterations: int
+		@param warmup: the number of calls performed before the measurements
+		@type warmup: int
+		@return: measurements of the script calls
+		@rtype: List[Sample]
+		"""
+		method = getattr(self.plugin, "script_" + script)
+		setup = self.setup(script)
+		samples: List[Sample] = []
+		for i in range(warmup + iterations):
+			setup()
+			self.backend.resetCalls()
+			stubs.speech.clear()
+			started = perf_counter()
+			method(self.gesture)
+			finished = perf_counter()
+			calls = self.backend.calls
+			spoken = stubs.speech.firstAt
+			# Pending volume steps are written outside of the measured interval
+			self.audiocore.volumeSteps.flush()
+			if i >= warmup:
+				samples.append(Sample(finished - started, spoken - started if spoken else None, calls))
+		return samples
+
+	def account(self, script: str, iterations: int, budget: Optional[int]) -> Dict[str, Any]:
+		"""Count the COM calls of the script with the accounting layer of the add-on.
+		The calls are counted in a separate pass, so the accounting does not affect the measured latency.
+		@param script: the name of the script without the "script_" prefix
+		@type script: str
+		@param iterations: the number of calls of the script
+		@type iterations: int
+		@param budget: the maximum number of COM calls per invocation or None if it is not limited
+		@type budget: Optional[int]
+		@return: COM calls per invocation, calls of each method and exceeded budgets
+		@rtype: Dict[str, Any]
+		"""
+		from volumeAdjustment.comcalls import accounting
+
+		method = getattr(self.plugin, "script_" + script)
+		setup = self.setup(script)
+		counts: List[int] = []
+		methods: Dict[str, int] = {}
+		violations: List[str] = []
+		accounting.enabled = True
+		try:
+			for i in range(iterations):
+				setup()
+				accounting.reset()
+				method(self.gesture)
+				counts.append(accounting.calls(script))
+				for name, (count, seconds) in accounting.table().get(script, {}).items():
+					methods[name] = methods.get(name, 0) + count
+				if budget is not None:
+					violations.extend(accounting.exceeded({script: budget}))
+				self.audiocore.volumeSteps.flush()
+		finally:
+			accounting.enabled = False
+			accounting.reset()
+		return {
+			"mean": sum(counts) / len(counts) if counts else 0.0,
+			"max": max(counts, default=0),
+			"budget": budget,
+			"methods": {name: count / len(counts) for name, count in sorted(methods.items())},
+			"violations": sorted(set(violations)),
+		}
+
+	def close(self) -> None:
+		"""Terminate the global plugin."""
+		self.plugin.terminate()
+
+
+def run(
+	devices: Sequence[int], sessions: Sequence[int], iterations: int, warmup: int
+) -> List[Dict[str, Any]]:
+	"""Measure all benchmarked scripts for each combination of the numbers of devices and sessions.
+	@return: summary of the measurements of each script
+	@rtype: List[Dict[str, Any]]
+	"""
+	results: List[Dict[str, Any]] = []
+	for deviceCount in devices:
+		for sessionCount in sessions:
+			bench = Bench(deviceCount, sessionCount)
+			try:
+				for script in SCRIPTS:
+					gc.collect()
+					samples = bench.measure(script, iterations, warmup)
+					accounted = bench.account(script, min(iterations, 20), BUDGETS.get(script))
+					results.append(
+						{"devices": deviceCount, "sessions": sessionCount, "script": script}
+						| summarize(samples)
+						| {"accounted": accounted}
+					)
+			finally:
+				bench.close()
+	return results
+
+
+def compare(
+	results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float, noise: float
+) -> List[str]:
+	"""Find the scripts which became slower or make more COM calls than in the baseline.
+	@param results: the current measurements
+	@type results: List[Dict[str, Any]]
+	@param baseline: the stored measurements
+	@type baseline: List[Dict[str, Any]]
+	@param threshold: allowed growth of the latency percentiles in percent
+	@type threshold: float
+	@param noise: the growth in milliseconds which is never reported
+	@type noise: float
+	@return: descriptions of the regressions
+	@rtype: List[str]
+	"""
+	stored = {(item["devices"], item["sessions"], item["script"]): item for item in baseline}
+	regressions: List[str] = []
+	for item in results:
+		previous = stored.get((item["devices"], item["sessions"], item["script"]))
+		if previous is None:
+			continue
+		point = "%s (%d devices, %d sessions)" % (item["script"], item["devices"], item["sessions"])
+		for rank in ("p50", "p95", "p99"):
+			current, before = item["latency"][rank], previous["latency"][rank]
+			if current > before * (1.0 + threshold / 100.0) and current - before > noise:
+				regressions.append(
+					"%s: %s latency %.3f ms, baseline %.3f ms (+%.0f%%)"
+					% (point, rank, current, before, (current / before - 1.0) * 100.0 if before else 100.0)
+				)
+		if item["comCalls"]["max"] > previous["comCalls"]["max"]:
+			regressions.append(
+				"%s: up to %d COM calls, baseline %d"
+				% (point, item["comCalls"]["max"], previous["comCalls"]["max"])
+			)
+	return regressions
+
+
+def report(results: List[Dict[str, Any]]) -> str:
+	"""Format the measurements as a text table.
+	@param results: summary of the measurements
+	@type results: List[Dict[str, Any]]
+	@return: the table with one line for each script
+	@rtype: str
+	"""
+	lines = [
+		"%-22s %7s %8s %9s %9s %9s %9s %9s %9s"
+		% ("script", "devices", "sessions", "p50 ms", "p95 ms", "p99 ms", "speak ms", "COM max", "counted")
+	]
+	for item in results:
+		lines.append(
+			"%-22s %7d %8d %9.3f %9.3f %9.3f %9.3f %9d %9d"
+			% (
+				item["script"],
+				item["devices"],
+				item["sessions"],
+				item["latency"]["p50"],
+				item["latency"]["p95"],
+				item["latency"]["p99"],
+				item["announcement"]["p50"],
+				item["comCalls"]["max"],
+				item["accounted"]["max"],
+			)
+		)
+	return "\n".join(lines)
+
+
+def parse(argv: Optional[Sequence[str]] = None) -> Namespace:
+	"""Parse the command line arguments.
+	@return: the options of the benchmark
+	@rtype: Namespace
+	"""
+	parser = ArgumentParser(
+		description="Latency of the Volume Adjustment gestures with the simulated audio backend"
+	)
+	parser.add_argument("--devices", type=int, nargs="+", default=[1, 4], help="numbers of audio devices")
+	parser.add_argument(
+		"--sessions", type=int, nargs="+", default=[10, 100, 500], help="numbers of audio sessions"
+	)
+	parser.add_argument("--iterations", type=int, default=200, help="measured calls of each script")
+	parser.add_argument("--warmup", type=int, default=20, help="calls of each script before the measurements")
+	parser.add_argument("--output", default="gestures.json", help="file to save the results as JSON")
+	parser.add_argument("--baseline", help="file with the stored results to compare against")
+	parser.add_argument("--threshold", type=float, default=20.0, help="allowed latency growth in percent")
+	parser.add_argument(
+		"--noise", type=float, default=0.05, help="latency growth in ms which is never reported"
+	)
+	parser.add_argument(
+		"--update-baseline", action="store_true", help="store the results as the new baseline"
+	)
+	return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""Run the benchmark, save the results and compare them against the baseline.
+	@return: exit code, 1 if regressions have been found
+	@rtype: int
+	"""
+	args = parse(argv)
+	with TemporaryDirectory() as configPath:
+		stubs.install(configPath)
+		results = run(args.devices, args.sessions, args.iterations, args.warmup)
+	document = {
+		"created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"iterations": args.iterations,
+		"results": results,
+	}
+	print(report(results))
+	with open(args.output, "w", encoding="utf-8") as f:
+		json.dump(document, f, indent="\t")
+	violations = [
+		"%s (%d devices, %d sessions): %s" % (item["script"], item["devices"], item["sessions"], violation)
+		for item in results
+		for violation in item["accounted"]["violations"]
+	]
+	for violation in violations:
+		print("BUDGET " + violation)
+	if not args.baseline:
+		return 1 if violations else 0
+	if args.update_baseline or not os.path.isfile(args.baseline):
+		with open(args.baseline, "w", encoding="utf-8") as f:
+			json.dump(document, f, indent="\t")
+		print("Baseline saved to %s" % args.baseline)
+		return 1 if violations else 0
+	with open(args.baseline, encoding="utf-8") as f:
+		baseline = json.load(f)
+	regressions = compare(results, baseline["results"], args.threshold, args.noise)
+	for regression in regressions:
+		print("REGRESSION " + regression)
+	if not regressions:
+		print("No regressions against %s" % args.baseline)
+	return 1 if regressions or violations else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
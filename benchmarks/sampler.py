@@ -0,0 +1,181 @@
+# sampler.py
+# Overhead of the background sampler of audio meters with hundreds of audio sessions
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Measure one sample of all audio meters and the CPU share of the background sampler.
+The sample is measured with the in-memory meter source, which shows the cost of the ring buffers,
+and with the meter source of the add-on reading the metered sessions of the simulated audio backend.
+The background run checks that the sampler stays within its CPU budget and pauses when nothing is audible.
+
+Usage:
+	python benchmarks/sampler.py --sessions 100 300 1000 --samples 200 --seconds 2
+"""
+
+from __future__ import annotations
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from tempfile import TemporaryDirectory
+from time import monotonic, perf_counter, sleep
+from typing import Any, Dict, List, Optional, Sequence
+
+import stubs
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "addon", "globalPlugins"))
+
+# The maximum share of one CPU core allowed for the background sampler
+BUDGET: float = 0.02
+
+
+def timeSamples(sampler: Any, samples: int) -> Dict[str, float]:
+	"""Take the samples on the calling thread and measure each of them.
+	@param sampler: the sampler of audio meters
+	@type sampler: audiocore.PeakMeterSampler
+	@param samples: the number of samples
+	@type samples: int
+	@return: mean and p95 duration of one sample in milliseconds
+	@rtype: Dict[str, float]
+	"""
+	durations: List[float] = []
+	for i in range(samples):
+		started = perf_counter()
+		sampler.sampleOnce()
+		durations.append((perf_counter() - started) * 1000.0)
+	durations.sort()
+	return {
+		"mean": sum(durations) / len(durations),
+		"p95": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+	}
+
+
+def measure(sessions: int, samples: int, seconds: float) -> Dict[str, Any]:
+	"""Measure the sampler for the specified number of audio sessions.
+	@param sessions: the number of metered audio sessions
+	@type sessions: int
+	@param samples: the number of measured samples
+	@type samples: int
+	@param seconds: the duration of the background run in seconds
+	@type seconds: float
+	@return: duration of samples, simulated COM calls, CPU share and the state of the paused sampler
+	@rtype: Dict[str, Any]
+	"""
+	from volumeAdjustment import audiocore
+	from simulated import FakeMeterSource, SimulatedBackend
+
+	fake = FakeMeterSource(count=sessions)
+	inMemory = timeSamples(audiocore.PeakMeterSampler(fake), samples)
+
+	backend = SimulatedBackend(devices=1, sessions=sessions, seed=0)
+	audiocore.useBackend(backend)
+	sampler = audiocore.PeakMeterSampler(audiocore.WASAPIMeterSource())
+	# The meters are requested when the sessions are enumerated, they do not belong to the measured samples
+	sampler.sampleOnce()
+	backend.resetCalls()
+	metered = timeSamples(sampler, samples)
+	calls = backend.totalCalls / samples
+
+	# A sound is playing in one of the sessions, the sampler polls at the fast interval
+	fake.setPeak("source0", 0.5)
+	sampler = audiocore.PeakMeterSampler(
+		fake, interval=0.01, idleInterval=0.2, budget=BUDGET, pauseAfter=seconds / 4.0
+	)
+	started = monotonic()
+	sampler.start()
+	sleep(seconds / 2.0)
+	share = sampler.cpuTime / (monotonic() - started)
+	# Nothing is audible, the sampler must slow down and pause
+	fake.silence()
+	sleep(seconds / 2.0)
+	paused = sampler.isPaused
+	before = sampler.samples
+	sleep(0.2)
+	idle = sampler.samples - before
+	fake.setPeak("source0", 0.5)
+	requested = perf_counter()
+	refreshed = sampler.refresh()
+	refresh = (perf_counter() - requested) * 1000.0
+	sampler.stop()
+	return {
+		"sessions": sessions,
+		"fake": inMemory,
+		"metered": metered,
+		"comCalls": calls,
+		"cpuShare": share,
+		"paused": paused,
+		"idleSamples": idle,
+		"refreshed": refreshed,
+		"refreshMs": refresh,
+	}
+
+
+def parse(argv: Optional[Sequence[str]] = None) -> Namespace:
+	"""Parse the command line arguments.
+	@return: the options of the benchmark
+	@rtype: Namespace
+	"""
+	parser = ArgumentParser(description="Overhead of the background sampler of audio meters")
+	parser.add_argument(
+		"--sessions", type=int, nargs="+", default=[100, 300, 1000], help="numbers of metered audio sessions"
+	)
+	parser.add_argument(
+		"--samples", type=int, default=200, help="measured samples for each number of sessions"
+	)
+	parser.add_argument("--seconds", type=float, default=2.0, help="duration of the background run")
+	return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""Run the benchmark and print the results.
+	@return: exit code, 1 if the sampler exceeded its CPU budget, did not pause or was not refreshed
+	@rtype: int
+	"""
+	args = parse(argv)
+	with TemporaryDirectory() as configPath:
+		stubs.install(configPath)
+		results = [measure(sessions, args.samples, args.seconds) for sessions in args.sessions]
+	print(
+		"%8s %10s %10s %10s %10s %8s %8s %7s %6s %11s"
+		% (
+			"sessions",
+			"fake ms",
+			"fake p95",
+			"meter ms",
+			"meter p95",
+			"COM",
+			"CPU %",
+			"paused",
+			"idle",
+			"refresh ms",
+		)
+	)
+	failed = False
+	for item in results:
+		print(
+			"%8d %10.3f %10.3f %10.3f %10.3f %8.1f %8.2f %7s %6d %11.3f"
+			% (
+				item["sessions"],
+				item["fake"]["mean"],
+				item["fake"]["p95"],
+				item["metered"]["mean"],
+				item["metered"]["p95"],
+				item["comCalls"],
+				item["cpuShare"] * 100.0,
+				"yes" if item["paused"] else "no",
+				item["idleSamples"],
+				item["refreshMs"],
+			)
+		)
+		# The interval is adapted after each sample, so the first samples may exceed the budget a little
+		if item["cpuShare"] > BUDGET * 1.5 or not item["paused"] or item["idleSamples"] > 1:
+			failed = True
+		if not item["refreshed"]:
+			failed = True
+	return 1 if failed else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
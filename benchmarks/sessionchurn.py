@@ -0,0 +1,160 @@
+# sessionchurn.py
+# Replay of the churn of audio sessions through the in-memory emitter of session notifications
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Create, activate and expire audio sessions at random while the gestures read the list of audio sessions.
+Each read is served by the registry of audio sessions and compared with the enumeration of all sessions,
+which the add-on performed on each gesture before the registry was introduced.
+
+Usage:
+	python benchmarks/sessionchurn.py --sessions 50 500 --events 5000
+"""
+
+from __future__ import annotations
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import stubs
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "addon", "globalPlugins"))
+
+
+def replay(sessions: int, events: int, seed: int) -> Dict[str, Any]:
+	"""Emit the random notifications and read the list of audio sessions after each of them.
+	@param sessions: the number of audio sessions which exist before the registry is started
+	@type sessions: int
+	@param events: the number of emitted notifications
+	@type events: int
+	@param seed: the seed of the random generator
+	@type seed: int
+	@return: time per notification and per read, simulated COM calls per read and detected mismatches
+	@rtype: Dict[str, Any]
+	"""
+	from volumeAdjustment import audiocore
+	from simulated import SimulatedBackend
+
+	backend = SimulatedBackend(devices=1, sessions=sessions, seed=seed)
+	audiocore.useBackend(backend)
+	registry = audiocore.sessionsRegistry
+	source = registry.source
+	if not registry.start():
+		raise RuntimeError("Unable to start the registry of audio sessions")
+	generator = Random(seed)
+	created = sessions
+	handled = read = polled = 0.0
+	readCalls = polledCalls = 0
+	mismatches: List[str] = []
+	for i in range(events):
+		kind = generator.random()
+		started = perf_counter()
+		if kind < 0.4 or not backend.sessions:
+			session = backend.addSession("churn%d.exe" % created)
+			created += 1
+			source.emitCreated(session)
+		elif kind < 0.75:
+			session = generator.choice(backend.sessions)
+			backend.removeSession(session)
+			source.emitExpired(session)
+		else:
+			session = generator.choice(backend.sessions)
+			session.state = generator.randrange(2)
+			source.emitStateChanged(session, session.state)
+		handled += perf_counter() - started
+
+		backend.resetCalls()
+		started = perf_counter()
+		names = audiocore.sessionsCache.snapshot().names
+		read += perf_counter() - started
+		readCalls += backend.totalCalls
+
+		backend.resetCalls()
+		started = perf_counter()
+		expected = audiocore.AudioSessionsSnapshot.fromSessions(backend.getAllSessions()).names
+		polled += perf_counter() - started
+		polledCalls += backend.totalCalls
+		if sorted(names) != sorted(expected):
+			mismatches.append(
+				"event %d: %d sessions in the registry, %d enumerated" % (i, len(names), len(expected))
+			)
+	registry.stop()
+	return {
+		"sessions": sessions,
+		"events": events,
+		"eventUs": handled / events * 1e6,
+		"registry": {"us": read / events * 1e6, "comCalls": readCalls / events},
+		"polling": {"us": polled / events * 1e6, "comCalls": polledCalls / events},
+		"final": len(backend.sessions),
+		"mismatches": mismatches,
+	}
+
+
+def parse(argv: Optional[Sequence[str]] = None) -> Namespace:
+	"""Parse the command line arguments.
+	@return: the options of the benchmark
+	@rtype: Namespace
+	"""
+	parser = ArgumentParser(
+		description="Churn of audio sessions: registry updated by notifications and polling"
+	)
+	parser.add_argument(
+		"--sessions", type=int, nargs="+", default=[50, 500], help="initial numbers of audio sessions"
+	)
+	parser.add_argument("--events", type=int, default=5000, help="emitted notifications for each run")
+	parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+	return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""Run the benchmark and print the results.
+	@return: exit code, 1 if the registry has ever differed from the enumerated audio sessions
+	@rtype: int
+	"""
+	args = parse(argv)
+	with TemporaryDirectory() as configPath:
+		stubs.install(configPath)
+		results = [replay(sessions, args.events, args.seed) for sessions in args.sessions]
+	print(
+		"%8s %8s %10s %12s %12s %12s %12s %8s %9s"
+		% (
+			"sessions",
+			"events",
+			"event us",
+			"registry us",
+			"polling us",
+			"registry COM",
+			"polling COM",
+			"final",
+			"mismatch",
+		)
+	)
+	for item in results:
+		print(
+			"%8d %8d %10.3f %12.3f %12.3f %12.1f %12.1f %8d %9d"
+			% (
+				item["sessions"],
+				item["events"],
+				item["eventUs"],
+				item["registry"]["us"],
+				item["polling"]["us"],
+				item["registry"]["comCalls"],
+				item["polling"]["comCalls"],
+				item["final"],
+				len(item["mismatches"]),
+			)
+		)
+		for mismatch in item["mismatches"][:10]:
+			print("MISMATCH " + mismatch)
+	return 1 if any(item["mismatches"] for item in results) else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
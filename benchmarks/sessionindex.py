@@ -0,0 +1,179 @@
+# sessionindex.py
+# Micro-benchmark of the lookup of audio sessions by the name of the process
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Compare the original linear search of the audio session by the process name with AudioSessionsIndex.
+Both lookups run against the same synthetic audio sessions of the simulated audio backend.
+
+Usage:
+	python benchmarks/sessionindex.py --sessions 1000 --lookups 2000
+"""
+
+from __future__ import annotations
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import stubs
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "addon", "globalPlugins"))
+
+
+def linearSelect(sessions: List[Any], name: str) -> Any:
+	"""The lookup performed by VAAudioSession.selectAudioSession before the index was introduced.
+	@param sessions: all audio sessions
+	@type sessions: List[Any]
+	@param name: full name or part of the process name
+	@type name: str
+	@return: the audio session of the process, the NVDA session or the first session
+	@rtype: Any
+	"""
+	return next(
+		filter(lambda s: name.lower() in s.Process.name().lower(), sessions),
+		next(filter(lambda s: "nvda.exe" in s.Process.name().lower(), sessions), sessions[0]),
+	)
+
+
+def queries(count: int, sessions: int, seed: int) -> List[str]:
+	"""Names requested by the gestures: full names, names without extension, parts of names and unknown processes.
+	@param count: the number of names
+	@type count: int
+	@param sessions: the number of simulated audio sessions
+	@type sessions: int
+	@param seed: the seed of the random generator
+	@type seed: int
+	@return: names to look up
+	@rtype: List[str]
+	"""
+	generator = Random(seed)
+	names: List[str] = []
+	for i in range(count):
+		number = generator.randrange(sessions)
+		names.append(
+			(
+				"process%d.exe" % number,
+				"Process%d" % number,
+				"process%d" % number,
+				"ss%d.exe" % number,
+				"missing%d" % i,
+				"chrome.exe",
+				"Chrome",
+			)[i % 7]
+		)
+	return names
+
+
+def measure(sessions: int, lookups: int, seed: int) -> Dict[str, Any]:
+	"""Run both lookups for the same names and check that they select the same audio sessions.
+	@param sessions: the number of simulated audio sessions
+	@type sessions: int
+	@param lookups: the number of looked up names
+	@type lookups: int
+	@param seed: the seed of the random generator
+	@type seed: int
+	@return: time and simulated COM calls per lookup of both implementations
+	@rtype: Dict[str, Any]
+	"""
+	from volumeAdjustment import audiocore
+	from simulated import SimulatedBackend
+
+	backend = SimulatedBackend(devices=1, sessions=sessions, seed=seed)
+	# The full name of the later process is a part of the name of the earlier one
+	backend.addSession("googlechrome.exe")
+	backend.addSession("chrome.exe")
+	# The fallback session when the process is not found
+	backend.addSession("nvda.exe")
+	audiocore.useBackend(backend)
+	names = queries(lookups, sessions, seed)
+	enumerated = backend.getAllSessions()
+
+	backend.resetCalls()
+	started = perf_counter()
+	expected = [linearSelect(enumerated, name) for name in names]
+	linear = perf_counter() - started
+	linearCalls = backend.totalCalls
+
+	backend.resetCalls()
+	started = perf_counter()
+	snapshot = audiocore.AudioSessionsSnapshot.fromSessions(enumerated)
+	index = snapshot.index
+	built = perf_counter() - started
+	buildCalls = backend.totalCalls
+	backend.resetCalls()
+	started = perf_counter()
+	positions = [index.select(name) for name in names]
+	indexed = perf_counter() - started
+	indexedCalls = backend.totalCalls
+
+	mismatches = sum(1 for session, position in zip(expected, positions) if snapshot[position] is not session)
+	return {
+		"sessions": sessions + 3,
+		"lookups": lookups,
+		"linear": {"us": linear / lookups * 1e6, "comCalls": linearCalls / lookups},
+		"index": {
+			"us": indexed / lookups * 1e6,
+			"comCalls": indexedCalls / lookups,
+			"buildMs": built * 1000.0,
+			"buildComCalls": buildCalls,
+		},
+		"speedup": linear / indexed if indexed else 0.0,
+		"mismatches": mismatches,
+	}
+
+
+def parse(argv: Optional[Sequence[str]] = None) -> Namespace:
+	"""Parse the command line arguments.
+	@return: the options of the benchmark
+	@rtype: Namespace
+	"""
+	parser = ArgumentParser(
+		description="Lookup of audio sessions by the process name: linear search and index"
+	)
+	parser.add_argument("--sessions", type=int, nargs="+", default=[1000], help="numbers of audio sessions")
+	parser.add_argument(
+		"--lookups", type=int, default=2000, help="looked up names for each number of sessions"
+	)
+	parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+	return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""Run the benchmark and print the results.
+	@return: exit code, 1 if the index selected other audio sessions than the linear search
+	@rtype: int
+	"""
+	args = parse(argv)
+	with TemporaryDirectory() as configPath:
+		stubs.install(configPath)
+		results = [measure(sessions, args.lookups, args.seed) for sessions in args.sessions]
+	print(
+		"%8s %12s %12s %12s %12s %10s %9s %10s"
+		% ("sessions", "linear us", "index us", "linear COM", "index COM", "build ms", "speedup", "mismatch")
+	)
+	for item in results:
+		print(
+			"%8d %12.3f %12.3f %12.1f %12.1f %10.3f %8.1fx %10d"
+			% (
+				item["sessions"],
+				item["linear"]["us"],
+				item["index"]["us"],
+				item["linear"]["comCalls"],
+				item["index"]["comCalls"],
+				item["index"]["buildMs"],
+				item["speedup"],
+				item["mismatches"],
+			)
+		)
+	return 1 if any(item["mismatches"] for item in results) else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,771 @@
+# simulated.py
+# In-memory audio backend and emitters of notifications used to measure the add-on without Windows
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Simulated audio devices, audio sessions and peak meters with the interfaces of pycaw and comtypes.
+The module imports the add-on, so the stubs of NVDA modules must be installed before it is imported.
+"""
+
+from __future__ import annotations
+from random import Random
+from threading import Lock
+from time import monotonic, sleep
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from pycaw.constants import AudioSessionState
+from pycaw.utils import AudioSession
+from volumeAdjustment.audiocore import (
+	AudioSessionsRegistry,
+	DeviceNotificationSource,
+	MeterSource,
+	SessionNotificationSource,
+	VAAudioDevice,
+	VAAudioDevices,
+)
+from volumeAdjustment.backends import AudioBackend, AudioEndpoint
+
+
+class FakeSessionNotificationSource(SessionNotificationSource):
+	"""In-memory emitter of notifications that allows to replay the churn of audio sessions without WASAPI.
+	Any objects which provide the InstanceIdentifier and Process attributes can be used as audio sessions.
+	"""
+
+	def __init__(self, sessions: Optional[List[AudioSession]] = None) -> None:
+		"""Initial set of audio sessions.
+		@param sessions: audio sessions which exist before subscription
+		@type sessions: Optional[List[pycaw.AudioSession]]
+		"""
+		self._sessions: List[AudioSession] = list(sessions or [])
+		self._registry: Optional[AudioSessionsRegistry] = None
+
+	def start(self, registry: AudioSessionsRegistry) -> List[AudioSession]:
+		"""Remember the registry that will receive emitted notifications.
+		@param registry: the receiver of notifications
+		@type registry: AudioSessionsRegistry
+		@return: audio sessions which already exist at the moment of subscription
+		@rtype: List[pycaw.AudioSession]
+		"""
+		self._registry = registry
+		return list(self._sessions)
+
+	def stop(self) -> None:
+		"""Stop delivering notifications."""
+		self._registry = None
+
+	def emitCreated(self, session: AudioSession) -> None:
+		"""Emulate the creation of a new audio session.
+		@param session: the newly created audio session
+		@type session: pycaw.AudioSession
+		"""
+		self._sessions.append(session)
+		self._registry and self._registry.sessionCreated(session)
+
+	def emitStateChanged(self, session: AudioSession, state: int) -> None:
+		"""Emulate the change of the audio session state.
+		@param session: the observed audio session
+		@type session: pycaw.AudioSession
+		@param state: 0 - inactive, 1 - active, 2 - expired
+		@type state: int
+		"""
+		if state == AudioSessionState.Expired:
+			self.emitExpired(session)
+		elif self._registry:
+			self._registry.sessionStateChanged(session, state)
+
+	def emitExpired(self, session: AudioSession) -> None:
+		"""Emulate the expiration or disconnection of the audio session.
+		@param session: the expired audio session
+		@type session: pycaw.AudioSession
+		"""
+		try:
+			self._sessions.remove(session)
+		except ValueError:
+			pass
+		self._registry and self._registry.sessionExpired(session)
+
+	def emitVolumeChanged(self, session: AudioSession, level: float, muted: bool, context=None) -> None:
+		"""Emulate the change of the volume level or the mute state of the audio session.
+		@param session: the observed audio session
+		@type session: pycaw.AudioSession
+		@param level: the new volume level
+		@type level: float [0.0..1.0]
+		@param muted: the new mute state
+		@type muted: bool
+		@param context: the event context passed by the client which initiated the change
+		"""
+		self._registry and self._registry.sessionVolumeChanged(session, level, muted, context)
+
+
+class FakeDeviceNotificationSource(DeviceNotificationSource):
+	"""In-memory emitter of notifications that allows to replay plug and unplug storms without WASAPI.
+	The notifications are delivered synchronously to the collection of audio devices.
+	"""
+
+	def __init__(
+		self, endpoints: Optional[Dict[str, str]] = None, backend: Optional[SimulatedBackend] = None
+	) -> None:
+		"""Audio endpoints which can be activated by the emitter.
+		@param endpoints: dict with devices in which the key is the ID and the value is the device name
+		@type endpoints: Optional[Dict[str, str]]
+		@param backend: the simulated backend which provides the volume controls of audio devices
+		@type backend: Optional[SimulatedBackend]
+		"""
+		self._endpoints: Dict[str, str] = dict(endpoints or {})
+		self._backend = backend
+		self._devices: Optional[VAAudioDevices] = None
+
+	def start(self, devices: VAAudioDevices) -> None:
+		"""Remember the collection of audio devices that will receive emitted notifications.
+		@param devices: the receiver of notifications
+		@type devices: VAAudioDevices
+		"""
+		self._devices = devices
+
+	def stop(self) -> None:
+		"""Stop delivering notifications."""
+		self._devices = None
+
+	def activate(self, id: str) -> Optional[VAAudioDevice]:
+		"""Create the audio device with the volume controls of the simulated backend if they exist.
+		@param id: audio device ID
+		@type id: str
+		@return: audio device or None if the endpoint is unknown
+		@rtype: Optional[VAAudioDevice]
+		"""
+		if id not in self._endpoints:
+			return None
+		endpoint = self._backend.scanner().device(id) if self._backend else None
+		return VAAudioDevice(id=id, name=self._endpoints[id], volume=endpoint.volume if endpoint else None)
+
+	def emitAdded(self, id: str, name: str) -> None:
+		"""Emulate connection of the audio device.
+		@param id: audio device ID
+		@type id: str
+		@param name: human friendly name of audio device
+		@type name: str
+		"""
+		self._endpoints[id] = name
+		self._devices and self._devices.deviceAdded(id)
+
+	def emitRemoved(self, id: str) -> None:
+		"""Emulate disconnection of the audio device.
+		@param id: audio device ID
+		@type id: str
+		"""
+		self._endpoints.pop(id, None)
+		self._devices and self._devices.deviceRemoved(id)
+
+	def emitStateChanged(self, id: str, state: int) -> None:
+		"""Emulate the change of the audio device state.
+		@param id: audio device ID
+		@type id: str
+		@param state: 1 - active, 2 - disabled, 4 - not present, 8 - unplugged
+		@type state: int
+		"""
+		self._devices and self._devices.deviceStateChanged(id, state)
+
+	def emitDefaultChanged(self, id: str) -> None:
+		"""Emulate the change of the default output audio device.
+		@param id: ID of the new default audio device
+		@type id: str
+		"""
+		self._devices and self._devices.defaultDeviceChanged(id)
+
+
+class FakeMeterSource(MeterSource):
+	"""In-memory meter source that allows to measure the sampler with any number of audio sources."""
+
+	def __init__(self, count: int = 0, peaks: Optional[Dict[str, float]] = None) -> None:
+		"""Create audio sources with the specified peak values.
+		@param count: the number of silent audio sources named source0, source1 etc.
+		@type count: int
+		@param peaks: audio sources with their peak values
+		@type peaks: Optional[Dict[str, float]]
+		"""
+		self._peaks: Dict[str, float] = {"source%d" % i: 0.0 for i in range(count)}
+		self._peaks.update(peaks or {})
+		self._samples: int = 0
+
+	@property
+	def samples(self) -> int:
+		"""The number of times the peak values have been requested.
+		@return: number of samples
+		@rtype: int
+		"""
+		return self._samples
+
+	def setPeak(self, name: str, value: float) -> None:
+		"""Change the peak value of the audio source, the source is added if it does not exist.
+		@param name: name of the audio source
+		@type name: str
+		@param value: the new peak value
+		@type value: float [0.0..1.0]
+		"""
+		self._peaks[name] = value
+
+	def remove(self, name: str) -> None:
+		"""Emulate the disappearance of the audio source.
+		@param name: name of the audio source
+		@type name: str
+		"""
+		self._peaks.pop(name, None)
+
+	def silence(self) -> None:
+		"""Make all audio sources silent."""
+		self._peaks = dict.fromkeys(self._peaks, 0.0)
+
+	def sample(self) -> Dict[str, float]:
+		"""Return the current peak values of all audio sources.
+		@return: peak values keyed by the names of audio sources
+		@rtype: Dict[str, float]
+		"""
+		self._samples += 1
+		return dict(self._peaks)
+
+
+class SimulatedCOMError(OSError):
+	"""The failure injected into a call of the simulated audio backend."""
+
+
+class SimulatedProcess(object):
+	"""Running process which owns the simulated audio session, compatible with psutil.Process."""
+
+	def __init__(self, pid: int, name: str) -> None:
+		"""Identity of the process.
+		@param pid: the process identifier
+		@type pid: int
+		@param name: full name of the process
+		@type name: str
+		"""
+		self.pid: int = pid
+		self._name: str = name
+		self._created: float = monotonic()
+
+	def name(self) -> str:
+		"""The full name of the process.
+		@return: name of the executable file
+		@rtype: str
+		"""
+		return self._name
+
+	def create_time(self) -> float:
+		"""The moment when the process was created.
+		@return: creation time of the process
+		@rtype: float
+		"""
+		return self._created
+
+
+class SimulatedMeter(object):
+	"""Simulated IAudioMeterInformation."""
+
+	def __init__(self, backend: SimulatedBackend) -> None:
+		"""Silent meter.
+		@param backend: the backend that accounts the calls
+		@type backend: SimulatedBackend
+		"""
+		self._backend = backend
+		self.peak: float = 0.0
+
+	def GetPeakValue(self) -> float:
+		"""Simulated GetPeakValue call."""
+		self._backend.call("GetPeakValue")
+		return self.peak
+
+
+class SimulatedSimpleAudioVolume(object):
+	"""Simulated ISimpleAudioVolume of the audio session."""
+
+	def __init__(self, backend: SimulatedBackend, level: float = 1.0) -> None:
+		"""Initial state of the volume controls.
+		@param backend: the backend that accounts the calls
+		@type backend: SimulatedBackend
+		@param level: the initial volume level
+		@type level: float [0.0..1.0]
+		"""
+		self._backend = backend
+		self.level: float = level
+		self.muted: bool = False
+
+	def GetMasterVolume(self) -> float:
+		"""Simulated GetMasterVolume call."""
+		self._backend.call("GetMasterVolume")
+		return self.level
+
+	def SetMasterVolume(self, level: float, context: Any) -> None:
+		"""Simulated SetMasterVolume call."""
+		self._backend.call("SetMasterVolume")
+		self.level = level
+
+	def GetMute(self) -> int:
+		"""Simulated GetMute call."""
+		self._backend.call("GetMute")
+		return int(self.muted)
+
+	def SetMute(self, muted: bool, context: Any) -> None:
+		"""Simulated SetMute call."""
+		self._backend.call("SetMute")
+		self.muted = bool(muted)
+
+
+class SimulatedEndpointVolume(object):
+	"""Simulated IAudioEndpointVolume of the audio device with control change notifications."""
+
+	def __init__(self, backend: SimulatedBackend, channels: int = 2, level: float = 1.0) -> None:
+		"""Initial state of the volume controls.
+		@param backend: the backend that accounts the calls
+		@type backend: SimulatedBackend
+		@param channels: the number of channels
+		@type channels: int
+		@param level: the initial volume level of all channels
+		@type level: float [0.0..1.0]
+		"""
+		self._backend = backend
+		self.channels: List[float] = [level] * channels
+		self.muted: bool = False
+		self._callbacks: List[Any] = []
+
+	@property
+	def level(self) -> float:
+		"""The master volume level derived from the loudest channel.
+		@return: master volume level
+		@rtype: float
+		"""
+		return max(self.channels, default=0.0)
+
+	def _notify(self, context: Any) -> None:
+		"""Deliver the new state to the registered callbacks like IAudioEndpointVolumeCallback::OnNotify.
+		@param context: the event context passed by the client which initiated the change
+		"""
+		for callback in list(self._callbacks):
+			callback.on_notify(self.level, int(self.muted), context, len(self.channels), list(self.channels))
+
+	def GetMasterVolumeLevelScalar(self) -> float:
+		"""Simulated GetMasterVolumeLevelScalar call."""
+		self._backend.call("GetMasterVolumeLevelScalar")
+		return self.level
+
+	def SetMasterVolumeLevelScalar(self, level: float, context: Any) -> None:
+		"""Simulated SetMasterVolumeLevelScalar call."""
+		self._backend.call("SetMasterVolumeLevelScalar")
+		top = self.level
+		self.channels = [level * channel / top if top else level for channel in self.channels]
+		self._notify(context)
+
+	def GetMute(self) -> int:
+		"""Simulated GetMute call."""
+		self._backend.call("GetMute")
+		return int(self.muted)
+
+	def SetMute(self, muted: bool, context: Any) -> None:
+		"""Simulated SetMute call."""
+		self._backend.call("SetMute")
+		self.muted = bool(muted)
+		self._notify(context)
+
+	def GetChannelCount(self) -> int:
+		"""Simulated GetChannelCount call."""
+		self._backend.call("GetChannelCount")
+		return len(self.channels)
+
+	def GetChannelVolumeLevelScalar(self, channel: int) -> float:
+		"""Simulated GetChannelVolumeLevelScalar call."""
+		self._backend.call("GetChannelVolumeLevelScalar")
+		return self.channels[channel]
+
+	def SetChannelVolumeLevelScalar(self, channel: int, level: float, context: Any) -> None:
+		"""Simulated SetChannelVolumeLevelScalar call."""
+		self._backend.call("SetChannelVolumeLevelScalar")
+		self.channels[channel] = level
+		self._notify(context)
+
+	def RegisterControlChangeNotify(self, callback: Any) -> None:
+		"""Simulated RegisterControlChangeNotify call."""
+		self._backend.call("RegisterControlChangeNotify")
+		self._callbacks.append(callback)
+
+	def UnregisterControlChangeNotify(self, callback: Any) -> None:
+		"""Simulated UnregisterControlChangeNotify call."""
+		self._backend.call("UnregisterControlChangeNotify")
+		self._callbacks.remove(callback)
+
+
+class SimulatedSessionControl(object):
+	"""Simulated IAudioSessionControl2 which provides the peak meter of the audio session."""
+
+	def __init__(self, backend: SimulatedBackend, meter: SimulatedMeter) -> None:
+		"""Remember the peak meter of the audio session.
+		@param backend: the backend that accounts the calls
+		@type backend: SimulatedBackend
+		@param meter: the peak meter of the audio session
+		@type meter: SimulatedMeter
+		"""
+		self._backend = backend
+		self._meter = meter
+
+	def QueryInterface(self, interface: Any) -> SimulatedMeter:
+		"""Simulated QueryInterface call."""
+		self._backend.call("QueryInterface")
+		return self._meter
+
+
+class SimulatedAudioSession(object):
+	"""Simulated audio session compatible with pycaw.AudioSession."""
+
+	def __init__(
+		self, backend: SimulatedBackend, process: SimulatedProcess, instance: str, state: int = 1
+	) -> None:
+		"""Initial state of the audio session.
+		@param backend: the backend that accounts the calls
+		@type backend: SimulatedBackend
+		@param process: the process which owns the audio session
+		@type process: SimulatedProcess
+		@param instance: the session instance identifier
+		@type instance: str
+		@param state: 0 - inactive, 1 - active, 2 - expired
+		@type state: int
+		"""
+		self._backend = backend
+		self._process = process
+		self._instance: str = instance
+		self.state: int = state
+		self.meter = SimulatedMeter(backend)
+		self._ctl = SimulatedSessionControl(backend, self.meter)
+		self._volume = SimulatedSimpleAudioVolume(backend)
+		self._callback: Any = None
+
+	@property
+	def Process(self) -> SimulatedProcess:
+		"""Simulated Process call."""
+		self._backend.call("GetProcessId")
+		return self._process
+
+	@property
+	def ProcessId(self) -> int:
+		"""Simulated ProcessId call."""
+		self._backend.call("GetProcessId")
+		return self._process.pid
+
+	@property
+	def InstanceIdentifier(self) -> str:
+		"""Simulated InstanceIdentifier call."""
+		self._backend.call("GetSessionInstanceIdentifier")
+		return self._instance
+
+	@property
+	def State(self) -> int:
+		"""Simulated State call."""
+		self._backend.call("GetState")
+		return self.state
+
+	@property
+	def DisplayName(self) -> str:
+		"""Simulated DisplayName call."""
+		self._backend.call("GetDisplayName")
+		return ""
+
+	@property
+	def SimpleAudioVolume(self) -> SimulatedSimpleAudioVolume:
+		"""Simulated SimpleAudioVolume call."""
+		self._backend.call("QueryInterface")
+		return self._volume
+
+	def register_notification(self, callback: Any) -> None:
+		"""Simulated RegisterAudioSessionNotification call.
+		@param callback: the receiver of the audio session events
+		@type callback: pycaw.callbacks.AudioSessionEvents
+		"""
+		self._backend.call("RegisterAudioSessionNotification")
+		self._callback = callback
+
+	def unregister_notification(self) -> None:
+		"""Simulated UnregisterAudioSessionNotification call."""
+		self._backend.call("UnregisterAudioSessionNotification")
+		self._callback = None
+
+
+class SimulatedScanner(object):
+	"""Enumerates the simulated audio endpoints, has the interface of audiocore.AudioEndpointsScanner."""
+
+	def __init__(self, backend: SimulatedBackend) -> None:
+		"""Initial state of the scanner.
+		@param backend: the backend that accounts the calls
+		@type backend: SimulatedBackend
+		"""
+		self._backend = backend
+		self._calls: int = 0
+		self._started: float = monotonic()
+
+	@property
+	def comCalls(self) -> int:
+		"""The number of calls made by this scanner.
+		@return: number of calls
+		@rtype: int
+		"""
+		return self._calls
+
+	@property
+	def duration(self) -> float:
+		"""Time elapsed since the scanner was created.
+		@return: duration in seconds
+		@rtype: float
+		"""
+		return monotonic() - self._started
+
+	def _call(self, method: str) -> None:
+		"""Account the call made by the scanner.
+		@param method: name of the simulated COM method
+		@type method: str
+		"""
+		self._calls += 1
+		self._backend.call(method)
+
+	def defaultId(self) -> str:
+		"""ID of the default output audio device.
+		@return: audio device ID
+		@rtype: str
+		"""
+		self._call("GetDefaultAudioEndpoint")
+		return self._backend.defaultDeviceId
+
+	def name(self, id: str) -> str:
+		"""The friendly name of the audio device.
+		@param id: audio device ID
+		@type id: str
+		@return: name of the audio device or empty string if it is unknown
+		@rtype: str
+		"""
+		self._call("GetValue")
+		return self._backend.deviceNames.get(id, "")
+
+	def device(self, id: str) -> Optional[AudioEndpoint]:
+		"""Find the audio device by its ID and activate its volume control interface.
+		@param id: audio device ID
+		@type id: str
+		@return: detected audio endpoint or None if it cannot be activated
+		@rtype: Optional[AudioEndpoint]
+		"""
+		try:
+			self._call("GetDevice")
+			self._call("Activate")
+			volume = self._backend.deviceVolumes[id]
+		except (KeyError, SimulatedCOMError):
+			return None
+		return AudioEndpoint(id=id, name=self.name(id), state=1, volume=volume)
+
+	def meter(self, id: str) -> Optional[SimulatedMeter]:
+		"""Activate the peak meter interface of the audio device.
+		@param id: audio device ID
+		@type id: str
+		@return: the peak meter or None if it cannot be activated
+		@rtype: Optional[SimulatedMeter]
+		"""
+		try:
+			self._call("Activate")
+			return self._backend.deviceMeters[id]
+		except (KeyError, SimulatedCOMError):
+			return None
+
+	def endpoints(
+		self, dataFlow: int = 2, stateMask: int = 1, workers: int = 0, timeout: float = 2.0
+	) -> Iterator[AudioEndpoint]:
+		"""Enumerate the simulated audio endpoints and activate their volume control interfaces.
+		The devices which cannot be activated are skipped.
+		@return: detected audio endpoints
+		@rtype: Iterator[AudioEndpoint]
+		"""
+		self._call("EnumAudioEndpoints")
+		for id in list(self._backend.deviceNames):
+			endpoint = self.device(id)
+			if endpoint is not None:
+				yield endpoint
+
+
+class SimulatedBackend(AudioBackend):
+	"""In-memory audio backend with the configurable number of audio devices and audio sessions.
+	Every simulated COM call can be delayed and can fail with the specified probability,
+	so the behavior of audiocore can be measured without Windows.
+	"""
+
+	def __init__(
+		self,
+		devices: int = 2,
+		sessions: int = 10,
+		channels: int = 2,
+		latency: float = 0.0,
+		jitter: float = 0.0,
+		failureRate: float = 0.0,
+		seed: Optional[int] = None,
+	) -> None:
+		"""Create simulated audio devices and audio sessions.
+		@param devices: the number of audio devices, the first one is the default
+		@type devices: int
+		@param sessions: the number of audio sessions
+		@type sessions: int
+		@param channels: the number of channels of each audio device
+		@type channels: int
+		@param latency: the delay of each call in seconds
+		@type latency: float
+		@param jitter: the maximum random addition to the delay in seconds
+		@type jitter: float
+		@param failureRate: the probability of failure of each call
+		@type failureRate: float [0.0..1.0]
+		@param seed: the seed of the random generator to reproduce failures
+		@type seed: Optional[int]
+		"""
+		self.latency: float = latency
+		self.jitter: float = jitter
+		self.failureRate: float = failureRate
+		self._random = Random(seed)
+		self._lock = Lock()
+		self._calls: Dict[str, int] = {}
+		self._failures: int = 0
+		self._nextPid: int = 1000
+		self.deviceNames: Dict[str, str] = {}
+		self.deviceVolumes: Dict[str, SimulatedEndpointVolume] = {}
+		self.deviceMeters: Dict[str, SimulatedMeter] = {}
+		self.sessions: List[SimulatedAudioSession] = []
+		for i in range(devices):
+			self.addDevice("{0.0.0.00000000}.{simulated-%d}" % i, "Simulated device %d" % i, channels)
+		self.defaultDeviceId: str = next(iter(self.deviceNames), "")
+		for i in range(sessions):
+			self.addSession("process%d.exe" % i)
+
+	@property
+	def calls(self) -> Dict[str, int]:
+		"""The number of calls of each simulated COM method.
+		@return: number of calls keyed by the method name
+		@rtype: Dict[str, int]
+		"""
+		with self._lock:
+			return dict(self._calls)
+
+	@property
+	def totalCalls(self) -> int:
+		"""The number of calls of all simulated COM methods.
+		@return: total number of calls
+		@rtype: int
+		"""
+		with self._lock:
+			return sum(self._calls.values())
+
+	@property
+	def failures(self) -> int:
+		"""The number of injected failures.
+		@return: number of failed calls
+		@rtype: int
+		"""
+		return self._failures
+
+	def resetCalls(self) -> None:
+		"""Reset the counters of calls and failures."""
+		with self._lock:
+			self._calls = {}
+			self._failures = 0
+
+	def call(self, method: str) -> None:
+		"""Account the call of the simulated COM method, inject the latency and failures.
+		@param method: name of the simulated COM method
+		@type method: str
+		@raise SimulatedCOMError: if the failure is injected into this call
+		"""
+		with self._lock:
+			self._calls[method] = self._calls.get(method, 0) + 1
+			delay = self.latency + (self._random.uniform(0.0, self.jitter) if self.jitter else 0.0)
+			failed = self.failureRate > 0.0 and self._random.random() < self.failureRate
+			if failed:
+				self._failures += 1
+		if delay > 0.0:
+			sleep(delay)
+		if failed:
+			raise SimulatedCOMError("Simulated failure of %s" % method)
+
+	def addDevice(self, id: str, name: str, channels: int = 2) -> SimulatedEndpointVolume:
+		"""Connect the new simulated audio device.
+		@param id: audio device ID
+		@type id: str
+		@param name: the friendly name of the audio device
+		@type name: str
+		@param channels: the number of channels
+		@type channels: int
+		@return: volume controls of the audio device
+		@rtype: SimulatedEndpointVolume
+		"""
+		self.deviceNames[id] = name
+		self.deviceMeters[id] = SimulatedMeter(self)
+		volume = self.deviceVolumes[id] = SimulatedEndpointVolume(self, channels)
+		return volume
+
+	def removeDevice(self, id: str) -> None:
+		"""Disconnect the simulated audio device.
+		@param id: audio device ID
+		@type id: str
+		"""
+		self.deviceNames.pop(id, None)
+		self.deviceVolumes.pop(id, None)
+		self.deviceMeters.pop(id, None)
+
+	def addSession(self, name: str, state: int = 1) -> SimulatedAudioSession:
+		"""Start the new simulated process with its audio session.
+		@param name: full name of the process
+		@type name: str
+		@param state: 0 - inactive, 1 - active, 2 - expired
+		@type state: int
+		@return: the new audio session
+		@rtype: SimulatedAudioSession
+		"""
+		self._nextPid += 4
+		process = SimulatedProcess(self._nextPid, name)
+		instance = "simulated|%s|%d" % (name, process.pid)
+		session = SimulatedAudioSession(self, process, instance, state)
+		self.sessions.append(session)
+		return session
+
+	def removeSession(self, session: SimulatedAudioSession) -> None:
+		"""Finish the simulated process of the audio session.
+		@param session: the audio session to remove
+		@type session: SimulatedAudioSession
+		"""
+		try:
+			self.sessions.remove(session)
+		except ValueError:
+			pass
+
+	def getAllSessions(self) -> List[Any]:
+		"""Enumerate all simulated audio sessions.
+		@return: simulated audio sessions
+		@rtype: List[Any]
+		"""
+		self.call("GetSessionEnumerator")
+		return list(self.sessions)
+
+	def pids(self) -> Set[int]:
+		"""Identifiers of the processes of all simulated audio sessions.
+		@return: set of PIDs
+		@rtype: Set[int]
+		"""
+		return {session._process.pid for session in self.sessions}
+
+	def scanner(self) -> SimulatedScanner:
+		"""Create the scanner of simulated audio endpoints.
+		@return: scanner of simulated audio endpoints
+		@rtype: SimulatedScanner
+		"""
+		return SimulatedScanner(self)
+
+	def sessionSource(self) -> FakeSessionNotificationSource:
+		"""Create the emitter of notifications about the simulated audio sessions.
+		@return: in-memory emitter which knows the already existing audio sessions
+		@rtype: FakeSessionNotificationSource
+		"""
+		return FakeSessionNotificationSource(self.getAllSessions())
+
+	def deviceSource(self) -> FakeDeviceNotificationSource:
+		"""Create the emitter of notifications about the simulated audio devices.
+		@return: in-memory emitter which activates the simulated audio devices
+		@rtype: FakeDeviceNotificationSource
+		"""
+		return FakeDeviceNotificationSource(self.deviceNames, self)
@@ -0,0 +1,413 @@
+# stubs.py
+# Minimal replacements of the NVDA modules required to import the add-on outside of NVDA
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from __future__ import annotations
+import builtins
+import logging
+import re
+import sys
+from enum import IntEnum
+from importlib import import_module
+from time import perf_counter
+from types import ModuleType, SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+
+class _Permissive(type):
+	"""Metaclass of the placeholder classes, any missing class attribute is another placeholder."""
+
+	def __getattr__(cls, name: str) -> Any:
+		if name.startswith("__"):
+			raise AttributeError(name)
+		return placeholder(name)
+
+
+class Placeholder(metaclass=_Permissive):
+	"""Object which accepts any arguments and returns another placeholder for any missing attribute or call."""
+
+	def __init__(self, *args, **kwargs) -> None:
+		pass
+
+	def __getattr__(self, name: str) -> Any:
+		if name.startswith("__"):
+			raise AttributeError(name)
+		return Placeholder()
+
+	def __call__(self, *args, **kwargs) -> Any:
+		return Placeholder()
+
+
+def placeholder(name: str) -> type:
+	"""Create the placeholder class which can be instantiated, called and inherited.
+	@param name: the name of the class
+	@type name: str
+	@return: new placeholder class
+	@rtype: type
+	"""
+	return _Permissive(name, (Placeholder,), {})
+
+
+class StubModule(ModuleType):
+	"""Module in which every missing attribute is a placeholder class."""
+
+	def __getattr__(self, name: str) -> Any:
+		if name.startswith("__"):
+			raise AttributeError(name)
+		value = placeholder(name)
+		setattr(self, name, value)
+		return value
+
+
+def module(name: str, **attributes) -> StubModule:
+	"""Register the stub module and all its parent packages in sys.modules.
+	@param name: the full name of the module
+	@type name: str
+	@return: the registered module
+	@rtype: StubModule
+	"""
+	parent: Optional[StubModule] = None
+	for i, part in enumerate(name.split(".")):
+		full = ".".join(name.split(".")[: i + 1])
+		current = sys.modules.get(full)
+		if not isinstance(current, StubModule):
+			current = StubModule(full)
+			current.__path__ = []  # type: ignore
+			sys.modules[full] = current
+		if parent is not None:
+			setattr(parent, part, current)
+		parent = current
+	assert parent is not None
+	for key, value in attributes.items():
+		setattr(parent, key, value)
+	return parent
+
+
+class Action(object):
+	"""Extension point that calls the registered handlers."""
+
+	def __init__(self) -> None:
+		self._handlers: List[Callable] = []
+
+	def register(self, handler: Callable) -> None:
+		self._handlers.append(handler)
+
+	def unregister(self, handler: Callable) -> None:
+		try:
+			self._handlers.remove(handler)
+		except ValueError:
+			pass
+
+	def notify(self, **kwargs) -> None:
+		for handler in list(self._handlers):
+			handler(**kwargs)
+
+
+class ConfigManager(object):
+	"""The NVDA configuration, the sections of add-ons are built from the default values of their specs."""
+
+	_default = re.compile(r"^(\w+)\(.*default=([^,)]*)")
+
+	def __init__(self) -> None:
+		self.spec: Dict[str, Dict[str, str]] = {}
+		self._sections: Dict[str, Dict[str, Any]] = {"audio": {"outputDevice": "default"}}
+		self.lookups: int = 0
+
+	@classmethod
+	def default(cls, spec: str) -> Any:
+		"""Convert the default value of the configobj spec to the Python value.
+		@param spec: configobj spec of the option, e.g. "integer(default=1,min=1,max=20)"
+		@type spec: str
+		@return: the default value of the option
+		@rtype: Any
+		"""
+		match = cls._default.match(spec)
+		if not match:
+			return None
+		kind, value = match.groups()
+		if kind == "boolean":
+			return value.lower() in ("true", "1", "yes", "on")
+		if kind == "integer":
+			return int(value)
+		if kind == "float":
+			return float(value)
+		return value.strip("\"'")
+
+	def __getitem__(self, key: str) -> Dict[str, Any]:
+		self.lookups += 1
+		if key not in self._sections:
+			if key not in self.spec:
+				raise KeyError(key)
+			self._sections[key] = {name: self.default(value) for name, value in self.spec[key].items()}
+		return self._sections[key]
+
+	def reset(self) -> None:
+		"""Return all add-on sections to their default values."""
+		self._sections = {"audio": {"outputDevice": "default"}}
+
+
+class SpeechRecorder(object):
+	"""Collects the messages spoken by the add-on together with the time when they were spoken."""
+
+	def __init__(self) -> None:
+		self.messages: List[Tuple[float, str]] = []
+
+	def message(self, text: str, *args, **kwargs) -> None:
+		self.messages.append((perf_counter(), text))
+
+	def clear(self) -> None:
+		self.messages.clear()
+
+	@property
+	def firstAt(self) -> Optional[float]:
+		"""The time of the first message since the last clearing.
+		@return: value of time.perf_counter or None if nothing has been spoken
+		@rtype: Optional[float]
+		"""
+		return self.messages[0][0] if self.messages else None
+
+
+class CallLater(object):
+	"""Deferred call which runs only when it is fired explicitly, so the measurements are deterministic."""
+
+	# Deferred calls which are started and have been neither fired nor stopped
+	pending: List[CallLater] = []
+
+	def __init__(self, delay: int, callable: Callable, *args, **kwargs) -> None:
+		self._callable = callable
+		self._args = args
+		self._kwargs = kwargs
+		self._running: bool = True
+		self.pending.append(self)
+
+	def Restart(self, delay: Optional[int] = None, *args, **kwargs) -> None:
+		self._running or self.pending.append(self)
+		self._running = True
+
+	def Stop(self) -> None:
+		self._running and self.pending.remove(self)
+		self._running = False
+
+	def IsRunning(self) -> bool:
+		return self._running
+
+	def Notify(self) -> None:
+		if self._running:
+			self.Stop()
+			self._callable(*self._args, **self._kwargs)
+
+	@classmethod
+	def fireAll(cls) -> int:
+		"""Fire all pending deferred calls as if their delays have elapsed.
+		@return: the number of fired calls
+		@rtype: int
+		"""
+		fired = 0
+		while cls.pending:
+			cls.pending[0].Notify()
+			fired += 1
+		return fired
+
+
+class GlobalPlugin(object):
+	"""Base class of the NVDA global plugins, keeps the bound gestures."""
+
+	def __init__(self, *args, **kwargs) -> None:
+		self.gestures: Dict[str, str] = {}
+
+	def bindGesture(self, gestureIdentifier: str, scriptName: str) -> None:
+		self.gestures[gestureIdentifier] = scriptName
+
+	def bindGestures(self, gestureMap: Dict[str, str]) -> None:
+		for gestureIdentifier, scriptName in gestureMap.items():
+			self.bindGesture(gestureIdentifier, scriptName)
+
+	def getScript(self, gesture: Any) -> Optional[Callable]:
+		for identifier in getattr(gesture, "normalizedIdentifiers", ()):
+			scriptName = self.gestures.get(identifier)
+			if scriptName:
+				return getattr(self, "script_" + scriptName, None)
+		return None
+
+	def terminate(self, *args, **kwargs) -> None:
+		pass
+
+
+class AddonError(Exception):
+	"""Raised when the add-on cannot be handled."""
+
+
+class Addon(object):
+	"""The installed add-on, the manifest is filled in from the build variables."""
+
+	def __init__(self, path: str) -> None:
+		self.path = path
+		self.manifest: Dict[str, str] = {"name": "volumeAdjustment", "summary": "Volume Adjustment"}
+
+
+class AudioOutputDevice(object):
+	"""Output audio device listed in the NVDA settings."""
+
+	def __init__(self, id: str, friendlyName: str) -> None:
+		self.id = id
+		self.friendlyName = friendlyName
+
+
+class GUID(object):
+	"""comtypes.GUID represented by its string form."""
+
+	def __init__(self, name: Optional[str] = None) -> None:
+		self._name = (name or "{00000000-0000-0000-0000-000000000000}").upper()
+
+	def __str__(self) -> str:
+		return self._name
+
+	def __eq__(self, other: Any) -> bool:
+		return isinstance(other, GUID) and other._name == self._name
+
+	def __hash__(self) -> int:
+		return hash(self._name)
+
+	@classmethod
+	def create_new(cls) -> GUID:
+		return cls("{%s}" % uuid4())
+
+
+class DEVICE_STATE(IntEnum):
+	ACTIVE = 1
+	DISABLED = 2
+	NOTPRESENT = 4
+	UNPLUGGED = 8
+	MASK_ALL = 15
+
+
+class EDataFlow(IntEnum):
+	eRender = 0
+	eCapture = 1
+	eAll = 2
+
+
+class ERole(IntEnum):
+	eConsole = 0
+	eMultimedia = 1
+	eCommunications = 2
+
+
+class AudioSessionState(IntEnum):
+	Inactive = 0
+	Active = 1
+	Expired = 2
+
+
+def script(**kwargs) -> Callable[[Callable], Callable]:
+	"""Decorator which sets the attributes of the script as in scriptHandler."""
+
+	def decorator(function: Callable) -> Callable:
+		for key, value in kwargs.items():
+			setattr(function, key, value)
+		return function
+
+	return decorator
+
+
+def _optional(name: str) -> bool:
+	"""Check whether the real third-party module can be used.
+	@param name: the name of the module
+	@type name: str
+	@return: whether the module has been imported successfully
+	@rtype: bool
+	"""
+	try:
+		import_module(name)
+	except Exception:
+		for key in [key for key in sys.modules if key == name or key.startswith(name + ".")]:
+			del sys.modules[key]
+		return False
+	return True
+
+
+# Shared instances which are used by the benchmarks to control the environment and inspect the results
+conf = ConfigManager()
+speech = SpeechRecorder()
+focus = SimpleNamespace(appModule=SimpleNamespace(appName=""), processID=None)
+appArgs = SimpleNamespace(secure=False, configPath="")
+outputDevices: List[AudioOutputDevice] = [
+	AudioOutputDevice("", "Microsoft Sound Mapper"),
+	AudioOutputDevice("{simulated-0}", "Simulated device 0"),
+]
+
+
+def install(configPath: str) -> None:
+	"""Register the stubs of NVDA modules and of the Windows-only dependencies which cannot be imported.
+	@param configPath: the directory where the add-on saves its data
+	@type configPath: str
+	"""
+	appArgs.configPath = configPath
+	builtins._ = lambda text: text  # type: ignore
+	log = logging.getLogger("nvda")
+	log.addHandler(logging.NullHandler())
+	log.setLevel(logging.WARNING)
+	log.propagate = False
+	module(
+		"addonHandler",
+		initTranslation=lambda: None,
+		Addon=Addon,
+		AddonError=AddonError,
+	)
+	module(
+		"config",
+		conf=conf,
+		post_configSave=Action(),
+		post_configReset=Action(),
+		post_configProfileSwitch=Action(),
+	)
+	module("core", callLater=CallLater)
+	module("extensionPoints", Action=Action)
+	module("globalVars", appArgs=appArgs)
+	module("globalPluginHandler", GlobalPlugin=GlobalPlugin, reloadGlobalPlugins=lambda: None)
+	module("logHandler", log=log)
+	module(
+		"queueHandler",
+		eventQueue=None,
+		queueFunction=lambda queue, func, *args, **kwargs: func(*args, **kwargs),
+	)
+	module("ui", message=speech.message)
+	module("api", getFocusObject=lambda: focus)
+	module("scriptHandler", script=script)
+	module("inputCore")
+	module("NVDAObjects")
+	module("tones", initialize=lambda: None, terminate=lambda: None)
+	module(
+		"synthDriverHandler", getSynth=lambda: SimpleNamespace(name="oneCore"), setSynth=lambda name: False
+	)
+	module(
+		"utils.mmdevice",
+		AudioOutputDevice=AudioOutputDevice,
+		getOutputDevices=lambda includeDefault=False: list(outputDevices[0 if includeDefault else 1 :]),
+	)
+	module("wx")
+	module("gui.guiHelper")
+	module("gui.nvdaControls")
+	module("gui.settingsDialogs", NVDASettingsDialog=SimpleNamespace(categoryClasses=[]))
+	if not _optional("psutil"):
+		module("psutil", pids=lambda: [])
+	if not _optional("comtypes"):
+		module(
+			"comtypes",
+			CLSCTX_ALL=23,
+			CLSCTX_INPROC_SERVER=1,
+			COINIT_MULTITHREADED=0,
+			GUID=GUID,
+			CoInitializeEx=lambda flags=None: None,
+			CoUninitialize=lambda: None,
+		)
+	if not _optional("pycaw"):
+		module("pycaw.callbacks")
+		module("pycaw.api.endpointvolume")
+		module("pycaw.api.mmdeviceapi.depend.structures")
+		module("pycaw.constants", AudioSessionState=AudioSessionState)
+		module("pycaw.utils", DEVICE_STATE=DEVICE_STATE, EDataFlow=EDataFlow, ERole=ERole)
@@ -0,0 +1,223 @@
+# volumesteps.py
+# Check of the coalescing of auto-repeated volume gestures
+# A part of the NVDA Volume Adjustment add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2020-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Fire synthetic bursts of volume gestures as the keyboard auto-repeat does and check
+the number of volume writes and announcements made by VolumeStepsCoalescer.
+The bursts settle only when the deferred calls are fired with stubs.CallLater.fireAll,
+so the results do not depend on the speed of the machine.
+
+Usage:
+	python benchmarks/volumesteps.py --repeats 30
+"""
+
+from __future__ import annotations
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import stubs
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "addon", "globalPlugins"))
+
+
+class Burst(object):
+	"""The global plugin with the focused audio session and the counters of its volume writes."""
+
+	def __init__(self, bench: Any) -> None:
+		"""Remember the global plugin running against the simulated audio backend.
+		@param bench: the global plugin with the simulated audio backend
+		@type bench: gestures.Bench
+		"""
+		self.bench = bench
+		self.audiocore = bench.audiocore
+		self.session = bench.backend.sessions[-1]
+
+	def start(self, level: float = 0.5) -> None:
+		"""Select the focused audio session at the specified volume level and reset the counters.
+		@param level: the initial volume level of the audio session
+		@type level: float
+		"""
+		self.bench.followFocus()
+		self.session.SimpleAudioVolume.SetMasterVolume(level, None)
+		self.bench.backend.resetCalls()
+		stubs.speech.clear()
+
+	def press(self, script: str, times: int) -> None:
+		"""Call the script as the keyboard auto-repeat does.
+		@param script: the name of the script without the "script_" prefix
+		@type script: str
+		@param times: the number of calls
+		@type times: int
+		"""
+		method = getattr(self.bench.plugin, "script_" + script)
+		for i in range(times):
+			method(self.bench.gesture)
+
+	@property
+	def writes(self) -> int:
+		"""The number of volume levels written to the audio session since the start.
+		@return: number of SetMasterVolume calls
+		@rtype: int
+		"""
+		return self.bench.backend.calls.get("SetMasterVolume", 0)
+
+	@property
+	def messages(self) -> List[str]:
+		"""The volume levels announced since the start, the names of the selected audio sources are skipped.
+		@return: spoken messages in order
+		@rtype: List[str]
+		"""
+		return [text for time, text in stubs.speech.messages if text.startswith("Volume")]
+
+	@property
+	def level(self) -> int:
+		"""The actual volume level of the audio session.
+		@return: volume level in percent
+		@rtype: int
+		"""
+		return int(round(self.session.SimpleAudioVolume.GetMasterVolume() * 100.0))
+
+
+def burst(check: Burst, repeats: int) -> List[str]:
+	"""The first step is written and announced at once, the rest of the burst is written and announced once.
+	@return: descriptions of the failed expectations
+	@rtype: List[str]
+	"""
+	check.start(0.5)
+	check.press("volumeUp", repeats)
+	failures = expect(
+		"burst",
+		[
+			("writes during the burst", check.writes, 1),
+			("announcements during the burst", check.messages, ["Volume 51"]),
+			("pending bursts", check.audiocore.volumeSteps.pending, 1),
+		],
+	)
+	stubs.CallLater.fireAll()
+	final = min(100, 50 + repeats)
+	return failures + expect(
+		"burst",
+		[
+			("writes after settling", check.writes, 2),
+			("announcements after settling", check.messages, ["Volume 51", "Volume %d" % final]),
+			("final level", check.level, final),
+			("pending bursts after settling", check.audiocore.volumeSteps.pending, 0),
+		],
+	)
+
+
+def sourceChange(check: Burst, repeats: int) -> List[str]:
+	"""Switching to another audio source writes the pending level without announcing it.
+	@return: descriptions of the failed expectations
+	@rtype: List[str]
+	"""
+	check.start(0.5)
+	check.press("volumeUp", repeats)
+	announced = check.messages
+	stubs.speech.clear()
+	check.press("next", 1)
+	final = min(100, 50 + repeats)
+	# Nothing is left to be announced after the flush
+	stubs.speech.clear()
+	stubs.CallLater.fireAll()
+	return expect(
+		"source change",
+		[
+			("announcements during the burst", announced, ["Volume 51"]),
+			("writes", check.writes, 2),
+			("level after switching", check.level, final),
+			("pending bursts", check.audiocore.volumeSteps.pending, 0),
+			("announcements after settling", check.messages, []),
+		],
+	)
+
+
+def reversal(check: Burst, repeats: int) -> List[str]:
+	"""Only the final level of the burst is announced when the direction changes within the burst.
+	@return: descriptions of the failed expectations
+	@rtype: List[str]
+	"""
+	check.start(0.5)
+	check.press("volumeUp", repeats)
+	check.press("volumeDown", 1)
+	stubs.CallLater.fireAll()
+	final = min(100, 50 + repeats) - 1
+	return expect(
+		"reversal",
+		[
+			("writes", check.writes, 2),
+			("announcements", check.messages, ["Volume 51", "Volume %d" % final]),
+			("final level", check.level, final),
+		],
+	)
+
+
+def expect(case: str, checks: List[Tuple[str, Any, Any]]) -> List[str]:
+	"""Compare the observed values with the expected ones.
+	@param case: the name of the checked case
+	@type case: str
+	@param checks: the description, the observed value and the expected value of each check
+	@type checks: List[Tuple[str, Any, Any]]
+	@return: descriptions of the failed expectations
+	@rtype: List[str]
+	"""
+	return [
+		"%s: %s is %r, expected %r" % (case, name, observed, expected)
+		for name, observed, expected in checks
+		if observed != expected
+	]
+
+
+# Checked cases in the order of the report
+CASES: Sequence[Callable[[Burst, int], List[str]]] = (burst, sourceChange, reversal)
+
+
+def parse(argv: Optional[Sequence[str]] = None) -> Namespace:
+	"""Parse the command line arguments.
+	@return: the options of the check
+	@rtype: Namespace
+	"""
+	parser = ArgumentParser(description="Coalescing of the auto-repeated volume gestures")
+	parser.add_argument("--repeats", type=int, default=30, help="gestures in one burst")
+	args = parser.parse_args(argv)
+	if args.repeats < 3:
+		parser.error("a burst consists of at least 3 gestures")
+	return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""Run all cases and print the failed expectations.
+	@return: exit code, 1 if any expectation has failed
+	@rtype: int
+	"""
+	args = parse(argv)
+	failures: List[str] = []
+	with TemporaryDirectory() as configPath:
+		stubs.install(configPath)
+		from gestures import Bench
+
+		bench = Bench(1, 3)
+		# One step per gesture, the bursts are never written in the middle because of elapsed time
+		stubs.conf[bench.audiocore.addonName]["step"] = 1
+		stubs.conf[bench.audiocore.addonName]["coalescingDelay"] = 10.0
+		bench.audiocore.options.rebuild()
+		check = Burst(bench)
+		for case in CASES:
+			failed = case(check, args.repeats)
+			print("%-14s %s" % (case.__name__, "FAIL" if failed else "ok"))
+			failures.extend(failed)
+		bench.plugin.terminate()
+	for failure in failures:
+		print("FAILED " + failure)
+	return 1 if failures else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())